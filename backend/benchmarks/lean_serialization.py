@@ -0,0 +1,162 @@
+"""
+Benchmark: Admin-Listen über ORM + response_model vs. Core-Select + FastJSONResponse
+
+Der bisherige Pfad (ORM-Objekte laden, in Dicts kopieren und über
+``response_model`` validieren und kodieren) ist hier nachgebaut; der neue
+Pfad sind die echten Endpunkte ``/api/users/`` und
+``/api/bot/admin/logs/{user_id}``. Gemessen werden Zeit pro Request und
+Spitzenspeicher (tracemalloc) über den kompletten ASGI-Stack.
+
+Aufruf: ``python -m benchmarks.lean_serialization [--users 5000] [--logs 500] [--rounds 20]``
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from core import responses
+from core.auth import get_current_admin_user
+from core.schemas import User as UserSchema
+from database.database import Base, get_db
+from models import archive, bewerbung, chat, nachricht, statistik  # noqa: F401
+from models.bot_status import BotLog
+from models.user import User
+from routers import admin, bot
+
+
+def build_app(path: str, users: int, logs: int) -> FastAPI:
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionFactory = sessionmaker(bind=engine)
+
+    with SessionFactory() as db:
+        db.add_all(
+            User(
+                id=i,
+                vorname="Bench",
+                nachname=str(i),
+                email=f"bench{i}@example.org",
+                hashed_password="x",
+                filter_einstellungen='{"bezirke": ["Mitte", "Pankow"], "max_miete": 900}',
+                bewerbungsprofil='{"anrede": "Frau", "name": "Muster"}',
+            )
+            for i in range(1, users + 1)
+        )
+        start = datetime.now() - timedelta(hours=1)
+        db.add_all(
+            BotLog(
+                user_id=1,
+                level="INFO",
+                message=f"Angebot {i} geprüft",
+                action="crawl",
+                listing_id=f"L{i}",
+                details='{"quelle": "bench"}',
+                timestamp=start + timedelta(seconds=i),
+            )
+            for i in range(logs)
+        )
+        db.commit()
+
+    def session():
+        db = SessionFactory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(admin.router)
+    app.include_router(bot.router)
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+
+    # Bisheriger Pfad, unverändert nachgebaut
+    @app.get("/legacy/users", response_model=List[UserSchema])
+    def legacy_users(db: Session = Depends(get_db)):
+        return db.query(User).all()
+
+    @app.get("/legacy/logs/{user_id}")
+    def legacy_logs(
+        user_id: int, limit: int = 100, db: Session = Depends(get_db)
+    ) -> List[Dict[str, Any]]:
+        rows = (
+            db.query(BotLog)
+            .filter(BotLog.user_id == user_id)
+            .order_by(BotLog.timestamp.desc(), BotLog.id.desc())
+            .limit(limit)
+            .all()
+        )
+        return [
+            {
+                "id": log.id,
+                "user_id": log.user_id,
+                "level": log.level,
+                "message": log.message,
+                "action": log.action,
+                "listing_id": log.listing_id,
+                "details": log.details,
+                "timestamp": log.timestamp.isoformat(),
+            }
+            for log in rows
+        ]
+
+    return app
+
+
+def measure(client: TestClient, url: str, rounds: int):
+    client.get(url)  # Aufwärmen
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        response = client.get(url)
+        response.raise_for_status()
+    per_request = (time.perf_counter() - started) / rounds
+
+    tracemalloc.start()
+    client.get(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return per_request * 1000, peak / 1024 / 1024, len(response.content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--logs", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    encoder = "orjson" if responses.orjson is not None else "json"
+    print(f"Encoder: {encoder}, {args.users} User, Log-Limit {args.logs}")
+    print(f"{'Endpunkt':<28}{'ms/Request':>12}{'Peak MiB':>12}{'Bytes':>12}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = build_app(os.path.join(tmp_dir, "bench.db"), args.users, args.logs)
+        with TestClient(app) as client:
+            for name, url in (
+                ("legacy /users", "/legacy/users"),
+                ("lean   /api/users/", "/api/users/"),
+                ("legacy /logs", f"/legacy/logs/1?limit={args.logs}"),
+                (
+                    "lean   /api/bot/admin/logs",
+                    f"/api/bot/admin/logs/1?limit={args.logs}",
+                ),
+            ):
+                ms, peak, size = measure(client, url, args.rounds)
+                print(f"{name:<28}{ms:>12.1f}{peak:>12.1f}{size:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark: SQLite-Lese-/Schreib-Nebenläufigkeit mit und ohne Tuning-Profil
+
+Simuliert Bot-Schreibzugriffe (ein Commit pro Log-Zeile wie in
+``UserBot.log_to_database``) parallel zu API-Lesezugriffen (Log-Abfrage
+wie ``/api/bot/logs``) und vergleicht das Standard-Rollback-Journal mit
+dem WAL-Profil aus ``database.database``.
+
+Aufruf: ``python -m benchmarks.sqlite_concurrency [--seconds 5] [--writers 4] [--readers 4]``
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from database.database import Base, configure_sqlite_engine
+from models import archive, bewerbung, chat, nachricht, statistik  # noqa: F401
+from models.bot_status import BotLog
+from models.user import User
+
+# Ohne Tuning: Standard-Timeout des sqlite3-Moduls, kein PRAGMA
+BASELINE_CONNECT_ARGS = {"check_same_thread": False}
+TUNED_CONNECT_ARGS = {"check_same_thread": False, "timeout": 5}
+
+
+def build_engine(path: str, tuned: bool):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args=TUNED_CONNECT_ARGS if tuned else BASELINE_CONNECT_ARGS,
+        pool_size=16,
+        max_overflow=16,
+    )
+    if tuned:
+        configure_sqlite_engine(engine)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def run_profile(tuned: bool, seconds: float, writers: int, readers: int):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = build_engine(os.path.join(tmp_dir, "bench.db"), tuned)
+        SessionFactory = sessionmaker(bind=engine)
+
+        # Etwas Grundbestand für die Lese-Abfragen
+        with SessionFactory() as db:
+            db.add_all(
+                User(
+                    id=i,
+                    vorname="Bench",
+                    nachname=str(i),
+                    email=f"bench{i}@example.org",
+                    hashed_password="x",
+                )
+                for i in range(max(50, writers, readers))
+            )
+            db.flush()
+            db.add_all(
+                BotLog(user_id=i % 50, level="INFO", message=f"seed {i}", action="seed")
+                for i in range(5000)
+            )
+            db.commit()
+
+        stop_at = time.perf_counter() + seconds
+        counters = {"writes": 0, "reads": 0, "write_errors": 0, "read_errors": 0}
+        lock = threading.Lock()
+
+        def count(key: str):
+            with lock:
+                counters[key] += 1
+
+        def writer(worker_id: int):
+            while time.perf_counter() < stop_at:
+                db = SessionFactory()
+                try:
+                    db.add(
+                        BotLog(
+                            user_id=worker_id,
+                            level="INFO",
+                            message=f"write at {datetime.now().isoformat()}",
+                            action="bench",
+                        )
+                    )
+                    db.commit()
+                    count("writes")
+                except OperationalError:
+                    db.rollback()
+                    count("write_errors")
+                finally:
+                    db.close()
+
+        def reader(worker_id: int):
+            while time.perf_counter() < stop_at:
+                db = SessionFactory()
+                try:
+                    db.execute(
+                        select(BotLog)
+                        .where(BotLog.user_id == worker_id % 50)
+                        .order_by(BotLog.timestamp.desc())
+                        .limit(50)
+                    ).all()
+                    count("reads")
+                except OperationalError:
+                    count("read_errors")
+                finally:
+                    db.close()
+
+        threads = [
+            threading.Thread(target=writer, args=(i,)) for i in range(writers)
+        ] + [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        engine.dispose()
+
+    return {key: value / seconds for key, value in counters.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(
+        f"{'Profil':<10}{'Writes/s':>12}{'Reads/s':>12}"
+        f"{'Write-Fehler/s':>16}{'Read-Fehler/s':>16}"
+    )
+    for name, tuned in (("default", False), ("tuned", True)):
+        result = run_profile(tuned, args.seconds, args.writers, args.readers)
+        print(
+            f"{name:<10}{result['writes']:>12.1f}{result['reads']:>12.1f}"
+            f"{result['write_errors']:>16.1f}{result['read_errors']:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,71 +2,73 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
+from core.logging_config import get_logger
 from core.security import verify_token
+from core.user_cache import UserSnapshot, user_cache
 from database.database import get_db
 from models.user import User
 
 security = HTTPBearer()
 
+logger = get_logger("auth")
+
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
-) -> User:
+) -> UserSnapshot:
+    """
+    Resolve the bearer token to an immutable snapshot of the user.
+
+    Snapshots are cached in-process (see core/user_cache), so most requests
+    do not touch the users table. Endpoints that modify the user load the
+    row themselves.
+    """
     token = credentials.credentials
     email = verify_token(token)
 
-    print(f"Getting user for email: {email}")
+    snapshot = user_cache.get(email)
+    if snapshot is not None:
+        return snapshot
 
+    generation = user_cache.generation
     user = db.query(User).filter(User.email == email).first()
     if user is None:
-        print(f"User not found for email: {email}")
+        logger.warning("User not found for token subject", email=email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    print(
-        f"Found user: {
-            user.email}, is_admin: {
-            user.is_admin}, type: {
-            type(
-                user.is_admin)}"
-    )
-    return user
+    snapshot = UserSnapshot.from_user(user)
+    user_cache.put(snapshot, generation)
+    logger.debug("User resolved from database", user_id=user.id)
+    return snapshot
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_active_user(
+    current_user: UserSnapshot = Depends(get_current_user),
+) -> UserSnapshot:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
 def get_current_admin_user(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
-    print(f"Admin check for user: {current_user.email}")
-    print(f"User is_admin value: {current_user.is_admin}")
-    print(f"User is_admin type: {type(current_user.is_admin)}")
-
-    # Convert to boolean explicitly
-    is_admin = bool(current_user.is_admin) and current_user.is_admin != 0
-    print(f"Converted is_admin: {is_admin}")
-
-    if not is_admin:
-        print(f"ADMIN ACCESS DENIED for {current_user.email}")
+    current_user: UserSnapshot = Depends(get_current_active_user),
+) -> UserSnapshot:
+    if not current_user.is_admin:
+        logger.warning("Admin access denied", user_id=current_user.id)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
         )
-
-    print(f"ADMIN ACCESS GRANTED for {current_user.email}")
     return current_user
 
 
 def get_current_user_with_profile(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
+    current_user: UserSnapshot = Depends(get_current_active_user),
+) -> UserSnapshot:
     """Requires user to have completed their profile"""
     if not current_user.profile_completed:
         raise HTTPException(
@@ -0,0 +1,224 @@
+"""
+Starke ETags für gepollte Lese-Endpunkte
+
+Die ETag entsteht aus Versionszählern, die Schreibzugriffe erhöhen. Die
+Zähler müssen für alle Worker gleich sein, sonst antwortet ein Worker mit
+304, obwohl ein anderer die Daten geändert hat:
+
+- Mit ``ETAG_REDIS_URL`` (oder ``RATE_LIMIT_REDIS_URL``) liegen die Zähler
+  in Redis und gelten für beliebig viele Worker.
+- Ohne Redis zählt jeder Worker im Speicher. Das ist nur mit einem Worker
+  korrekt; ist ``WEB_CONCURRENCY`` größer als 1, werden deshalb gar keine
+  ETags gesendet und jede Anfrage normal beantwortet.
+
+Antworten aus einem Cache des Workers (``core/user_cache``) können älter
+sein als die gemeinsame Version. Solche Endpunkte übergeben ``served`` an
+``check_etag``; die ETag enthält dann einen Hash der ausgelieferten Daten.
+"""
+
+import hashlib
+import os
+import threading
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.logging_config import get_logger
+
+try:
+    import redis
+except ImportError:  # optional, siehe requirements.txt
+    redis = None
+
+logger = get_logger("etag")
+
+ETAG_REDIS_URL = os.getenv("ETAG_REDIS_URL") or os.getenv("RATE_LIMIT_REDIS_URL", "")
+# Anzahl der Worker, wie sie uvicorn und gunicorn lesen
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Schlüssel in Session.info für nach dem Commit zu erhöhende Versionen
+_PENDING_KEY = "resource_versions_bump"
+
+
+class ResourceVersions:
+    """
+    Versionszähler je Ressource und User für starke ETags
+
+    Jeder relevante Schreibzugriff erhöht die Version, Lese-Endpunkte
+    vergleichen nur die daraus gebildete ETag mit ``If-None-Match``. Die
+    Epoche unterscheidet Prozessstarts, damit nach einem Neustart keine
+    alte ETag zufällig wieder passt.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:12]
+        self._versions: Dict[Tuple[str, Hashable], int] = defaultdict(int)
+        self._generations: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def bump(self, resource: str, key: Hashable = None):
+        """Erhöht die Version eines Eintrags, ohne ``key`` die der ganzen Ressource"""
+        with self._lock:
+            if key is None:
+                self._generations[resource] += 1
+            else:
+                self._versions[(resource, key)] += 1
+
+    def etag(self, resource: str, key: Hashable) -> Optional[str]:
+        with self._lock:
+            generation = self._generations[resource]
+            version = self._versions[(resource, key)]
+        return f'"{resource}-{key}-{self.epoch}-{generation}-{version}"'
+
+
+class RedisResourceVersions:
+    """
+    Von allen Workern geteilte Versionszähler in Redis
+
+    Die Epoche liegt ebenfalls in Redis. Gehen die Zähler verloren (neues
+    oder geleertes Redis), entsteht eine neue Epoche und alte ETags passen
+    nicht mehr.
+    """
+
+    def __init__(self, url: str, prefix: str = "etag:"):
+        if redis is None:
+            raise RuntimeError("ETAG_REDIS_URL gesetzt, aber redis nicht installiert")
+        self.prefix = prefix
+        # Kurzer Timeout, etag() läuft synchron im Threadpool des Requests
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5)
+        # bump() wird auch im Event-Loop aufgerufen (AsyncSession-Commits,
+        # Bot-Manager) und gibt das Erhöhen deshalb an einen eigenen Thread ab.
+        # Ein Thread hält die Reihenfolge ein.
+        self._bumps = ThreadPoolExecutor(max_workers=1, thread_name_prefix="etag")
+
+    def _key(self, resource: str, key: Hashable = None) -> str:
+        if key is None:
+            return f"{self.prefix}{resource}"
+        return f"{self.prefix}{resource}:{key}"
+
+    def bump(self, resource: str, key: Hashable = None):
+        # Bis der Thread erhöht hat, liefern Polls neue Daten unter der alten
+        # ETag; der nächste Poll nach dem Erhöhen lädt dann erneut
+        self._bumps.submit(self._incr, resource, key)
+
+    def _incr(self, resource: str, key: Hashable):
+        try:
+            self._client.incr(self._key(resource, key))
+        except Exception as e:
+            logger.warning("ETag-Version nicht erhöht", resource=resource, error=str(e))
+
+    def etag(self, resource: str, key: Hashable) -> Optional[str]:
+        epoch_key = f"{self.prefix}epoch"
+        epoch, generation, version = self._client.mget(
+            epoch_key, self._key(resource), self._key(resource, key)
+        )
+        if epoch is None:
+            self._client.set(epoch_key, uuid.uuid4().hex[:12], nx=True)
+            epoch = self._client.get(epoch_key)
+        generation = int(generation or 0)
+        version = int(version or 0)
+        return f'"{resource}-{key}-{epoch.decode()}-{generation}-{version}"'
+
+
+class DisabledVersions:
+    """Keine ETags, wenn mehrere Worker ohne gemeinsame Zähler laufen"""
+
+    def bump(self, resource: str, key: Hashable = None):
+        pass
+
+    def etag(self, resource: str, key: Hashable) -> Optional[str]:
+        return None
+
+
+def create_resource_versions():
+    if ETAG_REDIS_URL:
+        return RedisResourceVersions(ETAG_REDIS_URL)
+    if WEB_CONCURRENCY > 1:
+        logger.warning(
+            "ETags deaktiviert: mehrere Worker ohne ETAG_REDIS_URL",
+            workers=WEB_CONCURRENCY,
+        )
+        return DisabledVersions()
+    return ResourceVersions()
+
+
+# Globale Versionszähler
+resource_versions = create_resource_versions()
+
+
+def bump_after_commit(db, resource: str, key: Hashable = None):
+    """
+    Erhöht die Version, sobald die Transaktion der Session committet ist
+
+    Vorher könnte ein Poll die neue ETag mit dem alten Stand erhalten und
+    danach nie wieder aktualisieren. Ohne ORM-Session (reine Connection)
+    wird sofort erhöht.
+    """
+    if isinstance(db, Session):
+        db.info.setdefault(_PENDING_KEY, set()).add((resource, key))
+    else:
+        resource_versions.bump(resource, key)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed(session):
+    for resource, key in session.info.pop(_PENDING_KEY, ()):
+        resource_versions.bump(resource, key)
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match vergleicht schwach, ein W/-Präfix zählt also nicht
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def _with_content(etag: str, served: Any) -> str:
+    digest = hashlib.sha1(repr(served).encode()).hexdigest()[:12]
+    return f'{etag[:-1]}-{digest}"'
+
+
+def check_etag(
+    request: Request,
+    response: Response,
+    resource: str,
+    key: Hashable,
+    served: Any = None,
+) -> Optional[Response]:
+    """
+    Gibt eine 304-Antwort zurück, wenn der Client den aktuellen Stand hat
+
+    Sonst wird die ETag an die normale Antwort gehängt und ``None``
+    zurückgegeben, ebenso ohne gemeinsame Versionszähler (siehe oben).
+    Die Version wird vor der eigentlichen Abfrage gelesen, eine parallele
+    Änderung führt daher höchstens zu einer neueren Antwort unter der alten
+    ETag, die beim nächsten Poll ersetzt wird.
+
+    ``served`` sind bereits vorliegende Daten der Antwort (z.B. aus dem
+    User-Cache). Sie gehen in die ETag ein, damit ein Worker mit älterem
+    Stand sie nicht unter der neuen Version ausliefert.
+    """
+    try:
+        etag = resource_versions.etag(resource, key)
+    except Exception as e:
+        # Ohne Versionszähler lieber ohne ETag antworten
+        logger.warning("ETag-Version nicht lesbar", resource=resource, error=str(e))
+        etag = None
+    if etag is None:
+        return None
+    if served is not None:
+        etag = _with_content(etag, served)
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,110 @@
+"""
+Keyset-Pagination mit undurchsichtigem Cursor
+
+Listen werden nach (Sortierspalte, id) sortiert. Der Cursor kodiert die
+Werte der letzten Zeile einer Seite; die nächste Seite setzt per
+``WHERE (sortierspalte, id) < (wert, id)`` direkt im Index fort, statt wie
+bei ``OFFSET`` alle vorherigen Zeilen zu überspringen.
+
+Die Antwort bleibt eine Liste, der Cursor für die nächste Seite steht im
+Header ``X-Next-Cursor`` (fehlt, wenn es keine weitere Seite gibt).
+Listen mit Seitenzahlen liefern zusätzlich ``X-Total-Count``.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import String, literal, tuple_, type_coerce
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = {"dt": sort_value.isoformat()}
+    payload = json.dumps([sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if isinstance(sort_value, dict):
+            sort_value = datetime.fromisoformat(sort_value["dt"])
+        return sort_value, row_id
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def cursor_datetime(sort_value: Any) -> datetime:
+    """Sortierwert eines Cursors als datetime (SQLite liefert Text)"""
+    if isinstance(sort_value, datetime):
+        return sort_value
+    return datetime.fromisoformat(sort_value)
+
+
+def cursor_key(sort_column):
+    """
+    Sortierwert so, wie die Datenbank ihn vergleicht.
+
+    SQLite speichert Zeitstempel als Text, teils mit, teils ohne
+    Mikrosekunden. Der Cursor muss denselben Text enthalten, sonst weicht
+    der Vergleich im WHERE von der Reihenfolge im ORDER BY ab.
+    """
+    return type_coerce(sort_column, String).label("cursor_key")
+
+
+def keyset_filter(sort_column, id_column, cursor: str, descending: bool = True):
+    """Bedingung für alle Zeilen hinter dem Cursor"""
+    sort_value, row_id = decode_cursor(cursor)
+    sort_type = String() if isinstance(sort_value, str) else sort_column.type
+
+    key = tuple_(sort_column, id_column)
+    value = tuple_(literal(sort_value, sort_type), literal(row_id, id_column.type))
+    return key < value if descending else key > value
+
+
+def paginate(
+    query,
+    sort_column,
+    id_column,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    skip: int = 0,
+    descending: bool = True,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Wendet Cursor, stabile Sortierung und Limit auf eine ORM-Query an.
+
+    Gibt die Zeilen der Seite und den Cursor der nächsten Seite zurück.
+    ``skip`` bleibt aus Kompatibilitätsgründen erhalten.
+    """
+    if cursor:
+        query = query.filter(keyset_filter(sort_column, id_column, cursor, descending))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    # Eine Zeile mehr laden, um zu erkennen, ob es eine weitere Seite gibt
+    rows = query.add_columns(cursor_key(sort_column)).offset(skip).limit(limit + 1).all()
+    items = [row[0] for row in rows[:limit]]
+    if len(rows) <= limit:
+        return items, None
+
+    return items, encode_cursor(rows[limit - 1][-1], getattr(items[-1], id_column.key))
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def set_total_count(response: Response, total: int):
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
@@ -0,0 +1,325 @@
+"""
+Rate-Limiting je User und IP
+
+Jede Anfrage verbraucht ein Token aus allen passenden Budgets (``Rule``):
+dem Budget der Route, dem allgemeinen User-Budget und einer Obergrenze je
+IP. Ist eines leer, antwortet die Middleware mit 429 und ``Retry-After``,
+bevor Routing, Auth oder Datenbank etwas tun.
+
+Die Budgets sind Token-Buckets nach GCRA: Pro Schlüssel wird nur der
+Zeitpunkt gespeichert, ab dem der Bucket wieder voll ist. Das passt in
+einen Dict-Eintrag oder einen Redis-Key mit Ablaufzeit.
+
+``/api/batch`` kostet als Anfrage ein Token, jeder Teil-Request darin
+zusätzlich eines aus dem Budget seiner Route (``charge_sub_request``).
+Dafür legt die Middleware den Limiter in ``request.state.rate_limiter``.
+
+Ohne ``RATE_LIMIT_REDIS_URL`` zählt jeder Worker für sich. Mit mehreren
+Workern teilen sie sich über Redis dieselben Buckets (``redis`` ist
+optional, siehe requirements.txt). Fällt das Backend aus, werden Anfragen
+durchgelassen statt abgewiesen.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.requests import Request
+
+from core.logging_config import bot_metrics, get_logger
+from core.security import verify_token
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # optional, siehe requirements.txt
+    redis_asyncio = None
+
+logger = get_logger("rate_limit")
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "")
+# Nur hinter einem eigenen Reverse-Proxy setzen, sonst ist die IP fälschbar
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "0") == "1"
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+# Rundungsfehler beim Aufsummieren der Intervalle
+_EPSILON = 1e-9
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    Ein Budget von ``limit`` Anfragen je ``period_seconds``
+
+    ``paths`` sind Pfad-Präfixe, ``methods`` HTTP-Methoden; leer heißt alle.
+    Budgets gelten je angemeldetem User, ohne gültiges Token je IP, mit
+    ``per_ip`` immer je IP.
+    """
+
+    name: str
+    limit: int
+    period_seconds: float
+    paths: Tuple[str, ...] = ()
+    methods: Tuple[str, ...] = ()
+    per_ip: bool = False
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods and method not in self.methods:
+            return False
+        return not self.paths or path.startswith(self.paths)
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    remaining: int
+    retry_after: float
+
+
+DEFAULT_RULES: Tuple[Rule, ...] = (
+    # Obergrenze je IP, auch gegen ständig wechselnde Tokens
+    Rule("ip", limit=1200, period_seconds=60, per_ip=True),
+    Rule("user", limit=600, period_seconds=60),
+    # Login und Registrierung gegen Durchprobieren von Passwörtern
+    Rule(
+        "auth",
+        limit=10,
+        period_seconds=60,
+        paths=("/api/login", "/api/token", "/api/register", "/api/refresh"),
+        methods=("POST",),
+        per_ip=True,
+    ),
+    # Häufig gepollt, das Dashboard gruppiert über alle Bewerbungen des Users
+    Rule("statistik", limit=60, period_seconds=60, paths=("/api/statistik",)),
+    Rule("batch", limit=120, period_seconds=60, paths=("/api/batch",)),
+)
+
+# Nicht gezählt: Health-Checks des Load-Balancers
+EXEMPT_PATHS = ("/health",)
+
+
+def gcra(
+    tat: Optional[float], now: float, limit: int, period: float
+) -> Tuple[Decision, Optional[float]]:
+    """
+    Ein Schritt des Token-Buckets
+
+    ``tat`` ist der gespeicherte Zeitpunkt, ab dem der Bucket voll ist. Gibt
+    die Entscheidung und den neuen Zeitpunkt zurück (``None`` bei Ablehnung,
+    dann bleibt der gespeicherte Wert unverändert).
+    """
+    interval = period / limit
+    new_tat = max(tat or now, now) + interval
+    allow_at = new_tat - period
+    if allow_at - now > _EPSILON:
+        return Decision(False, 0, allow_at - now), None
+
+    remaining = int((period - (new_tat - now)) / interval + _EPSILON)
+    return Decision(True, remaining, 0.0), new_tat
+
+
+class MemoryBackend:
+    """Buckets im Speicher des Workers, ältere Schlüssel werden verdrängt"""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, limit: int, period: float) -> Decision:
+        now = self.clock()
+        with self._lock:
+            decision, new_tat = gcra(self._tats.get(key), now, limit, period)
+            if new_tat is not None:
+                self._tats[key] = new_tat
+                self._tats.move_to_end(key)
+
+            # Volle Buckets entsprechen fehlenden Einträgen und fallen weg
+            while self._tats and (
+                len(self._tats) > self.max_keys
+                or next(iter(self._tats.values())) <= now
+            ):
+                self._tats.popitem(last=False)
+        return decision
+
+
+# GCRA wie oben, atomar in Redis. Zahlen als String, Redis kürzt Lua-Zahlen.
+_GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local period = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or ARGV[1])
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if allow_at - now > 1e-9 then
+    return {0, tostring(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, tostring((period - (new_tat - now)) / interval)}
+"""
+
+
+class RedisBackend:
+    """Von allen Workern geteilte Buckets in Redis"""
+
+    def __init__(self, url: str, prefix: str = "rate_limit:"):
+        if redis_asyncio is None:
+            raise RuntimeError(
+                "RATE_LIMIT_REDIS_URL gesetzt, aber redis nicht installiert"
+            )
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url)
+        self._script = self._client.register_script(_GCRA_SCRIPT)
+
+    async def hit(self, key: str, limit: int, period: float) -> Decision:
+        # Wanduhr statt monotonic, damit alle Worker dieselbe Zeitbasis haben
+        allowed, value = await self._script(
+            keys=[self.prefix + key], args=[time.time(), period / limit, period]
+        )
+        if int(allowed):
+            return Decision(True, int(float(value) + _EPSILON), 0.0)
+        return Decision(False, 0, float(value))
+
+
+class RateLimiter:
+    def __init__(self, backend, rules: Sequence[Rule] = DEFAULT_RULES):
+        self.backend = backend
+        self.rules = tuple(rules)
+
+    async def check(
+        self,
+        method: str,
+        path: str,
+        user: Optional[str],
+        ip: str,
+        routes_only: bool = False,
+    ) -> Optional[Tuple[Rule, Decision]]:
+        """
+        Verbraucht ein Token je passendem Budget, gibt die erste Ablehnung zurück
+
+        Mit ``routes_only`` zählen nur Budgets mit ``paths``, nicht die
+        allgemeinen je User und IP.
+        """
+        for rule in self.rules:
+            if routes_only and not rule.paths:
+                continue
+            if not rule.matches(method, path):
+                continue
+            identity = f"ip:{ip}" if rule.per_ip or user is None else f"user:{user}"
+            decision = await self.backend.hit(
+                f"{rule.name}:{identity}", rule.limit, rule.period_seconds
+            )
+            if not decision.allowed:
+                return rule, decision
+        return None
+
+
+def create_backend():
+    if RATE_LIMIT_REDIS_URL:
+        return RedisBackend(RATE_LIMIT_REDIS_URL)
+    return MemoryBackend()
+
+
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def token_subject(request: Request) -> Optional[str]:
+    """User aus dem Bearer-Token, ohne Datenbankzugriff"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return verify_token(token)
+    except HTTPException:
+        return None
+
+
+def retry_after_seconds(decision: Decision) -> int:
+    return max(1, math.ceil(decision.retry_after))
+
+
+async def charge_sub_request(
+    request: Request, path: str, user: Optional[str]
+) -> Optional[Tuple[Rule, Decision]]:
+    """
+    Verbraucht für einen Teil-Request eines Batches ein Token je Routen-Budget
+
+    Ohne Middleware (deaktiviert, Tests) und bei Ausfall des Backends wird
+    nichts gezählt, wie in der Middleware.
+    """
+    limiter = getattr(request.state, "rate_limiter", None)
+    if limiter is None:
+        return None
+    try:
+        denied = await limiter.check(
+            "GET", path, user, client_ip(request), routes_only=True
+        )
+    except Exception as e:
+        logger.warning("Rate-Limit-Backend nicht verfügbar", error=str(e))
+        return None
+
+    if denied is not None:
+        bot_metrics.increment_counter(f"rate_limited_{denied[0].name}")
+    return denied
+
+
+class RateLimitMiddleware:
+    """ASGI-Middleware vor allen Routen, siehe Moduldokumentation"""
+
+    def __init__(self, app, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter or RateLimiter(create_backend())
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"] in EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        try:
+            denied = await self.limiter.check(
+                request.method,
+                request.url.path,
+                token_subject(request),
+                client_ip(request),
+            )
+        except Exception as e:
+            # Ohne Backend lieber ungebremst als gar nicht erreichbar
+            logger.warning("Rate-Limit-Backend nicht verfügbar", error=str(e))
+            denied = None
+
+        if denied is None:
+            # Für die Teil-Requests von /api/batch (charge_sub_request)
+            scope.setdefault("state", {})["rate_limiter"] = self.limiter
+            await self.app(scope, receive, send)
+            return
+
+        rule, decision = denied
+        bot_metrics.increment_counter(f"rate_limited_{rule.name}")
+        response = JSONResponse(
+            {"detail": "Too many requests"},
+            status_code=429,
+            headers={
+                "Retry-After": str(retry_after_seconds(decision)),
+                "X-RateLimit-Limit": str(rule.limit),
+                "X-RateLimit-Remaining": "0",
+            },
+        )
+        await response(scope, receive, send)
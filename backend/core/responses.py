@@ -0,0 +1,50 @@
+"""
+Schlanker Antwortpfad für große Listen
+
+Endpunkte, die viele Zeilen liefern, lesen nur die benötigten Spalten per
+Core-Select und geben die Zeilen direkt als ``FastJSONResponse`` zurück.
+FastAPI überspringt dann ``response_model``-Validierung und
+``jsonable_encoder``; das ``response_model`` bleibt nur für die Doku.
+
+Mit installiertem ``orjson`` wird damit kodiert, sonst mit der
+Standardbibliothek (kompakt, ohne Leerzeichen).
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional, siehe requirements.txt
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        # Wie pydantic: Dezimalzahlen als String
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON-Antwort ohne Umweg über pydantic und jsonable_encoder"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
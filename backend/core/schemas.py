@@ -1,6 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr
 
@@ -106,6 +106,10 @@ class Nachricht(NachrichtBase):
     model_config = {"from_attributes": True}
 
 
+class ArchivierteBewerbung(Bewerbung):
+    nachrichten: List[Nachricht] = []
+
+
 class BewerbungsprofilUpdate(BaseModel):
     anrede: Optional[str] = None
     name: Optional[str] = None
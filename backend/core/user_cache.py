@@ -0,0 +1,176 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.etag import resource_versions
+from models.user import User
+
+# Wie lange ein aufgelöster User ohne Datenbankzugriff gültig bleibt
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "1024"))
+
+# Schlüssel in Session.info für nach dem Commit zu verwerfende User
+_PENDING_KEY = "user_cache_invalidate"
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Unveränderliche Kopie eines Users ohne Passwort-Hash"""
+
+    id: int
+    vorname: str
+    nachname: str
+    email: str
+    is_admin: bool
+    is_active: bool
+    profile_completed: bool
+    filter_einstellungen: Optional[str]
+    bewerbungsprofil: Optional[str]
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            vorname=user.vorname,
+            nachname=user.nachname,
+            email=user.email,
+            is_admin=bool(user.is_admin),
+            is_active=bool(user.is_active),
+            profile_completed=bool(user.profile_completed),
+            filter_einstellungen=user.filter_einstellungen,
+            bewerbungsprofil=user.bewerbungsprofil,
+            created_at=user.created_at,
+        )
+
+
+class UserCache:
+    """
+    LRU-Cache mit Ablaufzeit: Token-Subject (E-Mail) -> UserSnapshot
+
+    Änderungen über das ORM verwerfen den Eintrag nach dem Commit (siehe
+    Events unten), Core-Statements wie die Massenlöschung rufen
+    ``invalidate`` direkt auf. Andere Prozesse sehen Änderungen spätestens
+    nach ``ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        max_size: int = AUTH_CACHE_MAX_SIZE,
+        ttl_seconds: float = AUTH_CACHE_TTL_SECONDS,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, UserSnapshot]]" = OrderedDict()
+        self._emails_by_id: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        # Zählt Invalidierungen; ein Laden, das eine davon überlappt, wird
+        # nicht gespeichert (es könnte den alten Stand gelesen haben)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, email: str) -> Optional[UserSnapshot]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._remove(email)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(email)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, snapshot: UserSnapshot, generation: int):
+        """Speichert einen Snapshot, der bei ``generation`` geladen wurde"""
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+
+        expires = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._remove_id(snapshot.id)
+            self._entries[snapshot.email] = (expires, snapshot)
+            self._entries.move_to_end(snapshot.email)
+            self._emails_by_id[snapshot.id] = snapshot.email
+
+            while len(self._entries) > self.max_size:
+                oldest, (_, evicted) = self._entries.popitem(last=False)
+                self._forget(oldest, evicted)
+
+    def invalidate(self, user_id: int):
+        """Verwirft den Eintrag eines Users"""
+        with self._lock:
+            self.generation += 1
+            self._remove_id(user_id)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._emails_by_id.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remove(self, email: str):
+        entry = self._entries.pop(email, None)
+        if entry is not None:
+            self._forget(email, entry[1])
+
+    def _remove_id(self, user_id: int):
+        email = self._emails_by_id.pop(user_id, None)
+        if email is not None:
+            self._entries.pop(email, None)
+
+    def _forget(self, email: str, snapshot: UserSnapshot):
+        if self._emails_by_id.get(snapshot.id) == email:
+            del self._emails_by_id[snapshot.id]
+
+
+# Globaler Cache für die Authentifizierung
+user_cache = UserCache()
+
+
+def _queue_invalidation(target: User):
+    session = Session.object_session(target)
+    if session is None:
+        user_cache.invalidate(target.id)
+        return
+    session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    _queue_invalidation(target)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    _queue_invalidation(target)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    # Erst nach dem Commit verwerfen, sonst könnte ein paralleler Request
+    # den alten Stand sofort wieder in den Cache laden
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        user_cache.invalidate(user_id)
+        # Erst nach dem Verwerfen, sonst bekäme die neue ETag den alten Stand
+        resource_versions.bump("user", user_id)
@@ -4,11 +4,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from core.logging_config import get_logger
+from core.rate_limit import RATE_LIMIT_ENABLED, RateLimitMiddleware
 from database.database import engine
-from models import chat, user
-from routers import admin, auth, bewerbungen, bot
+from migrations.runner import run_migrations
+from routers import admin, auth, batch, bewerbungen, bot
 from routers import chat as chat_router
 from routers import (
+    export,
     filter,
     monitoring,
     nachrichten,
@@ -16,13 +18,13 @@ from routers import (
     statistiken,
     support,
 )
+from services.bot_log_sink import bot_log_sink
 from services.bot_maintenance import maintenance_service
 
 logger = get_logger("main")
 
-# Datenbank-Tabellen erstellen
-user.Base.metadata.create_all(bind=engine)
-chat.Base.metadata.create_all(bind=engine)
+# Ausstehende Datenbank-Migrationen anwenden
+run_migrations(engine)
 
 
 @asynccontextmanager
@@ -31,6 +33,9 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starte Wohnblitzer API...")
 
+    # Gepufferten BotLog-Writer starten
+    await bot_log_sink.start()
+
     # Wartungsservice starten
     await maintenance_service.start_maintenance(interval_minutes=30)
 
@@ -49,6 +54,9 @@ async def lifespan(app: FastAPI):
 
     await bot_manager.shutdown_all_bots()
 
+    # Verbleibende Bot-Logs schreiben
+    await bot_log_sink.stop()
+
     logger.info("Wohnblitzer API erfolgreich gestoppt")
 
 
@@ -59,12 +67,17 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Vor CORS registriert, damit auch 429-Antworten CORS-Header bekommen
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag", "Retry-After"],
 )
 
 # API Routers
@@ -79,6 +92,8 @@ app.include_router(support.router)
 app.include_router(chat_router.router)
 app.include_router(push_notifications.router)
 app.include_router(monitoring.router)
+app.include_router(export.router)
+app.include_router(batch.router)
 
 
 @app.get("/")
@@ -0,0 +1,581 @@
+"""
+Versionierter Migrations-Runner
+
+Jede Migration hat eine fortlaufende Versionsnummer und wird genau einmal
+ausgeführt. Angewendete Versionen werden in der Tabelle ``schema_version``
+protokolliert. Beim Start wird nur die höchste Version gelesen; ist die
+Datenbank aktuell, findet keine weitere Schema-Reflection statt.
+
+Alle Migrationen sind idempotent geschrieben, damit sie auch auf
+Datenbanken laufen, die bereits über ``create_all`` oder die alten
+Einzelskripte angelegt wurden.
+
+Aufruf: ``python -m migrations.runner [status]``
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    case,
+    func,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import AddConstraint, CreateIndex, DropIndex
+
+from core.logging_config import get_logger
+from database.database import Base
+from models import (  # noqa: F401
+    archive,
+    bewerbung,
+    bot_status,
+    chat,
+    nachricht,
+    rollup,
+    statistik,
+    user,
+)
+from models.chat import PREVIEW_LENGTH, ChatConversation, ChatMessage, MessageType
+
+logger = get_logger("migrations")
+
+schema_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    schema_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+    # SQLite: Fremdschlüssel während der Migration abschalten (Tabellen-Neuaufbau)
+    disable_foreign_keys: bool = False
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, name: str, disable_foreign_keys: bool = False):
+    """Registriert eine Migrationsfunktion unter der angegebenen Version"""
+
+    def decorator(func: Callable[[Connection], None]):
+        MIGRATIONS.append(Migration(version, name, func, disable_foreign_keys))
+        return func
+
+    return decorator
+
+
+def column_exists(conn: Connection, table: str, column: str) -> bool:
+    return any(col["name"] == column for col in inspect(conn).get_columns(table))
+
+
+def add_column_if_missing(conn: Connection, table: str, column: str, ddl: str):
+    """Fügt eine Spalte hinzu, falls sie noch nicht existiert"""
+    if not column_exists(conn, table, column):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        logger.info(f"Spalte {table}.{column} hinzugefügt")
+
+
+def create_tables(conn: Connection, *table_names: str):
+    """Legt die im Model definierten Tabellen samt Indizes an, falls sie fehlen"""
+    for table_name in table_names:
+        Base.metadata.tables[table_name].create(bind=conn, checkfirst=True)
+        logger.info(f"Tabelle {table_name} sichergestellt")
+
+
+def create_indexes(conn: Connection, table_name: str, *index_names: str):
+    """Legt die im Model definierten Indizes an, falls sie fehlen"""
+    table = Base.metadata.tables[table_name]
+    for index in table.indexes:
+        if index.name in index_names:
+            # IF NOT EXISTS statt Reflection, die Ausdrucksindizes nicht erkennt
+            conn.execute(CreateIndex(index, if_not_exists=True))
+            logger.info(f"Index {index.name} sichergestellt")
+
+
+def recreate_indexes(conn: Connection, table_name: str, *index_names: str):
+    """Legt Indizes mit geänderter Spaltenliste neu an"""
+    table = Base.metadata.tables[table_name]
+    for index in table.indexes:
+        if index.name in index_names:
+            conn.execute(DropIndex(index, if_exists=True))
+            conn.execute(CreateIndex(index))
+            logger.info(f"Index {index.name} neu angelegt")
+
+
+def remove_orphans(conn: Connection, table_name: str):
+    """Entfernt Zeilen, deren Fremdschlüssel ins Leere zeigen"""
+    table = Base.metadata.tables[table_name]
+    for fk in table.foreign_keys:
+        column, target = fk.parent, fk.column
+        missing = column.isnot(None) & column.notin_(select(target))
+        if fk.ondelete == "SET NULL":
+            result = conn.execute(
+                table.update().where(missing).values({column.name: None})
+            )
+        else:
+            result = conn.execute(table.delete().where(missing))
+        if result.rowcount:
+            logger.info(
+                f"{result.rowcount} verwaiste Zeilen in {table_name}.{column.name} bereinigt"
+            )
+
+
+def rebuild_sqlite_table(conn: Connection, table_name: str):
+    """
+    Baut eine SQLite-Tabelle nach dem Model neu auf.
+
+    SQLite kann Constraints nicht nachträglich ändern: Die alte Tabelle wird
+    umbenannt, die neue aus dem Model angelegt, die Daten kopiert und die
+    alte Tabelle gelöscht. ``legacy_alter_table`` verhindert, dass SQLite
+    Fremdschlüssel anderer Tabellen auf die umbenannte Tabelle umbiegt.
+    """
+    table = Base.metadata.tables[table_name]
+    old_name = f"{table_name}_old"
+    inspector = inspect(conn)
+    old_columns = {col["name"] for col in inspector.get_columns(table_name)}
+
+    # Indexnamen sind datenbankweit eindeutig
+    for index in inspector.get_indexes(table_name):
+        conn.execute(text(f'DROP INDEX "{index["name"]}"'))
+
+    conn.execute(text("PRAGMA legacy_alter_table=ON"))
+    conn.execute(text(f'ALTER TABLE "{table_name}" RENAME TO "{old_name}"'))
+    conn.execute(text("PRAGMA legacy_alter_table=OFF"))
+
+    table.create(bind=conn)
+    columns = ", ".join(f'"{c.name}"' for c in table.columns if c.name in old_columns)
+    conn.execute(
+        text(
+            f'INSERT INTO "{table_name}" ({columns}) SELECT {columns} FROM "{old_name}"'
+        )
+    )
+    conn.execute(text(f'DROP TABLE "{old_name}"'))
+    logger.info(f"Tabelle {table_name} neu aufgebaut")
+
+
+def replace_foreign_keys(conn: Connection, table_name: str):
+    """Ersetzt die Fremdschlüssel einer Tabelle durch die im Model definierten"""
+    table = Base.metadata.tables[table_name]
+    for fk in inspect(conn).get_foreign_keys(table_name):
+        conn.execute(text(f'ALTER TABLE "{table_name}" DROP CONSTRAINT "{fk["name"]}"'))
+    for constraint in table.foreign_key_constraints:
+        conn.execute(AddConstraint(constraint))
+    logger.info(f"Fremdschlüssel von {table_name} ersetzt")
+
+
+# Migrationen
+
+
+@migration(1, "initial_schema")
+def initial_schema(conn: Connection):
+    """Legt alle Tabellen des ursprünglichen Schemas an"""
+    Base.metadata.create_all(bind=conn)
+
+
+@migration(2, "add_profile_completed")
+def add_profile_completed(conn: Connection):
+    """Ersetzt migrations/add_profile_completed.py"""
+    add_column_if_missing(conn, "users", "profile_completed", "BOOLEAN DEFAULT FALSE")
+
+
+@migration(3, "hot_path_indexes")
+def hot_path_indexes(conn: Connection):
+    """Zusammengesetzte Indizes für die häufigsten Filter-Spalten"""
+    create_indexes(conn, "bewerbungen", "ix_bewerbungen_user_id_bewerbungsdatum_status")
+    create_indexes(
+        conn,
+        "bot_logs",
+        "ix_bot_logs_user_id_timestamp",
+        "ix_bot_logs_timestamp_level",
+    )
+    create_indexes(
+        conn,
+        "chat_messages",
+        "ix_chat_messages_conversation_id_created_at",
+        "ix_chat_messages_sender_type_is_read",
+    )
+
+
+@migration(4, "unique_statistik_per_user")
+def unique_statistik_per_user(conn: Connection):
+    """Eine Statistik-Zeile pro User (Voraussetzung für Upserts)"""
+    conn.execute(
+        text(
+            "DELETE FROM statistiken WHERE id NOT IN "
+            "(SELECT MIN(id) FROM statistiken GROUP BY user_id)"
+        )
+    )
+    create_indexes(conn, "statistiken", "ux_statistiken_user_id")
+
+
+@migration(5, "bot_log_archive")
+def bot_log_archive(conn: Connection):
+    """Index der ausgelagerten Bot-Log-Partitionen"""
+    create_tables(conn, "archive_partitions")
+
+
+@migration(6, "keyset_pagination_indexes")
+def keyset_pagination_indexes(conn: Connection):
+    """Indizes auf (Filter, Sortierspalte, id) für die Cursor-Pagination"""
+    recreate_indexes(conn, "bot_logs", "ix_bot_logs_user_id_timestamp")
+    recreate_indexes(
+        conn, "chat_messages", "ix_chat_messages_conversation_id_created_at"
+    )
+    create_indexes(conn, "bewerbungen", "ix_bewerbungen_user_id_bewerbungsdatum_id")
+    create_indexes(
+        conn,
+        "nachrichten",
+        "ix_nachrichten_user_id_zeitstempel_id",
+        "ix_nachrichten_bewerbung_id_zeitstempel_id",
+    )
+    create_indexes(
+        conn, "chat_conversations", "ix_chat_conversations_last_message_at_id"
+    )
+
+
+# Kind-Tabellen vor Eltern-Tabellen (nachrichten verweist auf bewerbungen)
+CASCADE_TABLES = [
+    "nachrichten",
+    "bewerbungen",
+    "statistiken",
+    "bot_status",
+    "bot_logs",
+    "chat_messages",
+    "chat_conversations",
+    "archive_partitions",
+]
+
+
+@migration(7, "cascade_user_deletes", disable_foreign_keys=True)
+def cascade_user_deletes(conn: Connection):
+    """ON DELETE CASCADE auf allen Fremdschlüsseln zu users"""
+    for table_name in CASCADE_TABLES:
+        remove_orphans(conn, table_name)
+
+    for table_name in CASCADE_TABLES:
+        if conn.dialect.name == "sqlite":
+            rebuild_sqlite_table(conn, table_name)
+        else:
+            replace_foreign_keys(conn, table_name)
+
+
+@migration(8, "incremental_statistik")
+def incremental_statistik(conn: Connection):
+    """Zähler der letzten 30 Tage (Abgleich mit den Bewerbungen in Migration 13)"""
+    add_column_if_missing(
+        conn, "statistiken", "bewerbungen_letzte_30_tage", "INTEGER DEFAULT 0"
+    )
+
+
+@migration(9, "monitoring_rollups")
+def monitoring_rollups(conn: Connection):
+    """Stündliche Rollups für das Monitoring und Indizes für deren Aktualisierung"""
+    create_tables(conn, "bewerbung_rollups_hourly", "bot_log_rollups_hourly")
+    create_indexes(
+        conn,
+        "bewerbungen",
+        "ix_bewerbungen_bewerbungsdatum",
+        "ix_bewerbungen_updated_at",
+    )
+
+
+@migration(10, "denormalized_conversation_summary")
+def denormalized_conversation_summary(conn: Connection):
+    """Vorschau der letzten Nachricht und ungelesene Zähler auf chat_conversations"""
+    add_column_if_missing(
+        conn, "chat_conversations", "last_message_preview", "VARCHAR(60)"
+    )
+    for column in ("user_unread_count", "admin_unread_count"):
+        add_column_if_missing(
+            conn, "chat_conversations", column, "INTEGER NOT NULL DEFAULT 0"
+        )
+
+    conversations = ChatConversation.__table__
+    messages = ChatMessage.__table__
+    in_conversation = messages.c.conversation_id == conversations.c.id
+
+    def unread(sender_condition):
+        return (
+            select(func.count(messages.c.id))
+            .where(in_conversation, sender_condition, messages.c.is_read.is_(False))
+            .scalar_subquery()
+        )
+
+    last_message = (
+        select(messages.c.message)
+        .where(in_conversation)
+        .order_by(messages.c.created_at.desc(), messages.c.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    conn.execute(
+        conversations.update().values(
+            last_message_preview=case(
+                (
+                    func.length(last_message) > PREVIEW_LENGTH,
+                    func.substr(last_message, 1, PREVIEW_LENGTH) + "...",
+                ),
+                else_=last_message,
+            ),
+            user_unread_count=unread(messages.c.sender_type != MessageType.USER),
+            admin_unread_count=unread(messages.c.sender_type == MessageType.USER),
+        )
+    )
+
+
+@migration(11, "conversation_read_cursors")
+def conversation_read_cursors(conn: Connection):
+    """Lesezeiger pro Teilnehmer statt is_read auf jeder Nachricht"""
+    for column in (
+        "last_message_id",
+        "user_last_read_message_id",
+        "admin_last_read_message_id",
+    ):
+        add_column_if_missing(conn, "chat_conversations", column, "INTEGER")
+
+    conversations = ChatConversation.__table__
+    messages = ChatMessage.__table__
+    in_conversation = messages.c.conversation_id == conversations.c.id
+    from_user = messages.c.sender_type == MessageType.USER
+    from_support = messages.c.sender_type != MessageType.USER
+
+    def message_id(aggregate, *conditions):
+        return (
+            select(aggregate(messages.c.id))
+            .where(in_conversation, *conditions)
+            .scalar_subquery()
+        )
+
+    # Zeiger direkt vor die älteste ungelesene Nachricht der Gegenseite setzen
+    conn.execute(
+        conversations.update().values(
+            last_message_id=message_id(func.max),
+            user_last_read_message_id=func.coalesce(
+                message_id(func.min, from_support, messages.c.is_read.is_(False)) - 1,
+                message_id(func.max),
+            ),
+            admin_last_read_message_id=func.coalesce(
+                message_id(func.min, from_user, messages.c.is_read.is_(False)) - 1,
+                message_id(func.max),
+            ),
+        )
+    )
+
+    def unread(sender_condition, cursor):
+        return (
+            select(func.count(messages.c.id))
+            .where(in_conversation, sender_condition, messages.c.id > cursor)
+            .scalar_subquery()
+        )
+
+    conn.execute(
+        conversations.update().values(
+            user_unread_count=unread(
+                from_support, func.coalesce(conversations.c.user_last_read_message_id, 0)
+            ),
+            admin_unread_count=unread(
+                from_user, func.coalesce(conversations.c.admin_last_read_message_id, 0)
+            ),
+        )
+    )
+    conn.execute(text("DROP INDEX IF EXISTS ix_chat_messages_sender_type_is_read"))
+
+
+@migration(12, "chat_unread_counters")
+def chat_unread_counters(conn: Connection):
+    """Beim Schreiben gepflegte Zähler für die Benachrichtigungs-Badges"""
+    from services.chat_unread import rebuild_unread_counters
+
+    create_tables(conn, "chat_unread_counters")
+    rebuild_unread_counters(conn)
+
+
+@migration(13, "bewerbung_archive")
+def bewerbung_archive(conn: Connection):
+    """Archivierte Bewerbungen in der Statistik, Abgleich der Zähler"""
+    from services.statistik_service import reconcile_counts
+
+    add_column_if_missing(
+        conn, "statistiken", "archivierte_bewerbungen", "INTEGER DEFAULT 0"
+    )
+    add_column_if_missing(
+        conn, "statistiken", "archivierte_erfolgreiche_bewerbungen", "INTEGER DEFAULT 0"
+    )
+    reconcile_counts(conn)
+
+
+@migration(14, "user_search_indexes")
+def user_search_indexes(conn: Connection):
+    """Ersetzt durch Migration 16 (Suchschlüssel-Spalten)"""
+
+
+@migration(15, "unicode_user_search_indexes")
+def unicode_user_search_indexes(conn: Connection):
+    """Ersetzt durch Migration 16 (Suchschlüssel-Spalten)"""
+
+
+@migration(16, "user_search_keys")
+def user_search_keys(conn: Connection):
+    """
+    Suchschlüssel-Spalten statt Ausdrucksindizes für die Präfixsuche
+
+    Die Indizes der Migrationen 14/15 riefen eine nur in SQLAlchemy
+    registrierte SQL-Funktion auf; Schreibzugriffe über sqlite3 scheiterten
+    daran. Sie werden vor dem Befüllen der neuen Spalten entfernt.
+    """
+    from models.user import SEARCH_KEY_COLUMNS, USERS_SEARCH_KEY_TRIGGER, search_key
+
+    for name in ("email", "vorname", "nachname"):
+        conn.execute(text(f"DROP INDEX IF EXISTS ix_users_{name}_lower"))
+
+    users = Base.metadata.tables["users"]
+    for key_column in SEARCH_KEY_COLUMNS.values():
+        add_column_if_missing(
+            conn, "users", key_column, users.c[key_column].type.compile(conn.dialect)
+        )
+
+    rows = conn.execute(select(users.c.id, *(users.c[c] for c in SEARCH_KEY_COLUMNS)))
+    for row in rows.all():
+        conn.execute(
+            users.update()
+            .where(users.c.id == row.id)
+            .values(
+                {
+                    key_column: search_key(row._mapping[column])
+                    for column, key_column in SEARCH_KEY_COLUMNS.items()
+                },
+            )
+            # Kein Änderungszeitpunkt durch die Migration
+            .values(updated_at=users.c.updated_at)
+        )
+
+    create_indexes(
+        conn,
+        "users",
+        "ix_users_email_lower",
+        "ix_users_vorname_lower",
+        "ix_users_nachname_lower",
+    )
+    USERS_SEARCH_KEY_TRIGGER(target=users, bind=conn)
+
+
+# Runner
+
+
+def get_current_version(conn: Connection) -> int:
+    version = conn.execute(
+        select(schema_version.c.version)
+        .order_by(schema_version.c.version.desc())
+        .limit(1)
+    ).scalar()
+    return version or 0
+
+
+def ensure_version_table(engine: Engine):
+    """Legt die Versionstabelle an, falls sie noch nicht existiert"""
+    with engine.begin() as conn:
+        schema_version.create(bind=conn, checkfirst=True)
+
+
+def _apply(conn: Connection, step: Migration):
+    step.upgrade(conn)
+    conn.execute(
+        schema_version.insert().values(
+            version=step.version, name=step.name, applied_at=datetime.now()
+        )
+    )
+
+
+def _run_without_foreign_keys(engine: Engine, step: Migration):
+    """
+    Führt eine SQLite-Migration mit abgeschalteten Fremdschlüsseln aus.
+
+    ``PRAGMA foreign_keys`` wirkt nur außerhalb einer Transaktion, daher wird
+    die Transaktion hier direkt auf der DBAPI-Verbindung gesteuert.
+    """
+    with engine.connect() as conn:
+        dbapi_connection = conn.connection.dbapi_connection
+        previous_isolation = dbapi_connection.isolation_level
+        foreign_keys = dbapi_connection.execute("PRAGMA foreign_keys").fetchone()[0]
+
+        dbapi_connection.isolation_level = None
+        dbapi_connection.execute("PRAGMA foreign_keys=OFF")
+        try:
+            dbapi_connection.execute("BEGIN")
+            _apply(conn, step)
+            violations = dbapi_connection.execute("PRAGMA foreign_key_check").fetchall()
+            if violations:
+                raise RuntimeError(f"Fremdschlüssel verletzt: {violations[:5]}")
+            dbapi_connection.execute("COMMIT")
+        except Exception:
+            dbapi_connection.execute("ROLLBACK")
+            raise
+        finally:
+            dbapi_connection.execute(f"PRAGMA foreign_keys={foreign_keys}")
+            dbapi_connection.isolation_level = previous_isolation
+
+
+def run_migrations(engine: Engine) -> int:
+    """Führt alle ausstehenden Migrationen aus und gibt die aktuelle Version zurück"""
+    try:
+        with engine.connect() as conn:
+            current = get_current_version(conn)
+    except Exception:
+        # Versionstabelle existiert noch nicht (neue oder alte Datenbank)
+        ensure_version_table(engine)
+        current = 0
+
+    pending = sorted(
+        (m for m in MIGRATIONS if m.version > current), key=lambda m: m.version
+    )
+    if not pending:
+        return current
+
+    for step in pending:
+        logger.info(f"Führe Migration {step.version:03d} ({step.name}) aus...")
+        if step.disable_foreign_keys and engine.dialect.name == "sqlite":
+            _run_without_foreign_keys(engine, step)
+        else:
+            with engine.begin() as conn:
+                _apply(conn, step)
+        current = step.version
+
+    logger.info(f"Datenbank-Schema auf Version {current}")
+    return current
+
+
+if __name__ == "__main__":
+    import sys
+
+    from database.database import engine
+
+    if len(sys.argv) > 1 and sys.argv[1] == "status":
+        ensure_version_table(engine)
+        with engine.connect() as conn:
+            current = get_current_version(conn)
+        latest = max(m.version for m in MIGRATIONS)
+        print(f"Aktuelle Version: {current}, neueste Version: {latest}")
+        for step in sorted(MIGRATIONS, key=lambda m: m.version):
+            marker = "x" if step.version <= current else " "
+            print(f"  [{marker}] {step.version:03d} {step.name}")
+    else:
+        print(f"Schema-Version: {run_migrations(engine)}")
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+
+from database.database import Base
+
+
+class ArchivePartition(Base):
+    """Index der ausgelagerten, komprimierten Partitionen (eine Datei je User und Tag)"""
+
+    __tablename__ = "archive_partitions"
+    __table_args__ = (
+        Index(
+            "ux_archive_partitions_kind_user_id_day",
+            "kind",
+            "user_id",
+            "day",
+            unique=True,
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)  # z.B. bot_logs
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    day = Column(Date, nullable=False)
+    path = Column(String(500), nullable=False)  # relativ zum Archiv-Verzeichnis
+    row_count = Column(Integer, nullable=False, default=0)
+    levels = Column(String(100))  # Enthaltene Log-Level, kommagetrennt
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -1,6 +1,15 @@
 import enum
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, Numeric, String
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -16,9 +25,27 @@ class BewerbungsStatus(enum.Enum):
 
 class Bewerbung(Base):
     __tablename__ = "bewerbungen"
+    __table_args__ = (
+        Index(
+            "ix_bewerbungen_user_id_bewerbungsdatum_status",
+            "user_id",
+            "bewerbungsdatum",
+            "status",
+        ),
+        Index(
+            "ix_bewerbungen_user_id_bewerbungsdatum_id",
+            "user_id",
+            "bewerbungsdatum",
+            "id",
+        ),
+        Index("ix_bewerbungen_bewerbungsdatum", "bewerbungsdatum"),
+        Index("ix_bewerbungen_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     wohnungsname = Column(String(200), nullable=False)
     adresse = Column(String(300), nullable=False)
     preis = Column(Numeric(10, 2))
@@ -29,4 +56,9 @@ class Bewerbung(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     user = relationship("User", back_populates="bewerbungen")
-    nachrichten = relationship("Nachricht", back_populates="bewerbung")
+    nachrichten = relationship(
+        "Nachricht",
+        back_populates="bewerbung",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
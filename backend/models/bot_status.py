@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -9,7 +9,9 @@ class BotStatus(Base):
     __tablename__ = "bot_status"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, unique=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
     status = Column(
         String(20), nullable=False, default="stopped"
     )  # stopped, starting, running, paused, error, stopping
@@ -29,9 +31,15 @@ class BotStatus(Base):
 
 class BotLog(Base):
     __tablename__ = "bot_logs"
+    __table_args__ = (
+        Index("ix_bot_logs_user_id_timestamp", "user_id", "timestamp", "id"),
+        Index("ix_bot_logs_timestamp_level", "timestamp", "level"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     level = Column(String(20), nullable=False)  # INFO, WARNING, ERROR, DEBUG
     message = Column(Text, nullable=False)
     action = Column(String(100))  # start, stop, crawl, apply, error
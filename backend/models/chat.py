@@ -6,6 +6,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -16,6 +17,16 @@ from sqlalchemy.sql import func
 from database.database import Base
 
 
+# Länge der Nachrichtenvorschau in Konversationslisten (ohne "...")
+PREVIEW_LENGTH = 50
+
+
+def message_preview(message: str) -> str:
+    if len(message) > PREVIEW_LENGTH:
+        return message[:PREVIEW_LENGTH] + "..."
+    return message
+
+
 class MessageType(enum.Enum):
     USER = "user"
     ADMIN = "admin"
@@ -24,19 +35,31 @@ class MessageType(enum.Enum):
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        Index(
+            "ix_chat_messages_conversation_id_created_at",
+            "conversation_id",
+            "created_at",
+            "id",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     conversation_id = Column(
         String(36), nullable=False, index=True
     )  # UUID für Konversations-Gruppierung
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     sender_type = Column(Enum(MessageType), nullable=False)
     sender_id = Column(Integer, nullable=True)  # ID des Admins wenn sender_type=ADMIN
     sender_name = Column(String(100), nullable=False)
     message = Column(Text, nullable=False)
-    is_read = Column(Boolean, default=False)
+    is_read = Column(
+        Boolean, default=False
+    )  # Veraltet, siehe Lesezeiger der Konversation
     reply_to_id = Column(
-        Integer, ForeignKey("chat_messages.id"), nullable=True
+        Integer, ForeignKey("chat_messages.id", ondelete="SET NULL"), nullable=True
     )  # Für Antworten
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -48,16 +71,64 @@ class ChatMessage(Base):
 
 class ChatConversation(Base):
     __tablename__ = "chat_conversations"
+    __table_args__ = (
+        Index("ix_chat_conversations_last_message_at_id", "last_message_at", "id"),
+    )
 
     id = Column(String(36), primary_key=True)  # UUID
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     subject = Column(String(200), default="Support-Anfrage")
     status = Column(String(20), default="open")  # open, closed, pending
     priority = Column(String(10), default="normal")  # low, normal, high, urgent
-    assigned_admin_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    assigned_admin_id = Column(
+        Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
     last_message_at = Column(DateTime(timezone=True), server_default=func.now())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Beim Schreiben gepflegt, damit Listen ohne Abfrage pro Konversation auskommen
+    last_message_preview = Column(String(60))
+    user_unread_count = Column(
+        Integer, nullable=False, default=0, server_default="0"
+    )  # Admin → User
+    admin_unread_count = Column(
+        Integer, nullable=False, default=0, server_default="0"
+    )  # User → Admin
+
+    # Lesezeiger: Nachrichten der Gegenseite bis zu dieser ID gelten als gelesen
+    last_message_id = Column(Integer)
+    user_last_read_message_id = Column(Integer)
+    admin_last_read_message_id = Column(Integer)
+
+    def is_read(self, message: "ChatMessage") -> bool:
+        """Ob der Empfänger einer Nachricht sie bereits gelesen hat"""
+        if message.sender_type == MessageType.USER:
+            cursor = self.admin_last_read_message_id
+        else:
+            cursor = self.user_last_read_message_id
+        return cursor is not None and message.id <= cursor
+
     # Relationships
-    user = relationship("User", foreign_keys=[user_id])
+    user = relationship(
+        "User", foreign_keys=[user_id], back_populates="chat_conversations"
+    )
     assigned_admin = relationship("User", foreign_keys=[assigned_admin_id])
+
+
+class UnreadCounter(Base):
+    """
+    Ungelesene Nachrichten pro Badge-Empfänger, beim Schreiben gepflegt
+
+    ``scope`` ist ``admin`` (gemeinsamer Zähler aller Admins) oder
+    ``user:<id>``.
+    """
+
+    __tablename__ = "chat_unread_counters"
+
+    scope = Column(String(50), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    unread_messages = Column(Integer, nullable=False, default=0)
+    unread_conversations = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -1,4 +1,13 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -7,10 +16,23 @@ from database.database import Base
 
 class Nachricht(Base):
     __tablename__ = "nachrichten"
+    __table_args__ = (
+        Index("ix_nachrichten_user_id_zeitstempel_id", "user_id", "zeitstempel", "id"),
+        Index(
+            "ix_nachrichten_bewerbung_id_zeitstempel_id",
+            "bewerbung_id",
+            "zeitstempel",
+            "id",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    bewerbung_id = Column(Integer, ForeignKey("bewerbungen.id"), nullable=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    bewerbung_id = Column(
+        Integer, ForeignKey("bewerbungen.id", ondelete="CASCADE"), nullable=True
+    )
     absender = Column(String(100), nullable=False)
     text = Column(Text, nullable=False)
     zeitstempel = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String
+
+from database.database import Base
+from models.bewerbung import BewerbungsStatus
+
+
+class BewerbungRollup(Base):
+    """Bewerbungen pro Stunde, User und Status (Stunde nach Bewerbungsdatum)"""
+
+    __tablename__ = "bewerbung_rollups_hourly"
+    __table_args__ = (
+        Index(
+            "ux_bewerbung_rollups_hourly_hour_user_id_status",
+            "hour",
+            "user_id",
+            "status",
+            unique=True,
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    hour = Column(DateTime, nullable=False)  # Beginn der Stunde
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    status = Column(Enum(BewerbungsStatus), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class BotLogRollup(Base):
+    """Bot-Logs pro Stunde, User und Level"""
+
+    __tablename__ = "bot_log_rollups_hourly"
+    __table_args__ = (
+        Index(
+            "ux_bot_log_rollups_hourly_hour_user_id_level",
+            "hour",
+            "user_id",
+            "level",
+            unique=True,
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    hour = Column(DateTime, nullable=False)  # Beginn der Stunde
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    level = Column(String(20), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
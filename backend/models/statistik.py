@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -7,12 +7,19 @@ from database.database import Base
 
 class Statistik(Base):
     __tablename__ = "statistiken"
+    __table_args__ = (Index("ux_statistiken_user_id", "user_id", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     anzahl_verschickter_bewerbungen = Column(Integer, default=0)
     bewerbungen_pro_tag = Column(Integer, default=0)
     erfolgreiche_bewerbungen = Column(Integer, default=0)
+    bewerbungen_letzte_30_tage = Column(Integer, default=0)
+    # Bereits ins Archiv verschobene Bewerbungen (in den Summen oben enthalten)
+    archivierte_bewerbungen = Column(Integer, default=0)
+    archivierte_erfolgreiche_bewerbungen = Column(Integer, default=0)
     letzter_login = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -1,9 +1,39 @@
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    inspect,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from database.database import Base
 
+# Spalten der Präfixsuche (services/user_index) und ihre kleingeschriebene Kopie
+SEARCH_KEY_COLUMNS = {
+    "email": "email_lower",
+    "vorname": "vorname_lower",
+    "nachname": "nachname_lower",
+}
+
+
+def search_key(value):
+    """Suchschlüssel mit Unicode-Faltung, das lower() von SQLite faltet nur ASCII"""
+    return value.lower() if isinstance(value, str) else value
+
+
+def _search_key_default(column: str):
+    def default(context):
+        return search_key(context.get_current_parameters().get(column))
+
+    return default
+
 
 class User(Base):
     __tablename__ = "users"
@@ -21,9 +51,87 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    bewerbungen = relationship("Bewerbung", back_populates="user")
-    statistiken = relationship("Statistik", back_populates="user")
-    nachrichten = relationship("Nachricht", back_populates="user")
-    bot_status = relationship("BotStatus", back_populates="user", uselist=False)
-    bot_logs = relationship("BotLog", back_populates="user")
-    chat_messages = relationship("ChatMessage", back_populates="user")
+    # Beim Schreiben gepflegte Suchschlüssel, siehe SEARCH_KEY_COLUMNS
+    email_lower = Column(String(100), default=_search_key_default("email"))
+    vorname_lower = Column(String(50), default=_search_key_default("vorname"))
+    nachname_lower = Column(String(50), default=_search_key_default("nachname"))
+
+    # Abhängige Daten werden per ON DELETE CASCADE von der Datenbank gelöscht
+    bewerbungen = relationship(
+        "Bewerbung",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    statistiken = relationship(
+        "Statistik",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    nachrichten = relationship(
+        "Nachricht",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    bot_status = relationship(
+        "BotStatus",
+        back_populates="user",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    bot_logs = relationship(
+        "BotLog",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    chat_messages = relationship(
+        "ChatMessage",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    chat_conversations = relationship(
+        "ChatConversation",
+        foreign_keys="ChatConversation.user_id",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+
+@event.listens_for(User, "before_update")
+def _update_search_keys(mapper, connection, target):
+    state = inspect(target)
+    for column, key_column in SEARCH_KEY_COLUMNS.items():
+        if state.attrs[column].history.has_changes():
+            setattr(target, key_column, search_key(getattr(target, column)))
+
+
+# Schreibzugriffe ohne SQLAlchemy (sqlite3, create_test_admin.py) setzen keine
+# Suchschlüssel; SQLite ergänzt sie dort mit dem eingebauten lower()
+USERS_SEARCH_KEY_TRIGGER = DDL(
+    """
+    CREATE TRIGGER IF NOT EXISTS users_search_keys_insert
+    AFTER INSERT ON users
+    WHEN NEW.email_lower IS NULL
+        OR NEW.vorname_lower IS NULL
+        OR NEW.nachname_lower IS NULL
+    BEGIN
+        UPDATE users SET
+            email_lower = coalesce(NEW.email_lower, lower(NEW.email)),
+            vorname_lower = coalesce(NEW.vorname_lower, lower(NEW.vorname)),
+            nachname_lower = coalesce(NEW.nachname_lower, lower(NEW.nachname))
+        WHERE id = NEW.id;
+    END
+    """
+).execute_if(dialect="sqlite")
+event.listen(User.__table__, "after_create", USERS_SEARCH_KEY_TRIGGER)
+
+# Präfixsuche der Admin-Übersicht: Bereichsabfragen auf den Suchschlüsseln
+Index("ix_users_email_lower", User.email_lower)
+Index("ix_users_vorname_lower", User.vorname_lower)
+Index("ix_users_nachname_lower", User.nachname_lower)
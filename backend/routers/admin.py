@@ -1,27 +1,63 @@
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from core.auth import get_current_admin_user
+from core.logging_config import get_logger
+from core.pagination import set_next_cursor, set_total_count
+from core.responses import FastJSONResponse
 from core.schemas import User, UserCreate
 from core.security import get_password_hash
 from database.database import get_db
 from models.user import User as UserModel
 from services.email_service import email_service
+from services.user_index import query_users
+from services.user_purge import purge_users
+
+logger = get_logger("admin")
 
 router = APIRouter(prefix="/api/users", tags=["admin"])
 
 
-@router.get("/", response_model=List[User])
+@router.get("/", response_model=List[User], response_class=FastJSONResponse)
 def get_all_users(
+    q: Optional[str] = Query(None, max_length=100),
+    is_active: Optional[bool] = Query(None),
+    is_admin: Optional[bool] = Query(None),
+    sort: Literal["id", "email", "vorname", "nachname", "created_at"] = Query("id"),
+    order: Literal["asc", "desc"] = Query("asc"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_admin: UserModel = Depends(get_current_admin_user),
 ):
-    users = db.query(UserModel).all()
-    return users
+    """
+    One page of users. ``q`` is a case-insensitive prefix search on email,
+    first and last name; the total match count is sent as ``X-Total-Count``.
+    """
+    # Only the schema's columns, serialized without building ORM objects
+    page = query_users(
+        db,
+        [UserModel.__table__.c[name] for name in User.model_fields],
+        q=q,
+        is_active=is_active,
+        is_admin=is_admin,
+        sort=sort,
+        descending=order == "desc",
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+    )
+    response = FastJSONResponse(page.rows)
+    set_total_count(response, page.total)
+    set_next_cursor(response, page.next_cursor)
+    return response
 
 
 @router.post("/", response_model=User)
@@ -179,109 +215,59 @@ def update_user(
 
 
 @router.delete("/{user_id}")
-def delete_user(
+async def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
     current_admin: UserModel = Depends(get_current_admin_user),
 ):
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    if user.id == current_admin.id:
+    if user_id == current_admin.id:
         raise HTTPException(status_code=400, detail="Cannot delete your own account")
 
     try:
-        # Import the related models - use try/except for optional models
-        print(f"Deleting related records for user {user.email}...")
-
-        # Delete Nachrichten
-        try:
-            from models.nachricht import Nachricht
-
-            nachrichten_count = (
-                db.query(Nachricht).filter(Nachricht.user_id == user_id).count()
-            )
-            if nachrichten_count > 0:
-                db.query(Nachricht).filter(Nachricht.user_id == user_id).delete()
-                print(f"Deleted {nachrichten_count} Nachrichten")
-        except ImportError:
-            print("Nachricht model not found, skipping...")
-
-        # Delete Bewerbungen
-        try:
-            from models.bewerbung import Bewerbung
-
-            bewerbungen_count = (
-                db.query(Bewerbung).filter(Bewerbung.user_id == user_id).count()
-            )
-            if bewerbungen_count > 0:
-                db.query(Bewerbung).filter(Bewerbung.user_id == user_id).delete()
-                print(f"Deleted {bewerbungen_count} Bewerbungen")
-        except ImportError:
-            print("Bewerbung model not found, skipping...")
-
-        # Delete Statistiken
-        try:
-            from models.statistik import Statistik
-
-            statistiken_count = (
-                db.query(Statistik).filter(Statistik.user_id == user_id).count()
-            )
-            if statistiken_count > 0:
-                db.query(Statistik).filter(Statistik.user_id == user_id).delete()
-                print(f"Deleted {statistiken_count} Statistiken")
-        except ImportError:
-            print("Statistik model not found, skipping...")
-
-        # Delete BotStatus
-        try:
-            from models.bot_status import BotStatus
-
-            bot_status = (
-                db.query(BotStatus).filter(BotStatus.user_id == user_id).first()
-            )
-            if bot_status:
-                db.delete(bot_status)
-                print("Deleted BotStatus")
-        except ImportError:
-            print("BotStatus model not found, skipping...")
-
-        # Delete ChatMessages
-        try:
-            from models.chat import ChatMessage
-
-            chat_messages_count = (
-                db.query(ChatMessage).filter(ChatMessage.user_id == user_id).count()
-            )
-            if chat_messages_count > 0:
-                db.query(ChatMessage).filter(ChatMessage.user_id == user_id).delete()
-                print(f"Deleted {chat_messages_count} ChatMessages")
-        except ImportError:
-            print("ChatMessage model not found, skipping...")
-
-        # Delete BotLogs
-        try:
-            from models.bot_status import BotLog
-
-            bot_logs_count = db.query(BotLog).filter(BotLog.user_id == user_id).count()
-            if bot_logs_count > 0:
-                db.query(BotLog).filter(BotLog.user_id == user_id).delete()
-                print(f"Deleted {bot_logs_count} BotLogs")
-        except ImportError:
-            print("BotLog model not found, skipping...")
-
-        # Now delete the user
-        db.delete(user)
-        db.commit()
+        # Related rows are removed by ON DELETE CASCADE in the same statement
+        deleted = await purge_users(db, [user_id])
+    except Exception as e:
+        logger.error(f"Error deleting user {user_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error deleting user: {str(e)}")
+
+    if not deleted:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return {"message": "User and all related data deleted successfully"}
+
+
+class UserPurgeRequest(BaseModel):
+    user_ids: List[int] = Field(..., min_length=1, max_length=500)
+
 
-        print(f"Successfully deleted user {user.email}")
-        return {"message": "User and all related data deleted successfully"}
+def _existing_user_ids(db: Session, user_ids: set) -> set:
+    return set(db.scalars(select(UserModel.id).where(UserModel.id.in_(user_ids))))
 
+
+@router.post("/purge")
+async def purge_users_bulk(
+    request: UserPurgeRequest,
+    db: Session = Depends(get_db),
+    current_admin: UserModel = Depends(get_current_admin_user),
+):
+    """Delete many users and all their data in one transaction"""
+    user_ids = set(request.user_ids)
+    if current_admin.id in user_ids:
+        raise HTTPException(status_code=400, detail="Cannot delete your own account")
+
+    existing = await run_in_threadpool(_existing_user_ids, db, user_ids)
+
+    try:
+        deleted = await purge_users(db, existing)
     except Exception as e:
-        db.rollback()
-        print(f"Error deleting user: {e}")
-        raise HTTPException(status_code=500, detail=f"Error deleting user: {str(e)}")
+        logger.error(f"Error purging users: {e}")
+        raise HTTPException(status_code=500, detail=f"Error purging users: {str(e)}")
+
+    return {
+        "message": f"{deleted} users and all related data deleted successfully",
+        "deleted": deleted,
+        "not_found": sorted(user_ids - existing),
+    }
 
 
 @router.put("/{user_id}/admin")
@@ -369,20 +355,17 @@ def test_email_configuration(
     """Admin: Testet die E-Mail-Konfiguration"""
     try:
         is_working = email_service.test_email_configuration()
-        
+
         if is_working:
             return {
                 "success": True,
-                "message": "E-Mail-Konfiguration ist funktionsfähig"
+                "message": "E-Mail-Konfiguration ist funktionsfähig",
             }
         else:
-            return {
-                "success": False,
-                "message": "E-Mail-Konfiguration ist fehlerhaft"
-            }
-            
+            return {"success": False, "message": "E-Mail-Konfiguration ist fehlerhaft"}
+
     except Exception as e:
         return {
             "success": False,
-            "message": f"Fehler beim Testen der E-Mail-Konfiguration: {str(e)}"
+            "message": f"Fehler beim Testen der E-Mail-Konfiguration: {str(e)}",
         }
@@ -22,6 +22,7 @@ from core.security import (
 )
 from database.database import get_db
 from models.user import User as UserModel
+from services.statistik_service import record_login
 
 router = APIRouter(prefix="/api", tags=["auth"])
 
@@ -59,6 +60,8 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    record_login(db, user.id)
+
     access_token = create_access_token(data={"sub": user.email, "is_admin": user.is_admin})
     refresh_token = create_refresh_token(data={"sub": user.email, "is_admin": user.is_admin})
     return {
@@ -83,6 +86,8 @@ def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    record_login(db, user.id)
+
     access_token = create_access_token(data={"sub": user.email, "is_admin": user.is_admin})
     refresh_token = create_refresh_token(data={"sub": user.email, "is_admin": user.is_admin})
     return {
@@ -143,12 +148,13 @@ def update_bewerbungsprofil(
     db: Session = Depends(get_db),
 ):
     """Update user's Bewerbungsprofil (application profile)"""
+    user = db.get(UserModel, current_user.id)
 
     # Get existing bewerbungsprofil data or empty dict
     existing_profil = {}
-    if current_user.bewerbungsprofil:
+    if user.bewerbungsprofil:
         try:
-            existing_profil = json.loads(current_user.bewerbungsprofil)
+            existing_profil = json.loads(user.bewerbungsprofil)
         except json.JSONDecodeError:
             existing_profil = {}
 
@@ -157,15 +163,15 @@ def update_bewerbungsprofil(
     existing_profil.update(profil_dict)
 
     # Save updated profile as JSON string
-    current_user.bewerbungsprofil = json.dumps(existing_profil, ensure_ascii=False)
+    user.bewerbungsprofil = json.dumps(existing_profil, ensure_ascii=False)
 
     # Mark profile as completed
-    current_user.profile_completed = True
+    user.profile_completed = True
 
     db.commit()
-    db.refresh(current_user)
+    db.refresh(user)
 
-    return current_user
+    return user
 
 
 @router.get("/bewerbungsprofil")
@@ -199,9 +205,10 @@ def update_filter_einstellungen(
     filter_einstellungen = filter_data.get("filter_einstellungen", "{}")
 
     # Update the user's filter settings
-    current_user.filter_einstellungen = filter_einstellungen
+    user = db.get(UserModel, current_user.id)
+    user.filter_einstellungen = filter_einstellungen
 
     db.commit()
-    db.refresh(current_user)
+    db.refresh(user)
 
-    return current_user
+    return user
@@ -0,0 +1,159 @@
+from datetime import date
+from typing import Any, Callable, Dict, List, Literal, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy.orm import Session
+
+from core.auth import get_current_active_user, get_current_user_with_profile
+from core.logging_config import get_logger
+from core.rate_limit import charge_sub_request, retry_after_seconds
+from core.responses import FastJSONResponse
+from core.user_cache import UserSnapshot
+from database.database import get_db
+from routers.chat import notification_count
+from routers.statistiken import get_dashboard_statistik, user_statistik
+from services.immobilien_bot_manager import bot_manager
+
+logger = get_logger("batch")
+
+router = APIRouter(prefix="/api", tags=["batch"])
+
+MAX_BATCH_SIZE = 20
+
+BatchHandler = Callable[[Session, UserSnapshot, Dict[str, str]], Any]
+
+
+class BatchItem(BaseModel):
+    id: str
+    path: str  # e.g. "/api/statistik/dashboard?granularity=week"
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class DashboardParams(BaseModel):
+    start: Optional[date] = None
+    end: Optional[date] = None
+    granularity: Literal["day", "week", "month"] = "month"
+
+
+def bot_status(db: Session, user: UserSnapshot, params: Dict[str, str]):
+    get_current_user_with_profile(user)
+    return bot_manager.get_bot_status(user.id)
+
+
+def statistik(db: Session, user: UserSnapshot, params: Dict[str, str]):
+    get_current_user_with_profile(user)
+    return user_statistik(db, user)
+
+
+def dashboard(db: Session, user: UserSnapshot, params: Dict[str, str]):
+    options = DashboardParams(**params)
+    return get_dashboard_statistik(
+        options.start,
+        options.end,
+        options.granularity,
+        db,
+        get_current_user_with_profile(user),
+    )
+
+
+def notifications(db: Session, user: UserSnapshot, params: Dict[str, str]):
+    return notification_count(db, user)
+
+
+def filter_settings(db: Session, user: UserSnapshot, params: Dict[str, str]):
+    return {"filter_einstellungen": user.filter_einstellungen}
+
+
+# Read endpoints that can be fetched through /api/batch, keyed by their own path
+BATCH_HANDLERS: Dict[str, BatchHandler] = {
+    "/api/bot/status": bot_status,
+    "/api/statistik": statistik,
+    "/api/statistik/dashboard": dashboard,
+    "/api/chat/notifications/count": notifications,
+    "/api/filter": filter_settings,
+}
+
+
+def handler_path(item: BatchItem) -> str:
+    return urlsplit(item.path).path.rstrip("/")
+
+
+async def rate_limited_items(
+    request: Request, user: UserSnapshot, items: List[BatchItem]
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Charge every sub-request against the budget of its own route.
+
+    Otherwise a batch of polls would cost a single token. Returns 429
+    results for the denied items, keyed by their position.
+    """
+    denied = {}
+    for index, item in enumerate(items):
+        path = handler_path(item)
+        if path not in BATCH_HANDLERS:
+            continue
+        limited = await charge_sub_request(request, path, user.email)
+        if limited is not None:
+            _, decision = limited
+            denied[index] = {
+                "id": item.id,
+                "status": 429,
+                "detail": "Too many requests",
+                "retry_after": retry_after_seconds(decision),
+            }
+    return denied
+
+
+def run_item(db: Session, user: UserSnapshot, item: BatchItem) -> Dict[str, Any]:
+    """Run one sub-request and wrap its result or error like a response"""
+    url = urlsplit(item.path)
+    handler = BATCH_HANDLERS.get(handler_path(item))
+    if handler is None:
+        return {"id": item.id, "status": 404, "detail": "Not Found"}
+
+    try:
+        body = handler(db, user, dict(parse_qsl(url.query)))
+    except HTTPException as e:
+        return {"id": item.id, "status": e.status_code, "detail": e.detail}
+    except ValidationError as e:
+        return {
+            "id": item.id,
+            "status": 422,
+            "detail": e.errors(include_url=False, include_context=False),
+        }
+    except Exception as e:
+        logger.error("Batch sub-request failed", path=item.path, error=str(e))
+        return {"id": item.id, "status": 500, "detail": "Internal Server Error"}
+
+    return {"id": item.id, "status": 200, "body": body}
+
+
+@router.post("/batch", response_class=FastJSONResponse)
+async def batch(
+    request: Request,
+    batch_request: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_active_user),
+) -> FastJSONResponse:
+    """
+    Run several read requests with one round trip, one auth resolution and
+    one DB session. Results keep the order of the request list; items over
+    their route's rate limit are answered with 429 and not run.
+    """
+    items = batch_request.requests
+    denied = await rate_limited_items(request, current_user, items)
+
+    def run_all() -> List[Dict[str, Any]]:
+        # A Session is not thread-safe, so the sub-requests share one worker
+        return [
+            denied.get(index) or run_item(db, current_user, item)
+            for index, item in enumerate(items)
+        ]
+
+    return FastJSONResponse(await run_in_threadpool(run_all))
@@ -1,23 +1,27 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from core.auth import get_current_active_user, get_current_user_with_profile
-from core.schemas import Bewerbung, BewerbungCreate
+from core.pagination import paginate, set_next_cursor
+from core.schemas import ArchivierteBewerbung, Bewerbung, BewerbungCreate
 from database.database import get_db
 from models.bewerbung import Bewerbung as BewerbungModel
 from models.bewerbung import BewerbungsStatus
 from models.user import User
+from services.bewerbung_archive import bewerbung_archive
 
 router = APIRouter(prefix="/api/bewerbungen", tags=["bewerbungen"])
 
 
 @router.get("/", response_model=List[Bewerbung])
 def get_bewerbungen(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_with_profile),
 ):
@@ -30,7 +34,15 @@ def get_bewerbungen(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid status")
 
-    bewerbungen = query.offset(skip).limit(limit).all()
+    bewerbungen, next_cursor = paginate(
+        query,
+        BewerbungModel.bewerbungsdatum,
+        BewerbungModel.id,
+        cursor=cursor,
+        limit=limit,
+        skip=skip,
+    )
+    set_next_cursor(response, next_cursor)
     return bewerbungen
 
 
@@ -47,6 +59,17 @@ def create_bewerbung(
     return db_bewerbung
 
 
+@router.get("/archiv", response_model=List[ArchivierteBewerbung])
+def get_archivierte_bewerbungen(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Read-only history of archived applications, newest first"""
+    return bewerbung_archive.read_user_history(db, current_user.id, skip, limit)
+
+
 @router.get("/{bewerbung_id}", response_model=Bewerbung)
 def get_bewerbung_details(
     bewerbung_id: int,
@@ -1,14 +1,20 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from core.auth import get_current_active_user, get_current_admin_user, get_current_user_with_profile
-from database.database import get_db
+from core.etag import check_etag
+from core.pagination import set_next_cursor, set_total_count
+from core.responses import FastJSONResponse
+from database.database import get_async_db, get_db
 from models.bot_status import BotLog
 from models.user import User
-from services.immobilien_bot_manager import bot_manager
+from services.immobilien_bot_manager import BotStatus, bot_manager
+from services.log_archive import bot_log_archive
+from services.user_index import query_users
 
 router = APIRouter(prefix="/api/bot", tags=["bot"])
 
@@ -36,39 +42,45 @@ async def stop_bot(
 
 @router.get("/status")
 def get_bot_status(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user_with_profile),
 ) -> Dict[str, Any]:
     """Gibt den aktuellen Bot-Status für den User zurück"""
+    not_modified = check_etag(request, response, "bot_status", current_user.id)
+    if not_modified is not None:
+        return not_modified
     return bot_manager.get_bot_status(current_user.id)
 
 
 @router.put("/config")
 async def update_bot_config(
     config: BotConfigUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user_with_profile),
 ) -> Dict[str, Any]:
     """Aktualisiert die Bot-Konfiguration für den User"""
     try:
+        user = await db.get(User, current_user.id)
+
         # User-Konfiguration in Datenbank aktualisieren
         if config.filter_einstellungen is not None:
-            current_user.filter_einstellungen = config.filter_einstellungen
+            user.filter_einstellungen = config.filter_einstellungen
 
         if config.bewerbungsprofil is not None:
-            current_user.bewerbungsprofil = config.bewerbungsprofil
+            user.bewerbungsprofil = config.bewerbungsprofil
 
-        db.commit()
-        db.refresh(current_user)
+        await db.commit()
 
         return {
             "success": True,
             "message": "Bot-Konfiguration erfolgreich aktualisiert",
-            "filter_einstellungen": current_user.filter_einstellungen,
-            "bewerbungsprofil": current_user.bewerbungsprofil,
+            "filter_einstellungen": user.filter_einstellungen,
+            "bewerbungsprofil": user.bewerbungsprofil,
         }
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         return {
             "success": False,
             "message": f"Fehler beim Aktualisieren der Konfiguration: {str(e)}",
@@ -77,29 +89,34 @@ async def update_bot_config(
 
 @router.get("/logs")
 def get_bot_logs(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
     level: str = Query(None),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_with_profile),
 ) -> List[Dict[str, Any]]:
     """Gibt die Bot-Logs für den aktuellen User zurück"""
-    query = db.query(BotLog).filter(BotLog.user_id == current_user.id)
-
-    if level:
-        query = query.filter(BotLog.level == level.upper())
-
-    logs = query.order_by(BotLog.timestamp.desc()).offset(skip).limit(limit).all()
+    logs, next_cursor = bot_log_archive.read_user_logs(
+        db,
+        current_user.id,
+        level=level.upper() if level else None,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+    )
+    set_next_cursor(response, next_cursor)
 
     return [
         {
-            "id": log.id,
-            "level": log.level,
-            "message": log.message,
-            "action": log.action,
-            "listing_id": log.listing_id,
-            "details": log.details,
-            "timestamp": log.timestamp.isoformat(),
+            "id": log["id"],
+            "level": log["level"],
+            "message": log["message"],
+            "action": log["action"],
+            "listing_id": log["listing_id"],
+            "details": log["details"],
+            "timestamp": log["timestamp"].isoformat(),
         }
         for log in logs
     ]
@@ -114,6 +131,7 @@ def clear_bot_logs(
         deleted_count = (
             db.query(BotLog).filter(BotLog.user_id == current_user.id).delete()
         )
+        deleted_count += bot_log_archive.delete_user(db, current_user.id)
         db.commit()
 
         return {"success": True, "message": f"{deleted_count} Log-Einträge gelöscht"}
@@ -124,34 +142,62 @@ def clear_bot_logs(
 
 
 # Admin-Endpunkte
-@router.get("/admin/users")
+@router.get("/admin/users", response_class=FastJSONResponse)
 def get_all_users_with_bot_status(
+    q: Optional[str] = Query(None, max_length=100),
+    bot_status: Optional[BotStatus] = Query(None),
+    is_active: Optional[bool] = Query(None),
+    sort: Literal["id", "email", "vorname", "nachname", "created_at"] = Query("id"),
+    order: Literal["asc", "desc"] = Query("asc"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user),
-) -> List[Dict[str, Any]]:
-    """Admin: Gibt alle User mit ihrem Bot-Status zurück"""
-    users = db.query(User).all()
-    users_with_status = []
-    
-    for user in users:
-        bot_status = bot_manager.get_bot_status(user.id)
-        user_data = {
-            "id": user.id,
-            "email": user.email,
-            "vorname": user.vorname,
-            "nachname": user.nachname,
-            "is_admin": user.is_admin,
-            "is_active": user.is_active,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "bot_status": bot_status["status"],
-            "last_activity": bot_status.get("last_activity"),
-            "current_action": bot_status.get("current_action", ""),
-            "applications_sent": bot_status.get("applications_sent", 0),
-            "listings_found": bot_status.get("listings_found", 0),
-        }
-        users_with_status.append(user_data)
-    
-    return users_with_status
+) -> FastJSONResponse:
+    """
+    Admin: Gibt eine Seite der User mit ihrem Bot-Status zurück
+
+    ``q`` sucht per Präfix in E-Mail, Vor- und Nachname. Die Gesamtzahl der
+    Treffer steht im Header ``X-Total-Count``.
+    """
+    # Ein Snapshot für Filter und Anzeige, statt einer Sperre je User
+    statuses = bot_manager.snapshot()
+    page = query_users(
+        db,
+        [
+            User.id,
+            User.email,
+            User.vorname,
+            User.nachname,
+            User.is_admin,
+            User.is_active,
+            User.created_at,
+        ],
+        q=q,
+        bot_status=bot_status.value if bot_status else None,
+        statuses=statuses,
+        is_active=is_active,
+        sort=sort,
+        descending=order == "desc",
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+    )
+
+    for user_data in page.rows:
+        status = statuses.get(user_data["id"], {})
+        user_data["bot_status"] = status.get("status", BotStatus.STOPPED.value)
+        user_data["last_activity"] = status.get("last_activity")
+        user_data["current_action"] = status.get("current_action", "")
+        user_data["applications_sent"] = status.get("applications_sent", 0)
+        user_data["listings_found"] = status.get("listings_found", 0)
+
+    response = FastJSONResponse(page.rows)
+    set_total_count(response, page.total)
+    set_next_cursor(response, page.next_cursor)
+    return response
+
 
 @router.get("/admin/status")
 def get_all_bot_statuses(
@@ -188,33 +234,27 @@ async def admin_stop_user_bot(
     return await bot_manager.stop_bot(user_id)
 
 
-@router.get("/admin/logs/{user_id}")
+@router.get("/admin/logs/{user_id}", response_class=FastJSONResponse)
 def get_user_bot_logs(
     user_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     level: str = Query(None),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user),
-) -> List[Dict[str, Any]]:
+) -> FastJSONResponse:
     """Admin: Gibt die Bot-Logs für einen bestimmten User zurück"""
-    query = db.query(BotLog).filter(BotLog.user_id == user_id)
-
-    if level:
-        query = query.filter(BotLog.level == level.upper())
-
-    logs = query.order_by(BotLog.timestamp.desc()).offset(skip).limit(limit).all()
-
-    return [
-        {
-            "id": log.id,
-            "user_id": log.user_id,
-            "level": log.level,
-            "message": log.message,
-            "action": log.action,
-            "listing_id": log.listing_id,
-            "details": log.details,
-            "timestamp": log.timestamp.isoformat(),
-        }
-        for log in logs
-    ]
+    logs, next_cursor = bot_log_archive.read_user_logs(
+        db,
+        user_id,
+        level=level.upper() if level else None,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+    )
+
+    # Zeilen aus Tabelle und Archiv haben bereits genau diese Felder
+    response = FastJSONResponse(logs)
+    set_next_cursor(response, next_cursor)
+    return response
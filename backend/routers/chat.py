@@ -5,20 +5,37 @@ from typing import Dict, List, Optional
 
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Depends,
     HTTPException,
     Query,
+    Request,
+    Response,
     WebSocket,
     WebSocketDisconnect,
 )
+from starlette.status import WS_1008_POLICY_VIOLATION
 from pydantic import BaseModel
-from sqlalchemy import and_, desc
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, desc, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from core.auth import get_current_active_user, get_current_admin_user
-from database.database import get_db
-from models.chat import ChatConversation, ChatMessage, MessageType
+from core.etag import check_etag
+from core.logging_config import get_logger
+from core.pagination import paginate, set_next_cursor
+from database.database import db_now, get_async_db, get_db
+from models.chat import (
+    ChatConversation,
+    ChatMessage,
+    MessageType,
+    message_preview,
+)
 from models.user import User
+from services.chat_unread import ADMIN_SCOPE, apply_delta, get_counts, user_scope
+
+logger = get_logger("chat")
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
@@ -164,6 +181,160 @@ def get_or_create_conversation(
     return create_conversation(db, user_id)
 
 
+def conversation_response(
+    conv: ChatConversation, user_name: str, unread_count: int
+) -> ConversationResponse:
+    """Build a list entry from the denormalized conversation columns"""
+    return ConversationResponse(
+        id=conv.id,
+        user_id=conv.user_id,
+        user_name=user_name,
+        subject=conv.subject,
+        status=conv.status,
+        priority=conv.priority,
+        last_message_at=conv.last_message_at,
+        unread_count=unread_count,
+        last_message=conv.last_message_preview,
+    )
+
+
+def message_response(
+    msg: ChatMessage, conversation: Optional[ChatConversation] = None
+) -> ChatMessageResponse:
+    """Serialize a message, deriving is_read from the conversation's read cursors"""
+    return ChatMessageResponse(
+        id=msg.id,
+        conversation_id=msg.conversation_id,
+        sender_type=msg.sender_type.value,
+        sender_name=msg.sender_name,
+        message=msg.message,
+        is_read=conversation.is_read(msg) if conversation else False,
+        reply_to_id=msg.reply_to_id,
+        created_at=msg.created_at,
+    )
+
+
+# A concurrent mark-read moved the cursor first: reload and try again
+MARK_READ_ATTEMPTS = 3
+
+
+def mark_conversation_read(
+    db: Session, conversation: ChatConversation, reader: MessageType
+) -> str:
+    """
+    Move the reader's cursor to the newest message and return the badge scope.
+
+    The UPDATE only applies while the cursor is still where it was loaded and
+    subtracts the loaded count instead of writing 0. A message recorded after
+    the load stays unread behind the cursor and keeps its increment, and two
+    concurrent mark-reads do not subtract the same messages twice.
+    """
+    if reader == MessageType.USER:
+        scope = user_scope(conversation.user_id)
+        cursor_column = ChatConversation.user_last_read_message_id
+        count_column = ChatConversation.user_unread_count
+    else:
+        scope = ADMIN_SCOPE
+        cursor_column = ChatConversation.admin_last_read_message_id
+        count_column = ChatConversation.admin_unread_count
+
+    for _ in range(MARK_READ_ATTEMPTS):
+        seen_id = conversation.last_message_id
+        cursor = getattr(conversation, cursor_column.key)
+        unread = getattr(conversation, count_column.key) or 0
+        if cursor == seen_id and not unread:
+            return scope
+
+        unchanged = cursor_column.is_(None) if cursor is None else cursor_column == cursor
+        remaining = db.execute(
+            update(ChatConversation)
+            .where(ChatConversation.id == conversation.id, unchanged)
+            .values({cursor_column: seen_id, count_column: count_column - unread})
+            .returning(count_column)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+
+        if remaining is None:
+            db.refresh(conversation)
+            continue
+
+        set_committed_value(conversation, cursor_column.key, seen_id)
+        set_committed_value(conversation, count_column.key, remaining)
+        apply_delta(
+            db,
+            scope,
+            messages=-unread,
+            conversations=-int(unread > 0 and remaining == 0),
+            user_id=conversation.user_id if reader == MessageType.USER else None,
+        )
+        return scope
+
+    logger.warning(
+        "Could not mark conversation as read", conversation_id=conversation.id
+    )
+    return scope
+
+
+def record_new_message(
+    db: Session, conversation_id: str, message: ChatMessage
+) -> str:
+    """
+    Update the conversation summary and the recipient's unread counter in the
+    same transaction as the insert. Returns the badge scope that changed.
+    """
+    db.flush()  # assigns message.id
+    unread_column = (
+        ChatConversation.admin_unread_count
+        if message.sender_type == MessageType.USER
+        else ChatConversation.user_unread_count
+    )
+    values = {
+        ChatConversation.last_message_at: db_now(),
+        ChatConversation.last_message_id: message.id,
+        ChatConversation.last_message_preview: message_preview(message.message),
+        unread_column: unread_column + 1,
+    }
+    if message.sender_type == MessageType.ADMIN:
+        values[ChatConversation.assigned_admin_id] = message.sender_id
+
+    unread, owner_id = db.execute(
+        update(ChatConversation)
+        .where(ChatConversation.id == conversation_id)
+        .values(values)
+        .returning(unread_column, ChatConversation.user_id)
+        .execution_options(synchronize_session=False)
+    ).one()
+
+    # The conversation only starts counting as unread with its first unread message
+    to_admins = message.sender_type == MessageType.USER
+    apply_delta(
+        db,
+        ADMIN_SCOPE if to_admins else user_scope(owner_id),
+        messages=1,
+        conversations=int(unread == 1),
+        user_id=None if to_admins else owner_id,
+    )
+    return ADMIN_SCOPE if to_admins else user_scope(owner_id)
+
+
+def unread_badge(db: Session, scope: str) -> Dict[str, int]:
+    """Badge payload as returned by the notification count endpoints"""
+    unread_messages, unread_conversations = get_counts(db, scope)
+    if scope == ADMIN_SCOPE:
+        return {"count": unread_messages, "unread_conversations": unread_conversations}
+    return {"count": 1 if unread_conversations else 0}
+
+
+def push_unread_badge(background_tasks: BackgroundTasks, db: Session, scope: str):
+    """Push the current badge over WebSocket once the response has been sent"""
+    message = {"type": "unread_count", "data": unread_badge(db, scope)}
+    if scope == ADMIN_SCOPE:
+        background_tasks.add_task(manager.send_to_all_admins, message)
+    else:
+        user_id = int(scope.split(":", 1)[1])
+        background_tasks.add_task(manager.send_to_user, user_id, message)
+
+
 # REST Endpoints
 
 
@@ -179,48 +350,11 @@ def get_user_conversations(
         .all()
     )
 
-    result = []
-    for conv in conversations:
-        # Get unread message count
-        unread_count = (
-            db.query(ChatMessage)
-            .filter(
-                and_(
-                    ChatMessage.conversation_id == conv.id,
-                    ChatMessage.sender_type != MessageType.USER,
-                    ChatMessage.is_read.is_(False),
-                )
-            )
-            .count()
-        )
-
-        # Get last message
-        last_message = (
-            db.query(ChatMessage)
-            .filter(ChatMessage.conversation_id == conv.id)
-            .order_by(desc(ChatMessage.created_at))
-            .first()
-        )
-
-        result.append(
-            ConversationResponse(
-                id=conv.id,
-                user_id=conv.user_id,
-                user_name=f"{current_user.vorname} {current_user.nachname}",
-                subject=conv.subject,
-                status=conv.status,
-                priority=conv.priority,
-                last_message_at=conv.last_message_at,
-                unread_count=unread_count,
-                last_message=(
-                    last_message.message[:50] + "..."
-                    if last_message and len(last_message.message) > 50
-                    else last_message.message if last_message else None
-                ),
-            )
-        )
-
-    return result
+    user_name = f"{current_user.vorname} {current_user.nachname}"
+    return [
+        conversation_response(conv, user_name, conv.user_unread_count)
+        for conv in conversations
+    ]
 
 
 @router.get(
@@ -229,8 +363,11 @@ def get_user_conversations(
 )
 def get_conversation_messages(
     conversation_id: str,
+    response: Response,
+    background_tasks: BackgroundTasks,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -250,43 +387,30 @@ def get_conversation_messages(
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    messages = (
-        db.query(ChatMessage)
-        .filter(ChatMessage.conversation_id == conversation_id)
-        .order_by(ChatMessage.created_at)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    messages, next_cursor = paginate(
+        db.query(ChatMessage).filter(ChatMessage.conversation_id == conversation_id),
+        ChatMessage.created_at,
+        ChatMessage.id,
+        cursor=cursor,
+        limit=limit,
+        skip=skip,
+        descending=False,
     )
+    set_next_cursor(response, next_cursor)
 
     # Mark admin messages as read
-    db.query(ChatMessage).filter(
-        and_(
-            ChatMessage.conversation_id == conversation_id,
-            ChatMessage.sender_type != MessageType.USER,
-            ChatMessage.is_read.is_(False),
-        )
-    ).update({ChatMessage.is_read: True})
-    db.commit()
+    if conversation.user_last_read_message_id != conversation.last_message_id:
+        scope = mark_conversation_read(db, conversation, MessageType.USER)
+        db.commit()
+        push_unread_badge(background_tasks, db, scope)
 
-    return [
-        ChatMessageResponse(
-            id=msg.id,
-            conversation_id=msg.conversation_id,
-            sender_type=msg.sender_type.value,
-            sender_name=msg.sender_name,
-            message=msg.message,
-            is_read=msg.is_read,
-            reply_to_id=msg.reply_to_id,
-            created_at=msg.created_at,
-        )
-        for msg in messages
-    ]
+    return [message_response(msg, conversation) for msg in messages]
 
 
 @router.post("/messages", response_model=ChatMessageResponse)
 def send_message(
     message_data: ChatMessageCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -308,11 +432,7 @@ def send_message(
     )
 
     db.add(new_message)
-
-    # Update conversation last_message_at
-    db.query(ChatConversation).filter(ChatConversation.id == conversation_id).update(
-        {ChatConversation.last_message_at: datetime.utcnow()}
-    )
+    scope = record_new_message(db, conversation_id, new_message)
 
     db.commit()
     db.refresh(new_message)
@@ -331,14 +451,9 @@ def send_message(
         },
     }
 
-    # Send to all admins
-    import asyncio
-
-    try:
-        asyncio.create_task(manager.send_to_all_admins(message_dict))
-    except Exception:
-        # WebSocket might not be available
-        pass
+    # Send to all admins once the response is out
+    background_tasks.add_task(manager.send_to_all_admins, message_dict)
+    push_unread_badge(background_tasks, db, scope)
 
     # Send push notification to all admins
     try:
@@ -354,88 +469,51 @@ def send_message(
     except Exception as e:
         print(f"Error sending push notification: {e}")
 
-    return ChatMessageResponse(
-        id=new_message.id,
-        conversation_id=new_message.conversation_id,
-        sender_type=new_message.sender_type.value,
-        sender_name=new_message.sender_name,
-        message=new_message.message,
-        is_read=new_message.is_read,
-        reply_to_id=new_message.reply_to_id,
-        created_at=new_message.created_at,
-    )
+    return message_response(new_message)
 
 
 # Admin Endpoints
 @router.get("/admin/conversations", response_model=List[ConversationResponse])
 def get_all_conversations(
+    response: Response,
     status: Optional[str] = Query(None),
     priority: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user),
 ):
     """Admin: Get all conversations"""
-    query = db.query(ChatConversation)
+    query = db.query(ChatConversation).options(joinedload(ChatConversation.user))
 
     if status:
         query = query.filter(ChatConversation.status == status)
     if priority:
         query = query.filter(ChatConversation.priority == priority)
 
-    conversations = (
-        query.order_by(desc(ChatConversation.last_message_at))
-        .offset(skip)
-        .limit(limit)
-        .all()
+    conversations, next_cursor = paginate(
+        query,
+        ChatConversation.last_message_at,
+        ChatConversation.id,
+        cursor=cursor,
+        limit=limit,
+        skip=skip,
     )
+    set_next_cursor(response, next_cursor)
 
-    result = []
-    for conv in conversations:
-        # Get user info
-        user = db.query(User).filter(User.id == conv.user_id).first()
-
-        # Get unread message count
-        unread_count = (
-            db.query(ChatMessage)
-            .filter(
-                and_(
-                    ChatMessage.conversation_id == conv.id,
-                    ChatMessage.sender_type == MessageType.USER,
-                    ChatMessage.is_read.is_(False),
-                )
-            )
-            .count()
-        )
-
-        # Get last message
-        last_message = (
-            db.query(ChatMessage)
-            .filter(ChatMessage.conversation_id == conv.id)
-            .order_by(desc(ChatMessage.created_at))
-            .first()
-        )
-
-        result.append(
-            ConversationResponse(
-                id=conv.id,
-                user_id=conv.user_id,
-                user_name=f"{user.vorname} {user.nachname}" if user else "Unknown User",
-                subject=conv.subject,
-                status=conv.status,
-                priority=conv.priority,
-                last_message_at=conv.last_message_at,
-                unread_count=unread_count,
-                last_message=(
-                    last_message.message[:50] + "..."
-                    if last_message and len(last_message.message) > 50
-                    else last_message.message if last_message else None
-                ),
-            )
+    return [
+        conversation_response(
+            conv,
+            (
+                f"{conv.user.vorname} {conv.user.nachname}"
+                if conv.user
+                else "Unknown User"
+            ),
+            conv.admin_unread_count,
         )
-
-    return result
+        for conv in conversations
+    ]
 
 
 @router.get(
@@ -444,8 +522,10 @@ def get_all_conversations(
 )
 def admin_get_conversation_messages(
     conversation_id: str,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user),
 ):
@@ -460,33 +540,24 @@ def admin_get_conversation_messages(
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    messages = (
-        db.query(ChatMessage)
-        .filter(ChatMessage.conversation_id == conversation_id)
-        .order_by(ChatMessage.created_at)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    messages, next_cursor = paginate(
+        db.query(ChatMessage).filter(ChatMessage.conversation_id == conversation_id),
+        ChatMessage.created_at,
+        ChatMessage.id,
+        cursor=cursor,
+        limit=limit,
+        skip=skip,
+        descending=False,
     )
+    set_next_cursor(response, next_cursor)
 
-    return [
-        ChatMessageResponse(
-            id=msg.id,
-            conversation_id=msg.conversation_id,
-            sender_type=msg.sender_type.value,
-            sender_name=msg.sender_name,
-            message=msg.message,
-            is_read=msg.is_read,
-            reply_to_id=msg.reply_to_id,
-            created_at=msg.created_at,
-        )
-        for msg in messages
-    ]
+    return [message_response(msg, conversation) for msg in messages]
 
 
 @router.post("/admin/conversations/{conversation_id}/mark-read")
 def admin_mark_conversation_read(
     conversation_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user),
 ):
@@ -502,15 +573,9 @@ def admin_mark_conversation_read(
         raise HTTPException(status_code=404, detail="Conversation not found")
 
     # Mark all user messages as read
-    db.query(ChatMessage).filter(
-        and_(
-            ChatMessage.conversation_id == conversation_id,
-            ChatMessage.sender_type == MessageType.USER,
-            ChatMessage.is_read.is_(False),
-        )
-    ).update({ChatMessage.is_read: True})
-
+    scope = mark_conversation_read(db, conversation, MessageType.ADMIN)
     db.commit()
+    push_unread_badge(background_tasks, db, scope)
 
     return {"message": "Conversation marked as read"}
 
@@ -532,6 +597,10 @@ def admin_delete_conversation(
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
+    # Remove its unread messages from both badges
+    mark_conversation_read(db, conversation, MessageType.USER)
+    mark_conversation_read(db, conversation, MessageType.ADMIN)
+
     # Delete all messages first
     db.query(ChatMessage).filter(
         ChatMessage.conversation_id == conversation_id
@@ -547,6 +616,7 @@ def admin_delete_conversation(
 @router.post("/admin/reply", response_model=ChatMessageResponse)
 def admin_reply(
     reply_data: AdminReplyMessage,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user),
 ):
@@ -574,16 +644,7 @@ def admin_reply(
     )
 
     db.add(reply_message)
-
-    # Update conversation
-    db.query(ChatConversation).filter(
-        ChatConversation.id == reply_data.conversation_id
-    ).update(
-        {
-            ChatConversation.last_message_at: datetime.utcnow(),
-            ChatConversation.assigned_admin_id: current_admin.id,
-        }
-    )
+    scope = record_new_message(db, reply_data.conversation_id, reply_message)
 
     db.commit()
     db.refresh(reply_message)
@@ -601,13 +662,9 @@ def admin_reply(
         },
     }
 
-    # Send to user
-    import asyncio
-
-    try:
-        asyncio.create_task(manager.send_to_user(conversation.user_id, message_dict))
-    except Exception:
-        pass
+    # Send to user once the response is out
+    background_tasks.add_task(manager.send_to_user, conversation.user_id, message_dict)
+    push_unread_badge(background_tasks, db, scope)
 
     # Send push notification to user
     try:
@@ -622,114 +679,80 @@ def admin_reply(
     except Exception as e:
         print(f"Error sending push notification: {e}")
 
-    return ChatMessageResponse(
-        id=reply_message.id,
-        conversation_id=reply_message.conversation_id,
-        sender_type=reply_message.sender_type.value,
-        sender_name=reply_message.sender_name,
-        message=reply_message.message,
-        is_read=reply_message.is_read,
-        reply_to_id=reply_message.reply_to_id,
-        created_at=reply_message.created_at,
-    )
+    return message_response(reply_message)
 
 
 # Notification Endpoints
 @router.get("/notifications/count")
 def get_notification_count(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
 ):
     """Get notification count for the current user"""
+    scope = ADMIN_SCOPE if current_user.is_admin else user_scope(current_user.id)
+    not_modified = check_etag(request, response, "notifications", scope)
+    if not_modified is not None:
+        return not_modified
+    return notification_count(db, current_user)
+
+
+def notification_count(db: Session, current_user: User) -> Dict[str, int]:
     if current_user.is_admin:
         # Admin: Count conversations with unread messages from users
-        unread_conversations = (
-            db.query(ChatMessage.conversation_id)
-            .filter(
-                and_(
-                    ChatMessage.sender_type == MessageType.USER,
-                    ChatMessage.is_read.is_(False),
-                )
-            )
-            .distinct()
-            .count()
-        )
-        return {"count": unread_conversations}
+        return {"count": unread_badge(db, ADMIN_SCOPE)["unread_conversations"]}
     else:
         # User: Return 1 if any unread messages from admin exist, otherwise 0
-        unread_exists = (
-            db.query(ChatMessage)
-            .filter(
-                and_(
-                    ChatMessage.user_id == current_user.id,
-                    ChatMessage.sender_type == MessageType.ADMIN,
-                    ChatMessage.is_read.is_(False),
-                )
-            )
-            .first()
-        )
-        return {"count": 1 if unread_exists else 0}
+        return unread_badge(db, user_scope(current_user.id))
 
 
 @router.get("/notifications/admin/count")
 def get_admin_notification_count(
-    db: Session = Depends(get_db), current_admin: User = Depends(get_current_admin_user)
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin_user),
 ):
     """Admin: Get detailed notification count"""
-    # Count all unread messages from users
-    unread_count = (
-        db.query(ChatMessage)
-        .filter(
-            and_(
-                ChatMessage.sender_type == MessageType.USER,
-                ChatMessage.is_read.is_(False),
-            )
-        )
-        .count()
-    )
-
-    # Count unique conversations with unread messages
-    unread_conversations = (
-        db.query(ChatMessage.conversation_id)
-        .filter(
-            and_(
-                ChatMessage.sender_type == MessageType.USER,
-                ChatMessage.is_read.is_(False),
-            )
-        )
-        .distinct()
-        .count()
-    )
-
-    return {"count": unread_count, "unread_conversations": unread_conversations}
+    not_modified = check_etag(request, response, "notifications", ADMIN_SCOPE)
+    if not_modified is not None:
+        return not_modified
+    return unread_badge(db, ADMIN_SCOPE)
 
 
 @router.get("/notifications/user/count")
 def get_user_notification_count(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
 ):
     """User: Get notification count (1 if any unread admin messages exist)"""
-    unread_exists = (
-        db.query(ChatMessage)
-        .filter(
-            and_(
-                ChatMessage.user_id == current_user.id,
-                ChatMessage.sender_type == MessageType.ADMIN,
-                ChatMessage.is_read.is_(False),
-            )
-        )
-        .first()
-    )
-
-    return {"count": 1 if unread_exists else 0}
+    scope = user_scope(current_user.id)
+    not_modified = check_etag(request, response, "notifications", scope)
+    if not_modified is not None:
+        return not_modified
+    return unread_badge(db, scope)
 
 
 # WebSocket Endpoints
 @router.websocket("/ws/{user_id}")
 async def websocket_endpoint_user(
-    websocket: WebSocket, user_id: int, db: Session = Depends(get_db)
+    websocket: WebSocket, user_id: int, db: AsyncSession = Depends(get_async_db)
 ):
     """WebSocket endpoint for users"""
+    user = await db.get(User, user_id)
+    if not user or not user.is_active:
+        await db.close()
+        await websocket.close(code=WS_1008_POLICY_VIOLATION)
+        return
+
+    badge = await db.run_sync(unread_badge, user_scope(user_id))
+    await db.close()
+
     await manager.connect_user(websocket, user_id)
+    await manager.send_to_user(user_id, {"type": "unread_count", "data": badge})
     try:
         while True:
             await websocket.receive_text()
@@ -741,10 +764,20 @@ async def websocket_endpoint_user(
 
 @router.websocket("/ws/admin/{admin_id}")
 async def websocket_endpoint_admin(
-    websocket: WebSocket, admin_id: int, db: Session = Depends(get_db)
+    websocket: WebSocket, admin_id: int, db: AsyncSession = Depends(get_async_db)
 ):
     """WebSocket endpoint for admins"""
+    admin = await db.get(User, admin_id)
+    if not admin or not admin.is_active or not admin.is_admin:
+        await db.close()
+        await websocket.close(code=WS_1008_POLICY_VIOLATION)
+        return
+
+    badge = await db.run_sync(unread_badge, ADMIN_SCOPE)
+    await db.close()
+
     await manager.connect_admin(websocket, admin_id)
+    await websocket.send_text(json.dumps({"type": "unread_count", "data": badge}))
     try:
         while True:
             await websocket.receive_text()
@@ -0,0 +1,288 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from core.auth import get_current_admin_user
+from core.logging_config import get_logger
+from database.database import SessionLocal
+from models.archive import ArchivePartition
+from models.bewerbung import Bewerbung, BewerbungsStatus
+from models.bot_status import BotLog
+from models.user import User
+from services.archive_store import json_default
+from services.bewerbung_archive import ARCHIVE_KIND as BEWERBUNG_ARCHIVE_KIND
+from services.bewerbung_archive import bewerbung_archive
+from services.log_archive import ARCHIVE_KIND, bot_log_archive
+
+logger = get_logger("export")
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+# Rows fetched per round trip and bytes buffered before a chunk is sent
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def stream_rows(statement) -> Iterator[Dict[str, Any]]:
+    """
+    Yield plain row mappings through a server-side cursor.
+
+    The generator owns its session because request dependencies are closed
+    before a streaming response has been sent.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for row in result.mappings():
+            yield row
+    finally:
+        db.close()
+
+
+def _csv_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_rows(
+    rows: Iterable[Dict[str, Any]], columns: List[str], export_format: ExportFormat
+) -> Iterator[str]:
+    """Encode rows as NDJSON or CSV, yielding chunks of roughly EXPORT_CHUNK_BYTES"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    if export_format == ExportFormat.CSV:
+        writer.writerow(columns)
+
+    for row in rows:
+        if export_format == ExportFormat.CSV:
+            writer.writerow([_csv_value(row.get(column)) for column in columns])
+        else:
+            record = {column: row.get(column) for column in columns}
+            buffer.write(json.dumps(record, default=json_default, ensure_ascii=False))
+            buffer.write("\n")
+
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_response(
+    name: str,
+    rows: Iterable[Dict[str, Any]],
+    columns: List[str],
+    export_format: ExportFormat,
+) -> StreamingResponse:
+    filename = f"{name}-{datetime.now():%Y%m%d-%H%M%S}.{export_format.value}"
+    return StreamingResponse(
+        encode_rows(rows, columns, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are stored as naive UTC (see db_now); convert offsets to match"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def check_range(
+    start: Optional[datetime], end: Optional[datetime]
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Validate the range and return it as naive UTC"""
+    start, end = utc_naive(start), utc_naive(end)
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    return start, end
+
+
+@router.get("/bewerbungen")
+def export_bewerbungen(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    user_id: Optional[int] = Query(None),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    status: Optional[BewerbungsStatus] = Query(None),
+    include_archive: bool = Query(True),
+    current_admin: User = Depends(get_current_admin_user),
+):
+    """Admin: Stream applications as NDJSON or CSV, archived months first"""
+    start, end = check_range(start, end)
+
+    table = Bewerbung.__table__
+    statement = select(table).order_by(table.c.id)
+    if user_id is not None:
+        statement = statement.where(table.c.user_id == user_id)
+    if start:
+        statement = statement.where(table.c.bewerbungsdatum >= start)
+    if end:
+        statement = statement.where(table.c.bewerbungsdatum < end)
+    if status:
+        statement = statement.where(table.c.status == status)
+
+    def rows() -> Iterator[Dict[str, Any]]:
+        if include_archive:
+            # Archived months lie before the cutoff, so they come first
+            cutoff = bewerbung_archive.cutoff()
+            if not start or start < cutoff:
+                archive_end = min(end, cutoff) if end else cutoff
+                yield from archived_bewerbungen(user_id, start, archive_end, status)
+        yield from stream_rows(statement)
+
+    logger.info(
+        "Export of applications started",
+        admin_id=current_admin.id,
+        user_id=user_id,
+        format=export_format.value,
+    )
+    return export_response(
+        "bewerbungen",
+        rows(),
+        [column.name for column in table.columns],
+        export_format,
+    )
+
+
+def archived_bewerbungen(
+    user_id: Optional[int],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    status: Optional[BewerbungsStatus],
+) -> Iterator[Dict[str, Any]]:
+    """Yield archived applications month by month, without their messages"""
+    statement = select(ArchivePartition.path, ArchivePartition.levels).where(
+        ArchivePartition.kind == BEWERBUNG_ARCHIVE_KIND
+    )
+    if user_id is not None:
+        statement = statement.where(ArchivePartition.user_id == user_id)
+    if start:
+        statement = statement.where(ArchivePartition.day >= start.date().replace(day=1))
+    if end:
+        statement = statement.where(ArchivePartition.day <= end.date())
+
+    partitions = stream_rows(
+        statement.order_by(ArchivePartition.day, ArchivePartition.user_id)
+    )
+    for partition in partitions:
+        if status and status.value not in (partition["levels"] or "").split(","):
+            continue
+
+        for entry in bewerbung_archive.store.iter_rows(partition["path"]):
+            bewerbungsdatum = utc_naive(
+                datetime.fromisoformat(entry["bewerbungsdatum"])
+            )
+            if status and entry["status"] != status.value:
+                continue
+            if start and bewerbungsdatum < start:
+                continue
+            if end and bewerbungsdatum >= end:
+                continue
+            yield entry
+
+
+def archived_logs(
+    user_id: Optional[int],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    level: Optional[str],
+) -> Iterator[Dict[str, Any]]:
+    """Yield archived log rows oldest first, one partition at a time"""
+    statement = select(ArchivePartition.path, ArchivePartition.levels).where(
+        ArchivePartition.kind == ARCHIVE_KIND
+    )
+    if user_id is not None:
+        statement = statement.where(ArchivePartition.user_id == user_id)
+    if start:
+        statement = statement.where(ArchivePartition.day >= start.date())
+    if end:
+        statement = statement.where(ArchivePartition.day <= end.date())
+
+    partitions = stream_rows(
+        statement.order_by(ArchivePartition.day, ArchivePartition.user_id)
+    )
+    for partition in partitions:
+        if level and level not in (partition["levels"] or "").split(","):
+            continue
+
+        for entry in bot_log_archive.store.iter_rows(partition["path"]):
+            timestamp = utc_naive(datetime.fromisoformat(entry["timestamp"]))
+            if level and entry["level"] != level:
+                continue
+            if start and timestamp < start:
+                continue
+            if end and timestamp >= end:
+                continue
+            yield entry
+
+
+@router.get("/logs")
+def export_bot_logs(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    user_id: Optional[int] = Query(None),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    level: Optional[str] = Query(None),
+    include_archive: bool = Query(True),
+    current_admin: User = Depends(get_current_admin_user),
+):
+    """Admin: Stream bot logs as NDJSON or CSV, archived days first"""
+    start, end = check_range(start, end)
+    # Levels are stored upper-case, as in /bot/logs
+    level = level.upper() if level else None
+
+    table = BotLog.__table__
+    statement = select(table).order_by(table.c.timestamp, table.c.id)
+    if user_id is not None:
+        statement = statement.where(table.c.user_id == user_id)
+    if start:
+        statement = statement.where(table.c.timestamp >= start)
+    if end:
+        statement = statement.where(table.c.timestamp < end)
+    if level:
+        statement = statement.where(table.c.level == level)
+
+    def rows() -> Iterator[Dict[str, Any]]:
+        if include_archive:
+            # Archived days lie before the hot window, so they come first
+            hot_start = bot_log_archive.hot_cutoff()
+            if not start or start < hot_start:
+                archive_end = min(end, hot_start) if end else hot_start
+                yield from archived_logs(user_id, start, archive_end, level)
+        yield from stream_rows(statement)
+
+    logger.info(
+        "Export of bot logs started",
+        admin_id=current_admin.id,
+        user_id=user_id,
+        format=export_format.value,
+    )
+    return export_response(
+        "bot_logs", rows(), [column.name for column in table.columns], export_format
+    )
@@ -1,10 +1,11 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from core.auth import get_current_active_user, get_current_user_with_profile
+from core.etag import check_etag
 from database.database import get_db
 from models.user import User
 
@@ -21,8 +22,21 @@ class FilterResponse(BaseModel):
 
 @router.get("/", response_model=FilterResponse)
 def get_filter_settings(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
 ):
+    # Der User kommt aus dem Cache dieses Workers, siehe core/etag
+    not_modified = check_etag(
+        request,
+        response,
+        "user",
+        current_user.id,
+        served=current_user.filter_einstellungen,
+    )
+    if not_modified is not None:
+        return not_modified
     return FilterResponse(filter_einstellungen=current_user.filter_einstellungen)
 
 
@@ -32,10 +46,11 @@ def save_filter_settings(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_with_profile),
 ):
-    current_user.filter_einstellungen = filter_data.filter_einstellungen
+    user = db.get(User, current_user.id)
+    user.filter_einstellungen = filter_data.filter_einstellungen
     db.commit()
-    db.refresh(current_user)
-    return FilterResponse(filter_einstellungen=current_user.filter_einstellungen)
+    db.refresh(user)
+    return FilterResponse(filter_einstellungen=user.filter_einstellungen)
 
 
 @router.put("/", response_model=FilterResponse)
@@ -44,16 +59,19 @@ def update_filter_settings(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_with_profile),
 ):
-    current_user.filter_einstellungen = filter_data.filter_einstellungen
+    user = db.get(User, current_user.id)
+    user.filter_einstellungen = filter_data.filter_einstellungen
     db.commit()
-    db.refresh(current_user)
-    return FilterResponse(filter_einstellungen=current_user.filter_einstellungen)
+    db.refresh(user)
+    return FilterResponse(filter_einstellungen=user.filter_einstellungen)
 
 
 @router.delete("/")
 def delete_filter_settings(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user_with_profile)
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_with_profile),
 ):
-    current_user.filter_einstellungen = None
+    user = db.get(User, current_user.id)
+    user.filter_einstellungen = None
     db.commit()
     return {"message": "Filter settings deleted successfully"}
@@ -2,16 +2,15 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from core.auth import get_current_admin_user
 from core.logging_config import bot_metrics
-from database.database import get_db
-from models.bewerbung import Bewerbung, BewerbungsStatus
-from models.bot_status import BotLog
+from database.database import db_now, get_db
 from models.user import User
+from services.bot_log_sink import bot_log_sink
 from services.immobilien_bot_manager import bot_manager
+from services.monitoring_rollups import monitoring_rollups, successful_applications
 
 router = APIRouter(prefix="/api/monitoring", tags=["monitoring"])
 
@@ -67,6 +66,7 @@ def get_system_metrics(
                 "total_listings_found": total_listings,
                 "active_bots": len(all_statuses),
             },
+            "log_sink": bot_log_sink.get_stats(),
             "collected_at": datetime.now().isoformat(),
         }
 
@@ -85,66 +85,21 @@ def get_detailed_statistics(
 ) -> Dict[str, Any]:
     """Admin: Detaillierte Statistiken über Bot-Aktivitäten"""
     try:
-        end_date = datetime.now()
+        end_date = db_now()
         start_date = end_date - timedelta(days=days)
 
-        # Bewerbungsstatistiken
-        total_applications = (
-            db.query(Bewerbung).filter(Bewerbung.bewerbungsdatum >= start_date).count()
-        )
+        # Aus den stündlichen Rollups (services/monitoring_rollups)
+        status_counts = monitoring_rollups.application_counts_by_status(db, start_date)
+        total_applications = sum(status_counts.values())
+        successful = successful_applications(status_counts)
 
-        successful_applications = (
-            db.query(Bewerbung)
-            .filter(
-                Bewerbung.bewerbungsdatum >= start_date,
-                Bewerbung.status == BewerbungsStatus.SENT,
-            )
-            .count()
-        )
-
-        # Bewerbungen pro Tag
-        daily_applications = (
-            db.query(
-                func.date(Bewerbung.bewerbungsdatum).label("date"),
-                func.count(Bewerbung.id).label("count"),
-            )
-            .filter(Bewerbung.bewerbungsdatum >= start_date)
-            .group_by(func.date(Bewerbung.bewerbungsdatum))
-            .all()
-        )
-
-        # Status-Verteilung
-        status_distribution = (
-            db.query(Bewerbung.status, func.count(Bewerbung.id).label("count"))
-            .filter(Bewerbung.bewerbungsdatum >= start_date)
-            .group_by(Bewerbung.status)
-            .all()
-        )
-
-        # Top aktive User
-        top_users = (
-            db.query(
-                Bewerbung.user_id, func.count(Bewerbung.id).label("application_count")
-            )
-            .filter(Bewerbung.bewerbungsdatum >= start_date)
-            .group_by(Bewerbung.user_id)
-            .order_by(func.count(Bewerbung.id).desc())
-            .limit(10)
-            .all()
-        )
+        daily_applications = monitoring_rollups.applications_per_day(db, start_date)
+        top_users = monitoring_rollups.top_users(db, start_date)
 
         # Log-Statistiken
-        error_logs = (
-            db.query(BotLog)
-            .filter(BotLog.timestamp >= start_date, BotLog.level == "ERROR")
-            .count()
-        )
-
-        warning_logs = (
-            db.query(BotLog)
-            .filter(BotLog.timestamp >= start_date, BotLog.level == "WARNING")
-            .count()
-        )
+        log_counts = monitoring_rollups.log_counts_by_level(db, start_date)
+        error_logs = log_counts.get("ERROR", 0)
+        warning_logs = log_counts.get("WARNING", 0)
 
         return {
             "period": {
@@ -154,25 +109,20 @@ def get_detailed_statistics(
             },
             "application_statistics": {
                 "total_applications": total_applications,
-                "successful_applications": successful_applications,
+                "successful_applications": successful,
                 "success_rate": (
-                    round((successful_applications / total_applications * 100), 2)
+                    round((successful / total_applications * 100), 2)
                     if total_applications > 0
                     else 0
                 ),
-                "daily_breakdown": [
-                    {"date": str(day.date), "count": day.count}
-                    for day in daily_applications
-                ],
+                "daily_breakdown": daily_applications,
                 "status_distribution": [
-                    {"status": status.status.value, "count": status.count}
-                    for status in status_distribution
+                    {"status": status, "count": count}
+                    for status, count in status_counts.items()
+                    if count > 0
                 ],
             },
-            "user_activity": [
-                {"user_id": user.user_id, "applications": user.application_count}
-                for user in top_users
-            ],
+            "user_activity": top_users,
             "system_health": {
                 "error_logs": error_logs,
                 "warning_logs": warning_logs,
@@ -198,12 +148,10 @@ def get_system_alerts(
 
     try:
         # Prüfe auf häufige Fehler in den letzten 24 Stunden
-        last_24h = datetime.now() - timedelta(hours=24)
+        last_24h = db_now() - timedelta(hours=24)
 
-        error_count = (
-            db.query(BotLog)
-            .filter(BotLog.timestamp >= last_24h, BotLog.level == "ERROR")
-            .count()
+        error_count = monitoring_rollups.log_counts_by_level(db, last_24h).get(
+            "ERROR", 0
         )
 
         if error_count > 50:  # Schwellenwert für Alerts
@@ -233,16 +181,12 @@ def get_system_alerts(
             )
 
         # Prüfe auf User ohne Aktivität
-        last_week = datetime.now() - timedelta(days=7)
+        last_week = db_now() - timedelta(days=7)
 
         inactive_users = (
             db.query(User)
             .filter(
-                ~User.id.in_(
-                    db.query(Bewerbung.user_id)
-                    .filter(Bewerbung.bewerbungsdatum >= last_week)
-                    .distinct()
-                ),
+                ~User.id.in_(monitoring_rollups.active_user_ids(last_week)),
                 User.is_active.is_(True),
             )
             .count()
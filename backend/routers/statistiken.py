@@ -1,65 +1,54 @@
-from datetime import datetime, timedelta
-from typing import Any, Dict
+from datetime import date
+from typing import Any, Dict, Literal, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from core.auth import get_current_active_user, get_current_user_with_profile
-from database.database import get_db
-from models.bewerbung import Bewerbung as BewerbungModel
-from models.bewerbung import BewerbungsStatus
+from core.etag import check_etag
+from database.database import db_now, get_db
 from models.statistik import Statistik as StatistikModel
 from models.user import User
+from services.statistik_service import (
+    MAX_BUCKETS,
+    RECENT_DAYS,
+    dashboard_statistik,
+    default_range_start,
+    iter_buckets,
+    record_login,
+)
 
 router = APIRouter(prefix="/api/statistik", tags=["statistik"])
 
 
 @router.get("/")
 def get_user_statistik(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user_with_profile)
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_with_profile),
 ) -> Dict[str, Any]:
-    # Aktuelle Statistik aus Datenbank holen oder erstellen
+    not_modified = check_etag(request, response, "statistik", current_user.id)
+    if not_modified is not None:
+        return not_modified
+    return user_statistik(db, current_user)
+
+
+def user_statistik(db: Session, current_user: User) -> Dict[str, Any]:
+    # Zähler werden beim Schreiben der Bewerbungen gepflegt (services/statistik_service)
     statistik = (
         db.query(StatistikModel)
         .filter(StatistikModel.user_id == current_user.id)
         .first()
     )
-    if not statistik:
-        statistik = StatistikModel(user_id=current_user.id)
-        db.add(statistik)
-        db.commit()
-        db.refresh(statistik)
-
-    # Live-Berechnungen aus Bewerbungen
-    total_bewerbungen = (
-        db.query(BewerbungModel)
-        .filter(BewerbungModel.user_id == current_user.id)
-        .count()
-    )
 
-    erfolgreiche_bewerbungen = (
-        db.query(BewerbungModel)
-        .filter(
-            BewerbungModel.user_id == current_user.id,
-            BewerbungModel.status == BewerbungsStatus.RESPONDED,
-        )
-        .count()
-    )
-
-    # Bewerbungen der letzten 30 Tage
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    recent_bewerbungen = (
-        db.query(BewerbungModel)
-        .filter(
-            BewerbungModel.user_id == current_user.id,
-            BewerbungModel.bewerbungsdatum >= thirty_days_ago,
-        )
-        .count()
-    )
+    total_bewerbungen = (statistik and statistik.anzahl_verschickter_bewerbungen) or 0
+    erfolgreiche_bewerbungen = (statistik and statistik.erfolgreiche_bewerbungen) or 0
+    recent_bewerbungen = (statistik and statistik.bewerbungen_letzte_30_tage) or 0
 
     # Bewerbungen pro Tag (Durchschnitt der letzten 30 Tage)
     bewerbungen_pro_tag = (
-        round(recent_bewerbungen / 30, 2) if recent_bewerbungen > 0 else 0
+        round(recent_bewerbungen / RECENT_DAYS, 2) if recent_bewerbungen > 0 else 0
     )
 
     # Erfolgsquote berechnen
@@ -69,15 +58,6 @@ def get_user_statistik(
         else 0
     )
 
-    # Statistik aktualisieren
-    statistik.anzahl_verschickter_bewerbungen = total_bewerbungen
-    statistik.erfolgreiche_bewerbungen = erfolgreiche_bewerbungen
-    statistik.bewerbungen_pro_tag = bewerbungen_pro_tag
-    statistik.letzter_login = datetime.now()
-
-    db.commit()
-    db.refresh(statistik)
-
     return {
         "user_id": current_user.id,
         "anzahl_verschickter_bewerbungen": total_bewerbungen,
@@ -85,84 +65,38 @@ def get_user_statistik(
         "bewerbungen_pro_tag": bewerbungen_pro_tag,
         "erfolgsquote_prozent": erfolgsquote,
         "bewerbungen_letzte_30_tage": recent_bewerbungen,
-        "letzter_login": statistik.letzter_login,
+        "letzter_login": statistik.letzter_login if statistik else None,
         "mitglied_seit": current_user.created_at,
     }
 
 
 @router.get("/dashboard")
 def get_dashboard_statistik(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user_with_profile)
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    granularity: Literal["day", "week", "month"] = Query("month"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_with_profile),
 ) -> Dict[str, Any]:
-    # Erweiterte Dashboard-Statistiken
-
-    # Bewerbungen nach Status
-    status_counts = {}
-    for status in BewerbungsStatus:
-        count = (
-            db.query(BewerbungModel)
-            .filter(
-                BewerbungModel.user_id == current_user.id,
-                BewerbungModel.status == status,
-            )
-            .count()
+    # Erweiterte Dashboard-Statistiken aus einer gruppierten Abfrage
+    end = end or db_now().date()
+    start = start or default_range_start(end, granularity)
+
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if len(iter_buckets(start, end, granularity)) > MAX_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large, at most {MAX_BUCKETS} {granularity} buckets",
         )
-        status_counts[status.value] = count
-
-    # Bewerbungen der letzten 7 Tage
-    seven_days_ago = datetime.now() - timedelta(days=7)
-    recent_week = (
-        db.query(BewerbungModel)
-        .filter(
-            BewerbungModel.user_id == current_user.id,
-            BewerbungModel.bewerbungsdatum >= seven_days_ago,
-        )
-        .count()
-    )
 
-    # Bewerbungen nach Monaten (letzten 6 Monate)
-    monthly_stats = []
-    for i in range(6):
-        month_start = datetime.now().replace(day=1) - timedelta(days=30 * i)
-        month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(
-            days=1
-        )
-
-        count = (
-            db.query(BewerbungModel)
-            .filter(
-                BewerbungModel.user_id == current_user.id,
-                BewerbungModel.bewerbungsdatum >= month_start,
-                BewerbungModel.bewerbungsdatum <= month_end,
-            )
-            .count()
-        )
-
-        monthly_stats.append({"monat": month_start.strftime("%Y-%m"), "anzahl": count})
-
-    return {
-        "bewerbungen_nach_status": status_counts,
-        "bewerbungen_letzte_7_tage": recent_week,
-        "monatliche_statistik": monthly_stats[
-            ::-1
-        ],  # Umkehren für chronologische Reihenfolge
-    }
+    return dashboard_statistik(db, current_user.id, start, end, granularity)
 
 
 @router.post("/update-login")
 def update_letzter_login(
     db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)
 ):
-    statistik = (
-        db.query(StatistikModel)
-        .filter(StatistikModel.user_id == current_user.id)
-        .first()
-    )
-    if not statistik:
-        statistik = StatistikModel(user_id=current_user.id)
-        db.add(statistik)
-
-    statistik.letzter_login = datetime.now()
-    db.commit()
+    letzter_login = record_login(db, current_user.id)
 
-    return {"message": "Login time updated", "letzter_login": statistik.letzter_login}
+    return {"message": "Login time updated", "letzter_login": letzter_login}
@@ -1,11 +1,12 @@
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from core.auth import get_current_active_user, get_current_admin_user
+from core.pagination import paginate, set_next_cursor
 from database.database import get_db
 from models.nachricht import Nachricht as NachrichtModel
 from models.user import User
@@ -33,9 +34,11 @@ class SupportMessageResponse(BaseModel):
 
 @router.get("/", response_model=List[SupportMessageResponse])
 def get_support_messages(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     only_unread: bool = Query(False),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -50,12 +53,15 @@ def get_support_messages(
     if only_unread:
         query = query.filter(NachrichtModel.ist_gelesen.is_(False))
 
-    nachrichten = (
-        query.order_by(NachrichtModel.zeitstempel.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    nachrichten, next_cursor = paginate(
+        query,
+        NachrichtModel.zeitstempel,
+        NachrichtModel.id,
+        cursor=cursor,
+        limit=limit,
+        skip=skip,
     )
+    set_next_cursor(response, next_cursor)
 
     return [
         SupportMessageResponse(
@@ -134,10 +140,12 @@ def mark_message_as_read(
 # Admin-Endpoints für Support-Verwaltung
 @router.get("/admin/all", response_model=List[SupportMessageResponse])
 def get_all_support_messages(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     only_unread: bool = Query(False),
     user_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user),
 ):
@@ -150,12 +158,15 @@ def get_all_support_messages(
     if user_id:
         query = query.filter(NachrichtModel.user_id == user_id)
 
-    nachrichten = (
-        query.order_by(NachrichtModel.zeitstempel.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    nachrichten, next_cursor = paginate(
+        query,
+        NachrichtModel.zeitstempel,
+        NachrichtModel.id,
+        cursor=cursor,
+        limit=limit,
+        skip=skip,
     )
+    set_next_cursor(response, next_cursor)
 
     return [
         SupportMessageResponse(
@@ -0,0 +1,80 @@
+import gzip
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List
+
+# Basisverzeichnis für ausgelagerte Daten
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "./archive")
+
+
+def json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Nicht serialisierbar: {type(value).__name__}")
+
+
+class ArchiveStore:
+    """
+    Ablage für kalte Daten als gzip-komprimiertes NDJSON
+
+    Eine Partition ist eine Datei mit einer JSON-Zeile pro Datensatz.
+    Dateien werden atomar ersetzt, Leser sehen also nie halbe Partitionen.
+    """
+
+    def __init__(self, base_dir: str = ARCHIVE_DIR):
+        self.base_dir = base_dir
+
+    def partition_path(self, kind: str, user_id: int, day: date) -> str:
+        """Relativer Pfad der Partition eines Users für einen Tag"""
+        return f"{kind}/{day:%Y/%m/%d}/user_{user_id}.ndjson.gz"
+
+    def _full_path(self, path: str) -> str:
+        return os.path.join(self.base_dir, path)
+
+    def write(self, path: str, rows: Iterable[Dict[str, Any]]) -> int:
+        """Schreibt die Partition neu und gibt die Anzahl der Zeilen zurück"""
+        full_path = self._full_path(path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+        tmp_path = f"{full_path}.tmp"
+        count = 0
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, default=json_default, ensure_ascii=False))
+                f.write("\n")
+                count += 1
+
+        os.replace(tmp_path, full_path)
+        return count
+
+    def read(self, path: str) -> List[Dict[str, Any]]:
+        """Liest alle Zeilen einer Partition"""
+        return list(self.iter_rows(path))
+
+    def iter_rows(self, path: str) -> Iterator[Dict[str, Any]]:
+        """Liest eine Partition zeilenweise, ohne sie ganz zu laden"""
+        full_path = self._full_path(path)
+        if not os.path.exists(full_path):
+            return
+
+        with gzip.open(full_path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def delete(self, path: str):
+        """Entfernt eine Partition, falls vorhanden"""
+        full_path = self._full_path(path)
+        if os.path.exists(full_path):
+            os.remove(full_path)
+
+
+# Globale Archiv-Instanz
+archive_store = ArchiveStore()
@@ -0,0 +1,200 @@
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from core.etag import bump_after_commit
+from database.database import db_now, dialect_insert
+from models.archive import ArchivePartition
+from models.bewerbung import Bewerbung, BewerbungsStatus
+from models.nachricht import Nachricht
+from models.statistik import Statistik
+from services.archive_store import ArchiveStore, archive_store
+
+# Alter in Tagen, ab dem Bewerbungen aus der Tabelle ins Archiv wandern
+BEWERBUNG_ARCHIVE_DAYS = int(os.getenv("BEWERBUNG_ARCHIVE_DAYS", "365"))
+
+ARCHIVE_KIND = "bewerbungen"
+
+# SQLite erlaubt nur begrenzt viele Parameter pro Statement
+DELETE_CHUNK_SIZE = 500
+
+
+def _month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def _next_month(month: date) -> date:
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+class BewerbungArchive:
+    """
+    Archiv für alte Bewerbungen samt zugehöriger Nachrichten
+
+    Ganze Kalendermonate, die vollständig älter als ``max_age_days`` sind,
+    werden je User als eine komprimierte Partition abgelegt (Nachrichten
+    eingebettet in ihre Bewerbung) und aus den Tabellen gelöscht. Das Archiv
+    ist nur lesbar.
+    """
+
+    def __init__(
+        self,
+        store: ArchiveStore = archive_store,
+        max_age_days: int = BEWERBUNG_ARCHIVE_DAYS,
+    ):
+        self.store = store
+        self.max_age_days = max_age_days
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Beginn des ersten Monats, der in der Tabelle bleibt"""
+        oldest_kept = (now or db_now()) - timedelta(days=self.max_age_days)
+        return datetime.combine(_month_start(oldest_kept.date()), datetime.min.time())
+
+    def pending(
+        self, db: Session, now: Optional[datetime] = None
+    ) -> List[Tuple[int, date]]:
+        """(User, Monat) mit Bewerbungen vor dem Stichtag, älteste zuerst"""
+        rows = db.execute(
+            select(Bewerbung.user_id, Bewerbung.bewerbungsdatum).where(
+                Bewerbung.bewerbungsdatum < self.cutoff(now)
+            )
+        )
+        months = {(user_id, _month_start(value.date())) for user_id, value in rows}
+        return sorted(months, key=lambda item: (item[1], item[0]))
+
+    def archive_month(self, db: Session, user_id: int, month: date) -> int:
+        """Lagert die Bewerbungen eines Users für einen Monat aus (eine Transaktion)"""
+        start = datetime.combine(month, datetime.min.time())
+        end = datetime.combine(_next_month(month), datetime.min.time())
+
+        rows = [
+            dict(row)
+            for row in db.execute(
+                select(Bewerbung.__table__)
+                .where(
+                    Bewerbung.user_id == user_id,
+                    Bewerbung.bewerbungsdatum >= start,
+                    Bewerbung.bewerbungsdatum < end,
+                )
+                .order_by(Bewerbung.id)
+            ).mappings()
+        ]
+        if not rows:
+            return 0
+
+        ids = [row["id"] for row in rows]
+        nachrichten = defaultdict(list)
+        for i in range(0, len(ids), DELETE_CHUNK_SIZE):
+            for nachricht in db.execute(
+                select(Nachricht.__table__)
+                .where(Nachricht.bewerbung_id.in_(ids[i : i + DELETE_CHUNK_SIZE]))
+                .order_by(Nachricht.id)
+            ).mappings():
+                nachrichten[nachricht["bewerbung_id"]].append(dict(nachricht))
+        for row in rows:
+            row["nachrichten"] = nachrichten.get(row["id"], [])
+
+        partition = db.scalar(
+            select(ArchivePartition).where(
+                ArchivePartition.kind == ARCHIVE_KIND,
+                ArchivePartition.user_id == user_id,
+                ArchivePartition.day == month,
+            )
+        )
+        if partition is None:
+            partition = ArchivePartition(
+                kind=ARCHIVE_KIND,
+                user_id=user_id,
+                day=month,
+                path=self.store.partition_path(ARCHIVE_KIND, user_id, month),
+            )
+            db.add(partition)
+            merged = rows
+        else:
+            # Abgebrochener Lauf: nach ID zusammenführen
+            by_id = {entry["id"]: entry for entry in self.store.read(partition.path)}
+            by_id.update({row["id"]: row for row in rows})
+            merged = [by_id[key] for key in sorted(by_id)]
+
+        partition.row_count = self.store.write(partition.path, merged)
+        partition.levels = ",".join(
+            sorted({_status_value(entry["status"]) for entry in merged})
+        )
+
+        # Die Gesamtzahlen der Statistik behalten archivierte Bewerbungen
+        success = sum(1 for row in rows if row["status"] == BewerbungsStatus.RESPONDED)
+        table = Statistik.__table__
+        stmt = dialect_insert(db.get_bind(), Statistik).values(
+            user_id=user_id,
+            anzahl_verschickter_bewerbungen=len(rows),
+            erfolgreiche_bewerbungen=success,
+            archivierte_bewerbungen=len(rows),
+            archivierte_erfolgreiche_bewerbungen=success,
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={
+                    "archivierte_bewerbungen": func.coalesce(
+                        table.c.archivierte_bewerbungen, 0
+                    )
+                    + len(rows),
+                    "archivierte_erfolgreiche_bewerbungen": func.coalesce(
+                        table.c.archivierte_erfolgreiche_bewerbungen, 0
+                    )
+                    + success,
+                },
+            )
+        )
+
+        # Core-Delete umgeht die ORM-Events: die laufenden Zähler bleiben stehen
+        # Nachrichten explizit, falls die Fremdschlüssel abgeschaltet sind
+        for i in range(0, len(ids), DELETE_CHUNK_SIZE):
+            chunk = ids[i : i + DELETE_CHUNK_SIZE]
+            db.execute(delete(Nachricht).where(Nachricht.bewerbung_id.in_(chunk)))
+            db.execute(delete(Bewerbung).where(Bewerbung.id.in_(chunk)))
+        bump_after_commit(db, "statistik", user_id)
+        db.commit()
+
+        return len(rows)
+
+    def read_user_history(
+        self, db: Session, user_id: int, skip: int = 0, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Archivierte Bewerbungen eines Users, neueste zuerst"""
+        partitions = db.scalars(
+            select(ArchivePartition)
+            .where(
+                ArchivePartition.kind == ARCHIVE_KIND,
+                ArchivePartition.user_id == user_id,
+            )
+            .order_by(ArchivePartition.day.desc())
+        )
+
+        result: List[Dict[str, Any]] = []
+        for partition in partitions:
+            if skip >= partition.row_count:
+                # Ganze Partition überspringen, ohne sie zu lesen
+                skip -= partition.row_count
+                continue
+
+            entries = self.store.read(partition.path)
+            entries.sort(key=lambda e: (e["bewerbungsdatum"], e["id"]), reverse=True)
+            result.extend(entries[skip : skip + limit - len(result)])
+            skip = 0
+            if len(result) >= limit:
+                break
+
+        return result
+
+
+def _status_value(status) -> str:
+    return status.value if isinstance(status, BewerbungsStatus) else status
+
+
+# Globale Archiv-Instanz für Bewerbungen
+bewerbung_archive = BewerbungArchive()
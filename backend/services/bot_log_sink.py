@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import os
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from database.database import AsyncSessionLocal, db_now
+from models.bot_status import BotLog
+from models.user import User
+
+
+class OverflowPolicy(Enum):
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+    BLOCK = "block"
+
+
+class BotLogSink:
+    """
+    Gepufferter Writer für BotLog-Einträge
+
+    Bots legen Log-Zeilen nur in eine begrenzte Queue. Ein Hintergrund-Task
+    schreibt sie gesammelt mit einem Multi-Row-INSERT, sobald ``batch_size``
+    Zeilen vorliegen oder ``flush_interval_ms`` vergangen sind. Beim Stoppen
+    wird die Queue vollständig geleert.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 10000,
+        batch_size: int = 200,
+        flush_interval_ms: int = 500,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ):
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.overflow_policy = overflow_policy
+        self.logger = logging.getLogger(f"{__name__}.BotLogSink")
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.flush_task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        self.stats = {"written": 0, "dropped": 0, "failed": 0, "flushes": 0}
+
+    @property
+    def running(self) -> bool:
+        return self.flush_task is not None and not self.flush_task.done()
+
+    async def start(self):
+        """Startet den Hintergrund-Task zum Schreiben der Logs"""
+        if self.running:
+            return
+
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._stopping = False
+        self.flush_task = asyncio.create_task(self._flush_loop())
+        self.logger.info(
+            f"BotLog-Sink gestartet (Batch: {self.batch_size}, "
+            f"Intervall: {int(self.flush_interval * 1000)} ms)"
+        )
+
+    async def stop(self):
+        """Stoppt den Sink, nachdem alle gepufferten Logs geschrieben wurden"""
+        if not self.running:
+            return
+
+        self._stopping = True
+        await self.flush_task
+        self.flush_task = None
+        self.logger.info(f"BotLog-Sink gestoppt: {self.stats}")
+
+    async def enqueue(self, entry: Dict[str, Any]):
+        """Legt einen Log-Eintrag in die Queue"""
+        entry.setdefault("timestamp", db_now())
+
+        if not self.running or self._stopping:
+            # Ohne laufenden Sink (z.B. in Skripten) direkt schreiben
+            await self._write([entry])
+            return
+
+        if not self.queue.full():
+            self.queue.put_nowait(entry)
+        elif self.overflow_policy == OverflowPolicy.BLOCK:
+            await self.queue.put(entry)
+        elif self.overflow_policy == OverflowPolicy.DROP_OLDEST:
+            self.queue.get_nowait()
+            self.queue.put_nowait(entry)
+            self.stats["dropped"] += 1
+        else:
+            self.stats["dropped"] += 1
+
+    async def _collect_batch(self) -> List[Dict[str, Any]]:
+        """Sammelt Einträge bis zur Batch-Größe oder bis das Intervall abläuft"""
+        loop = asyncio.get_running_loop()
+        try:
+            first = await asyncio.wait_for(self.queue.get(), self.flush_interval)
+        except asyncio.TimeoutError:
+            return []
+
+        batch = [first]
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+
+            remaining = deadline - loop.time()
+            if remaining <= 0 or self._stopping:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _flush_loop(self):
+        while True:
+            batch = await self._collect_batch()
+            if batch:
+                await self._write(batch)
+            elif self._stopping and self.queue.empty():
+                break
+
+    async def _write(self, rows: List[Dict[str, Any]], retry: bool = True):
+        """Schreibt alle Einträge mit einem einzigen INSERT"""
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(BotLog), rows)
+                await db.commit()
+            self.stats["written"] += len(rows)
+            self.stats["flushes"] += 1
+        except IntegrityError as e:
+            if not retry:
+                self.stats["failed"] += len(rows)
+                self.logger.error(
+                    f"Fehler beim Schreiben von {len(rows)} Bot-Logs: {e}"
+                )
+                return
+
+            # Logs von inzwischen gelöschten Usern verwerfen, Rest erneut schreiben
+            kept = await self._without_deleted_users(rows)
+            self.stats["dropped"] += len(rows) - len(kept)
+            if kept:
+                await self._write(kept, retry=False)
+        except Exception as e:
+            self.stats["failed"] += len(rows)
+            self.logger.error(f"Fehler beim Schreiben von {len(rows)} Bot-Logs: {e}")
+
+    async def _without_deleted_users(
+        self, rows: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        user_ids = {row["user_id"] for row in rows}
+        async with AsyncSessionLocal() as db:
+            existing = set(
+                (await db.scalars(select(User.id).where(User.id.in_(user_ids)))).all()
+            )
+        return [row for row in rows if row["user_id"] in existing]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Kennzahlen des Sinks zurück"""
+        return {
+            **self.stats,
+            "queued": self.queue.qsize() if self.queue else 0,
+            "running": self.running,
+        }
+
+
+# Globale Sink-Instanz
+bot_log_sink = BotLogSink(
+    max_queue_size=int(os.getenv("BOT_LOG_QUEUE_SIZE", "10000")),
+    batch_size=int(os.getenv("BOT_LOG_BATCH_SIZE", "200")),
+    flush_interval_ms=int(os.getenv("BOT_LOG_FLUSH_MS", "500")),
+    overflow_policy=OverflowPolicy(os.getenv("BOT_LOG_OVERFLOW", "drop_oldest")),
+)
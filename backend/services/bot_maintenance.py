@@ -1,14 +1,65 @@
 import asyncio
+import os
+import time
 from datetime import datetime, timedelta
 from typing import Any, Dict
 
-from sqlalchemy import func
+from sqlalchemy import and_, delete, func, select
 
 from core.logging_config import bot_metrics, get_logger
-from database.database import SessionLocal
+from database.database import SessionLocal, db_now
 from models.bewerbung import Bewerbung
 from models.bot_status import BotLog
+from services.bewerbung_archive import bewerbung_archive
+from services.chat_unread import rebuild_unread_counters
 from services.immobilien_bot_manager import bot_manager
+from services.log_archive import bot_log_archive
+from services.monitoring_rollups import monitoring_rollups, successful_applications
+from services.seen_listings import seen_listings
+from services.statistik_service import reconcile_statistiken
+
+# Aufbewahrung der Bot-Logs in Tagen, Fehler werden länger aufgehoben
+LOG_RETENTION_DEFAULT_DAYS = int(os.getenv("LOG_RETENTION_DEFAULT_DAYS", "30"))
+LOG_RETENTION_DAYS_BY_LEVEL = {
+    "ERROR": int(os.getenv("LOG_RETENTION_ERROR_DAYS", "90")),
+    "WARNING": int(os.getenv("LOG_RETENTION_WARNING_DAYS", "60")),
+}
+
+# Löschen in kleinen Blöcken, damit Schreibzugriffe der Bots nicht blockieren
+LOG_CLEANUP_CHUNK_SIZE = int(os.getenv("LOG_CLEANUP_CHUNK_SIZE", "1000"))
+LOG_CLEANUP_PAUSE_MS = int(os.getenv("LOG_CLEANUP_PAUSE_MS", "200"))
+LOG_CLEANUP_MAX_SECONDS = float(os.getenv("LOG_CLEANUP_MAX_SECONDS", "300"))
+
+# Logs außerhalb des heißen Fensters komprimiert auslagern statt behalten
+BOT_LOG_ARCHIVE_ENABLED = os.getenv("BOT_LOG_ARCHIVE_ENABLED", "1") == "1"
+
+# Abstand der vollständigen Neuberechnung der Chat-Zähler; sie werden beim
+# Schreiben gepflegt, der Abgleich korrigiert nur seltene Abweichungen
+UNREAD_COUNTER_RECONCILE_HOURS = float(
+    os.getenv("UNREAD_COUNTER_RECONCILE_HOURS", "24")
+)
+
+# Bewerbungen älter als BEWERBUNG_ARCHIVE_DAYS monatsweise auslagern
+BEWERBUNG_ARCHIVE_ENABLED = os.getenv("BEWERBUNG_ARCHIVE_ENABLED", "1") == "1"
+
+
+def _with_session(func, *args):
+    """Ruft ``func(db, *args)`` mit eigener Session auf und schließt sie wieder"""
+    db = SessionLocal()
+    try:
+        return func(db, *args)
+    finally:
+        db.close()
+
+
+async def run_in_session(func, *args):
+    """
+    Führt synchrone Datenbankarbeit in einem Worker-Thread aus
+
+    Öffnen, Abfragen, Commit und Schließen der Session laufen dort, damit
+    der Event-Loop (API, Bots) währenddessen nicht blockiert.
+    """
+    return await asyncio.to_thread(_with_session, func, *args)
 
 
 class BotMaintenanceService:
@@ -20,6 +71,7 @@ class BotMaintenanceService:
         self.logger = get_logger("maintenance")
         self.running = False
         self.maintenance_task = None
+        self.unread_counters_rebuilt_at = None
 
     async def start_maintenance(self, interval_minutes: int = 60):
         """Startet regelmäßige Wartungsaufgaben"""
@@ -68,44 +120,156 @@ class BotMaintenanceService:
         """Führt alle Wartungsaufgaben aus"""
         self.logger.info("Starte Wartungsaufgaben...")
 
-        # 1. Log-Cleanup
+        # 1. Log-Cleanup und Auslagerung älterer Tage ins Archiv
         await self.cleanup_old_logs()
+        await self.archive_old_logs()
 
         # 2. Bot-Gesundheitscheck
         await self.health_check_bots()
 
-        # 3. Metriken aktualisieren
+        # 3. Stündliche Rollups fortschreiben und Metriken daraus aktualisieren
+        await self.refresh_rollups()
         await self.update_metrics()
 
-        # 4. Datenbank-Cleanup
-        await self.cleanup_database()
+        # 4. Alte Bewerbungen ins Archiv auslagern
+        await self.archive_old_applications()
 
-        self.logger.info("Wartungsaufgaben abgeschlossen")
+        # 5. Nicht mehr angebotene Wohnungen aus der Registry entfernen
+        await self.expire_seen_listings()
 
-    async def cleanup_old_logs(self, days_to_keep: int = 30):
-        """Löscht alte Log-Einträge aus der Datenbank"""
-        try:
-            cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+        # 6. Statistik- und (selten) Chat-Zähler abgleichen
+        await self.reconcile_statistiken()
+        if self._unread_counters_due():
+            await self.rebuild_unread_counters()
 
-            db = SessionLocal()
+        self.logger.info("Wartungsaufgaben abgeschlossen")
 
-            # Lösche alte Logs
-            deleted_count = (
-                db.query(BotLog).filter(BotLog.timestamp < cutoff_date).delete()
+    def _log_retention_rules(self, days_to_keep: int):
+        """Bildet die Löschbedingungen je Log-Level"""
+        now = db_now()
+        rules = [
+            (
+                level,
+                and_(
+                    BotLog.level == level,
+                    BotLog.timestamp < now - timedelta(days=days),
+                ),
             )
-
+            for level, days in LOG_RETENTION_DAYS_BY_LEVEL.items()
+        ]
+
+        # Alle übrigen Level mit der Standard-Aufbewahrung
+        rules.append(
+            (
+                "default",
+                and_(
+                    BotLog.level.notin_(LOG_RETENTION_DAYS_BY_LEVEL),
+                    BotLog.timestamp < now - timedelta(days=days_to_keep),
+                ),
+            )
+        )
+        return rules
+
+    def _delete_log_chunk(self, db, condition, chunk_size: int) -> int:
+        """Löscht höchstens ``chunk_size`` Logs in einer kurzen Transaktion"""
+        ids = db.scalars(
+            select(BotLog.id).where(condition).order_by(BotLog.id).limit(chunk_size)
+        ).all()
+        if ids:
+            db.execute(delete(BotLog).where(BotLog.id.in_(ids)))
             db.commit()
-            db.close()
+        return len(ids)
+
+    async def cleanup_old_logs(
+        self,
+        days_to_keep: int = LOG_RETENTION_DEFAULT_DAYS,
+        chunk_size: int = LOG_CLEANUP_CHUNK_SIZE,
+        pause_seconds: float = LOG_CLEANUP_PAUSE_MS / 1000,
+        max_seconds: float = LOG_CLEANUP_MAX_SECONDS,
+    ):
+        """
+        Löscht alte Log-Einträge in kleinen Blöcken
+
+        Jeder Block ist eine eigene Transaktion; dazwischen wird pausiert, damit
+        Bots ihre Logs weiter schreiben können. Nach ``max_seconds`` wird
+        abgebrochen, der Rest folgt beim nächsten Wartungslauf.
+        """
+        started = time.perf_counter()
+        deleted_by_rule: Dict[str, int] = {}
+
+        try:
+            for rule, condition in self._log_retention_rules(days_to_keep):
+                while time.perf_counter() - started < max_seconds:
+                    deleted = await run_in_session(
+                        self._delete_log_chunk, condition, chunk_size
+                    )
+                    if deleted == 0:
+                        break
+
+                    deleted_by_rule[rule] = deleted_by_rule.get(rule, 0) + deleted
+                    bot_metrics.increment_counter("logs_cleaned", amount=deleted)
+
+                    if deleted < chunk_size:
+                        break
+                    await asyncio.sleep(pause_seconds)
+
+            duration = time.perf_counter() - started
+            deleted_count = sum(deleted_by_rule.values())
+            bot_metrics.record_timing("log_cleanup", duration)
+
+            if duration >= max_seconds:
+                bot_metrics.increment_counter("log_cleanup_incomplete")
+                self.logger.warning(
+                    f"Log-Cleanup nach {duration:.1f}s abgebrochen, "
+                    f"Rest folgt im nächsten Lauf",
+                    deleted=deleted_count,
+                )
 
             if deleted_count > 0:
                 self.logger.info(
-                    f"Log-Cleanup: {deleted_count} alte Log-Einträge gelöscht"
+                    f"Log-Cleanup: {deleted_count} alte Log-Einträge in "
+                    f"{duration:.1f}s gelöscht",
+                    deleted_by_level=deleted_by_rule,
                 )
-                bot_metrics.increment_counter("logs_cleaned", amount=deleted_count)
 
         except Exception as e:
             self.logger.error(f"Fehler beim Log-Cleanup: {e}")
 
+    async def archive_old_logs(
+        self, pause_seconds: float = LOG_CLEANUP_PAUSE_MS / 1000
+    ):
+        """Lagert Logs außerhalb des heißen Fensters tageweise ins Archiv aus"""
+        if not BOT_LOG_ARCHIVE_ENABLED:
+            return
+
+        started = time.perf_counter()
+        try:
+            days = await run_in_session(bot_log_archive.pending_days)
+
+            archived = 0
+            for day in days:
+                archived += await run_in_session(bot_log_archive.archive_day, day)
+                await asyncio.sleep(pause_seconds)
+
+            pruned = await run_in_session(
+                bot_log_archive.apply_retention,
+                LOG_RETENTION_DEFAULT_DAYS,
+                LOG_RETENTION_DAYS_BY_LEVEL,
+            )
+
+            bot_metrics.record_timing("log_archive", time.perf_counter() - started)
+
+            if archived or pruned:
+                self.logger.info(
+                    f"Log-Archiv: {archived} Einträge aus {len(days)} Tagen ausgelagert, "
+                    f"{pruned} abgelaufene Einträge entfernt"
+                )
+                bot_metrics.increment_counter("logs_archived", amount=archived)
+                bot_metrics.increment_counter("archived_logs_pruned", amount=pruned)
+
+        except Exception as e:
+            self.logger.error(f"Fehler beim Archivieren der Logs: {e}")
+
     async def health_check_bots(self):
         """Überprüft die Gesundheit aller aktiven Bots"""
         try:
@@ -149,45 +313,47 @@ class BotMaintenanceService:
         except Exception as e:
             self.logger.error(f"Fehler beim Bot-Gesundheitscheck: {e}")
 
-    async def update_metrics(self):
-        """Aktualisiert System-Metriken"""
+    async def refresh_rollups(self):
+        """Berechnet die seit dem letzten Lauf betroffenen Stunden der Rollups neu"""
+        started = time.perf_counter()
         try:
-            db = SessionLocal()
+            refreshed = await run_in_session(monitoring_rollups.refresh)
 
-            # Bewerbungsstatistiken der letzten 24 Stunden
-            last_24h = datetime.now() - timedelta(hours=24)
-
-            recent_applications = (
-                db.query(Bewerbung)
-                .filter(Bewerbung.bewerbungsdatum >= last_24h)
-                .count()
+            bot_metrics.record_timing("rollup_refresh", time.perf_counter() - started)
+            self.logger.info(
+                "Rollups aktualisiert",
+                hours_bewerbungen=refreshed["bewerbungen"],
+                hours_bot_logs=refreshed["bot_logs"],
             )
 
-            successful_applications = (
-                db.query(Bewerbung)
-                .filter(
-                    Bewerbung.bewerbungsdatum >= last_24h,
-                    Bewerbung.status.in_(["sent", "responded"]),
-                )
-                .count()
-            )
+        except Exception as e:
+            self.logger.error(f"Fehler beim Aktualisieren der Rollups: {e}")
+
+    def _count_last_24h(self, db):
+        """Bewerbungen je Status und Logs je Level der letzten 24 Stunden"""
+        last_24h = db_now() - timedelta(hours=24)
+        return (
+            monitoring_rollups.application_counts_by_status(db, last_24h),
+            monitoring_rollups.log_counts_by_level(db, last_24h),
+        )
 
-            # Fehlerrate der letzten 24 Stunden
-            error_logs = (
-                db.query(BotLog)
-                .filter(BotLog.timestamp >= last_24h, BotLog.level == "ERROR")
-                .count()
-            )
+    async def update_metrics(self):
+        """Aktualisiert System-Metriken"""
+        try:
+            # Aus den Rollups
+            status_counts, log_counts = await run_in_session(self._count_last_24h)
 
-            total_logs = db.query(BotLog).filter(BotLog.timestamp >= last_24h).count()
+            # Bewerbungsstatistiken der letzten 24 Stunden
+            recent_applications = sum(status_counts.values())
+            successful = successful_applications(status_counts)
 
-            db.close()
+            # Fehlerrate der letzten 24 Stunden
+            error_logs = log_counts.get("ERROR", 0)
+            total_logs = sum(log_counts.values())
 
             # Metriken setzen
             bot_metrics.set_gauge("applications_24h", recent_applications)
-            bot_metrics.set_gauge(
-                "successful_applications_24h", successful_applications
-            )
+            bot_metrics.set_gauge("successful_applications_24h", successful)
             bot_metrics.set_gauge("error_logs_24h", error_logs)
 
             if total_logs > 0:
@@ -196,37 +362,94 @@ class BotMaintenanceService:
 
             self.logger.info(
                 f"Metriken aktualisiert: {recent_applications} Bewerbungen, "
-                f"{successful_applications} erfolgreich, {error_logs} Fehler"
+                f"{successful} erfolgreich, {error_logs} Fehler"
             )
 
         except Exception as e:
             self.logger.error(f"Fehler beim Aktualisieren der Metriken: {e}")
 
-    async def cleanup_database(self):
-        """Führt allgemeine Datenbank-Cleanup-Aufgaben durch"""
+    async def archive_old_applications(
+        self, pause_seconds: float = LOG_CLEANUP_PAUSE_MS / 1000
+    ):
+        """Lagert alte Bewerbungen monatsweise je User ins Archiv aus"""
+        if not BEWERBUNG_ARCHIVE_ENABLED:
+            return
+
+        started = time.perf_counter()
         try:
-            db = SessionLocal()
+            months = await run_in_session(bewerbung_archive.pending)
 
-            # Beispiel: Lösche sehr alte Bewerbungen (älter als 1 Jahr)
-            one_year_ago = datetime.now() - timedelta(days=365)
+            archived = 0
+            for user_id, month in months:
+                archived += await run_in_session(
+                    bewerbung_archive.archive_month, user_id, month
+                )
+                await asyncio.sleep(pause_seconds)
 
-            old_applications = (
-                db.query(Bewerbung)
-                .filter(Bewerbung.bewerbungsdatum < one_year_ago)
-                .count()
+            bot_metrics.record_timing(
+                "bewerbung_archive", time.perf_counter() - started
             )
 
-            if old_applications > 0:
+            if archived:
                 self.logger.info(
-                    f"Gefunden: {old_applications} alte Bewerbungen (älter als 1 Jahr)"
+                    f"Bewerbungs-Archiv: {archived} Bewerbungen aus "
+                    f"{len(months)} Monatspartitionen ausgelagert"
                 )
-                # Hier könnte man sie löschen, wenn gewünscht
-                # deleted = db.query(Bewerbung).filter(...).delete()
+                bot_metrics.increment_counter("applications_archived", amount=archived)
+
+        except Exception as e:
+            self.logger.error(f"Fehler beim Archivieren der Bewerbungen: {e}")
+
+    async def expire_seen_listings(self):
+        """Entfernt Angebote, die nicht mehr auf der Website sind, aus der Registry"""
+        try:
+            expired = seen_listings.expire()
+            stats = seen_listings.get_stats()
+
+            if expired > 0:
+                self.logger.info(
+                    f"Registry-Cleanup: {expired} verschwundene Angebote entfernt"
+                )
+                bot_metrics.increment_counter("seen_listings_expired", amount=expired)
+
+            bot_metrics.set_gauge("seen_listings_interned", stats["interned_listings"])
+            bot_metrics.set_gauge("seen_listings_bitmap_bytes", stats["bitmap_bytes"])
+
+        except Exception as e:
+            self.logger.error(f"Fehler beim Registry-Cleanup: {e}")
+
+    async def reconcile_statistiken(self):
+        """Berechnet die Statistik-Zähler neu (30-Tage-Fenster, Drift durch Massenänderungen)"""
+        started = time.perf_counter()
+        try:
+            reconciled = await run_in_session(reconcile_statistiken)
+
+            bot_metrics.record_timing(
+                "statistik_reconcile", time.perf_counter() - started
+            )
+            self.logger.info(f"Statistik-Abgleich: {reconciled} User abgeglichen")
+
+        except Exception as e:
+            self.logger.error(f"Fehler beim Statistik-Abgleich: {e}")
 
-            db.close()
+    def _unread_counters_due(self) -> bool:
+        if self.unread_counters_rebuilt_at is None:
+            return True
+        elapsed = time.monotonic() - self.unread_counters_rebuilt_at
+        return elapsed >= UNREAD_COUNTER_RECONCILE_HOURS * 3600
+
+    def _rebuild_unread_counters(self, db):
+        rebuild_unread_counters(db)
+        db.commit()
+
+    async def rebuild_unread_counters(self):
+        """Berechnet die Badge-Zähler des Chats aus den Konversationen neu"""
+        try:
+            await run_in_session(self._rebuild_unread_counters)
+            self.unread_counters_rebuilt_at = time.monotonic()
 
         except Exception as e:
-            self.logger.error(f"Fehler beim Datenbank-Cleanup: {e}")
+            self.logger.error(f"Fehler beim Abgleich der Chat-Zähler: {e}")
 
     async def force_restart_bot(self, user_id: int) -> Dict[str, Any]:
         """Erzwingt einen Neustart eines Bots"""
@@ -253,33 +476,33 @@ class BotMaintenanceService:
             self.logger.error(f"Fehler beim Neustart von Bot {user_id}: {e}")
             return {"success": False, "message": f"Fehler beim Neustart: {str(e)}"}
 
+    def _report_statistics(self, db):
+        """Logs je Level und Bewerbungen je Status der letzten 24 Stunden"""
+        last_24h = db_now() - timedelta(hours=24)
+
+        log_stats = (
+            db.query(BotLog.level, func.count(BotLog.id).label("count"))
+            .filter(BotLog.timestamp >= last_24h)
+            .group_by(BotLog.level)
+            .all()
+        )
+
+        app_stats = (
+            db.query(Bewerbung.status, func.count(Bewerbung.id).label("count"))
+            .filter(Bewerbung.bewerbungsdatum >= last_24h)
+            .group_by(Bewerbung.status)
+            .all()
+        )
+        return log_stats, app_stats
+
     async def get_maintenance_report(self) -> Dict[str, Any]:
         """Erstellt einen Wartungsbericht"""
         try:
-            db = SessionLocal()
-
             # Bot-Status sammeln
             all_statuses = bot_manager.get_all_bot_statuses()
 
-            # Log-Statistiken
-            last_24h = datetime.now() - timedelta(hours=24)
-
-            log_stats = (
-                db.query(BotLog.level, func.count(BotLog.id).label("count"))
-                .filter(BotLog.timestamp >= last_24h)
-                .group_by(BotLog.level)
-                .all()
-            )
-
-            # Bewerbungsstatistiken
-            app_stats = (
-                db.query(Bewerbung.status, func.count(Bewerbung.id).label("count"))
-                .filter(Bewerbung.bewerbungsdatum >= last_24h)
-                .group_by(Bewerbung.status)
-                .all()
-            )
-
-            db.close()
+            # Log- und Bewerbungsstatistiken
+            log_stats, app_stats = await run_in_session(self._report_statistics)
 
             return {
                 "timestamp": datetime.now().isoformat(),
@@ -0,0 +1,137 @@
+"""
+Zähler für ungelesene Chat-Nachrichten (Benachrichtigungs-Badges)
+
+Die Zähler werden in derselben Transaktion wie das Einfügen bzw. Lesen einer
+Nachricht angepasst, sodass die Badge-Endpunkte nur eine Zeile lesen.
+Vor dem Löschen von Usern zieht ``discount_users`` deren Konversationen vom
+Admin-Zähler ab. ``rebuild_unread_counters`` berechnet alle Zähler aus den
+Konversationen neu (Migration und täglicher Abgleich der Wartung).
+"""
+
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, text
+
+from core.etag import bump_after_commit
+from database.database import dialect_insert
+from models.chat import ChatConversation, UnreadCounter
+
+ADMIN_SCOPE = "admin"
+
+
+def user_scope(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def apply_delta(
+    db,
+    scope: str,
+    messages: int = 0,
+    conversations: int = 0,
+    user_id: Optional[int] = None,
+):
+    """Addiert Änderungen auf einen Zähler (legt die Zeile bei Bedarf an)"""
+    if not (messages or conversations):
+        return
+
+    table = UnreadCounter.__table__
+    stmt = dialect_insert(db.get_bind(), UnreadCounter).values(
+        scope=scope,
+        user_id=user_id,
+        unread_messages=max(messages, 0),
+        unread_conversations=max(conversations, 0),
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["scope"],
+            set_={
+                "unread_messages": table.c.unread_messages + messages,
+                "unread_conversations": table.c.unread_conversations + conversations,
+                "updated_at": func.now(),
+            },
+        )
+    )
+    bump_after_commit(db, "notifications", scope)
+
+
+def discount_users(db, user_ids):
+    """
+    Zieht die Konversationen der User vom Admin-Zähler ab (ohne Commit)
+
+    Vor dem Löschen der User aufrufen; ihre eigenen Zähler entfernt die
+    Datenbank per CASCADE.
+    """
+    messages, conversations = db.execute(
+        select(
+            func.coalesce(func.sum(ChatConversation.admin_unread_count), 0),
+            func.count(ChatConversation.id),
+        ).where(
+            ChatConversation.user_id.in_(user_ids),
+            ChatConversation.admin_unread_count > 0,
+        )
+    ).one()
+    apply_delta(db, ADMIN_SCOPE, -messages, -conversations)
+
+
+def get_counts(db, scope: str) -> Tuple[int, int]:
+    """Gibt (ungelesene Nachrichten, Konversationen mit ungelesenen) zurück"""
+    row = db.execute(
+        select(UnreadCounter.unread_messages, UnreadCounter.unread_conversations).where(
+            UnreadCounter.scope == scope
+        )
+    ).first()
+    return (row[0], row[1]) if row else (0, 0)
+
+
+def rebuild_unread_counters(connection) -> int:
+    """
+    Berechnet alle Zähler aus den Konversationen neu (ohne Commit)
+
+    Unter PostgreSQL wird die Zählertabelle bis zum Commit für Schreiber
+    gesperrt, sonst gingen dazwischen committete ``apply_delta`` verloren.
+    SQLite lässt ohnehin nur einen Schreiber zu.
+    """
+    dialect = getattr(connection, "dialect", None) or connection.get_bind().dialect
+    if dialect.name == "postgresql":
+        connection.execute(
+            text(f"LOCK TABLE {UnreadCounter.__tablename__} IN EXCLUSIVE MODE")
+        )
+
+    admin_row = connection.execute(
+        select(
+            func.coalesce(func.sum(ChatConversation.admin_unread_count), 0),
+            func.count(ChatConversation.id),
+        ).where(ChatConversation.admin_unread_count > 0)
+    ).one()
+    user_rows = connection.execute(
+        select(
+            ChatConversation.user_id,
+            func.sum(ChatConversation.user_unread_count),
+            func.count(ChatConversation.id),
+        )
+        .where(ChatConversation.user_unread_count > 0)
+        .group_by(ChatConversation.user_id)
+    ).all()
+
+    rows = [
+        {
+            "scope": ADMIN_SCOPE,
+            "user_id": None,
+            "unread_messages": admin_row[0],
+            "unread_conversations": admin_row[1],
+        }
+    ]
+    rows += [
+        {
+            "scope": user_scope(user_id),
+            "user_id": user_id,
+            "unread_messages": messages,
+            "unread_conversations": conversations,
+        }
+        for user_id, messages, conversations in user_rows
+    ]
+
+    connection.execute(delete(UnreadCounter))
+    connection.execute(insert(UnreadCounter), rows)
+    bump_after_commit(connection, "notifications")
+    return len(rows)
@@ -6,9 +6,15 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from database.database import SessionLocal
+from core.etag import resource_versions
+from database.database import AsyncSessionLocal
 from models.user import User
 
+# Felder, deren Änderung eine neue ETag für /api/bot/status ergibt.
+# current_action, last_activity und runtime_seconds ändern sich bei jedem
+# Durchlauf und werden bis zur nächsten solchen Änderung per 304 bestätigt.
+ETAG_FIELDS = ("status", "listings_found", "applications_sent", "error_message")
+
 
 class BotStatus(Enum):
     STOPPED = "stopped"
@@ -44,33 +50,51 @@ class ImmobilienBotManager:
         self._lock = threading.Lock()
         self.logger = logging.getLogger(f"{__name__}.BotManager")
 
-    def get_bot_status(self, user_id: int) -> Dict[str, Any]:
-        """Gibt den aktuellen Status eines User-Bots zurück"""
-        with self._lock:
-            if user_id not in self.bot_metrics:
-                return {
-                    "user_id": user_id,
-                    "status": BotStatus.STOPPED.value,
-                    "message": "Bot wurde noch nicht gestartet",
-                }
+    def _changed(self, user_id: int):
+        # Neue ETag für den Status-Endpunkt (core/etag)
+        resource_versions.bump("bot_status", user_id)
 
-            metrics = self.bot_metrics[user_id]
+    def _status_dict(self, user_id: int) -> Dict[str, Any]:
+        """Status eines User-Bots, der Aufrufer hält ``self._lock``"""
+        if user_id not in self.bot_metrics:
             return {
                 "user_id": user_id,
-                "status": metrics.status.value,
-                "listings_found": metrics.listings_found,
-                "applications_sent": metrics.applications_sent,
-                "last_activity": (
-                    metrics.last_activity.isoformat() if metrics.last_activity else None
-                ),
-                "current_action": metrics.current_action,
-                "error_message": metrics.error_message,
-                "started_at": (
-                    metrics.started_at.isoformat() if metrics.started_at else None
-                ),
-                "runtime_seconds": metrics.runtime_seconds,
+                "status": BotStatus.STOPPED.value,
+                "message": "Bot wurde noch nicht gestartet",
             }
 
+        metrics = self.bot_metrics[user_id]
+        return {
+            "user_id": user_id,
+            "status": metrics.status.value,
+            "listings_found": metrics.listings_found,
+            "applications_sent": metrics.applications_sent,
+            "last_activity": (
+                metrics.last_activity.isoformat() if metrics.last_activity else None
+            ),
+            "current_action": metrics.current_action,
+            "error_message": metrics.error_message,
+            "started_at": (
+                metrics.started_at.isoformat() if metrics.started_at else None
+            ),
+            "runtime_seconds": metrics.runtime_seconds,
+        }
+
+    def get_bot_status(self, user_id: int) -> Dict[str, Any]:
+        """Gibt den aktuellen Status eines User-Bots zurück"""
+        with self._lock:
+            return self._status_dict(user_id)
+
+    def snapshot(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Status aller bekannten Bots, unter einer einzigen Sperre gelesen
+
+        User ohne Eintrag haben nie einen Bot gestartet und gelten als
+        gestoppt.
+        """
+        with self._lock:
+            return {user_id: self._status_dict(user_id) for user_id in self.bot_metrics}
+
     async def start_bot(self, user_id: int) -> Dict[str, Any]:
         """Startet einen Bot für einen bestimmten User"""
         with self._lock:
@@ -78,7 +102,7 @@ class ImmobilienBotManager:
                 return {
                     "success": False,
                     "message": "Bot läuft bereits für diesen User",
-                    "status": self.get_bot_status(user_id),
+                    "status": self._status_dict(user_id),
                 }
 
             # Bot-Metrics initialisieren
@@ -89,15 +113,17 @@ class ImmobilienBotManager:
                 last_activity=datetime.now(),
                 current_action="Bot wird gestartet...",
             )
+        self._changed(user_id)
 
         try:
             # User-Daten aus Datenbank laden
-            db = SessionLocal()
-            user = db.query(User).filter(User.id == user_id).first()
+            db = AsyncSessionLocal()
+            user = await db.get(User, user_id)
             if not user:
                 with self._lock:
                     self.bot_metrics[user_id].status = BotStatus.ERROR
                     self.bot_metrics[user_id].error_message = "User nicht gefunden"
+                self._changed(user_id)
                 return {"success": False, "message": "User nicht gefunden"}
 
             # UserBot-Instanz erstellen (import here to avoid circular imports)
@@ -109,6 +135,7 @@ class ImmobilienBotManager:
                 self.user_bots[user_id] = user_bot
                 self.bot_metrics[user_id].status = BotStatus.RUNNING
                 self.bot_metrics[user_id].current_action = "Bot erfolgreich gestartet"
+            self._changed(user_id)
 
             # Bot im Hintergrund starten
             asyncio.create_task(user_bot.run())
@@ -125,11 +152,12 @@ class ImmobilienBotManager:
             with self._lock:
                 self.bot_metrics[user_id].status = BotStatus.ERROR
                 self.bot_metrics[user_id].error_message = str(e)
+            self._changed(user_id)
 
             self.logger.error(f"Fehler beim Starten des Bots für User {user_id}: {e}")
             return {"success": False, "message": f"Fehler beim Starten: {str(e)}"}
         finally:
-            db.close()
+            await db.close()
 
     async def stop_bot(self, user_id: int) -> Dict[str, Any]:
         """Stoppt einen Bot für einen bestimmten User"""
@@ -141,6 +169,7 @@ class ImmobilienBotManager:
             if user_id in self.bot_metrics:
                 self.bot_metrics[user_id].status = BotStatus.STOPPING
                 self.bot_metrics[user_id].current_action = "Bot wird gestoppt..."
+        self._changed(user_id)
 
         try:
             await user_bot.stop()
@@ -151,6 +180,7 @@ class ImmobilienBotManager:
                 if user_id in self.bot_metrics:
                     self.bot_metrics[user_id].status = BotStatus.STOPPED
                     self.bot_metrics[user_id].current_action = "Bot gestoppt"
+            self._changed(user_id)
 
             self.logger.info(f"Bot für User {user_id} erfolgreich gestoppt")
 
@@ -163,33 +193,44 @@ class ImmobilienBotManager:
                     self.bot_metrics[user_id].error_message = (
                         f"Fehler beim Stoppen: {str(e)}"
                     )
+            self._changed(user_id)
 
             self.logger.error(f"Fehler beim Stoppen des Bots für User {user_id}: {e}")
             return {"success": False, "message": f"Fehler beim Stoppen: {str(e)}"}
 
+    async def remove_user_bot(self, user_id: int):
+        """Stoppt den Bot eines gelöschten Users und verwirft seine Metriken"""
+        if user_id in self.user_bots:
+            await self.stop_bot(user_id)
+
+        with self._lock:
+            self.bot_metrics.pop(user_id, None)
+        self._changed(user_id)
+
     def update_metrics(self, user_id: int, **kwargs):
         """Aktualisiert die Metriken für einen User-Bot"""
         with self._lock:
-            if user_id in self.bot_metrics:
-                metrics = self.bot_metrics[user_id]
-                for key, value in kwargs.items():
-                    if hasattr(metrics, key):
-                        setattr(metrics, key, value)
-                metrics.last_activity = datetime.now()
-
-                # Runtime berechnen
-                if metrics.started_at:
-                    metrics.runtime_seconds = int(
-                        (datetime.now() - metrics.started_at).total_seconds()
-                    )
+            if user_id not in self.bot_metrics:
+                return
+            metrics = self.bot_metrics[user_id]
+            before = [getattr(metrics, field) for field in ETAG_FIELDS]
+            for key, value in kwargs.items():
+                if hasattr(metrics, key):
+                    setattr(metrics, key, value)
+            metrics.last_activity = datetime.now()
+
+            # Runtime berechnen
+            if metrics.started_at:
+                metrics.runtime_seconds = int(
+                    (datetime.now() - metrics.started_at).total_seconds()
+                )
+            changed = before != [getattr(metrics, field) for field in ETAG_FIELDS]
+        if changed:
+            self._changed(user_id)
 
     def get_all_bot_statuses(self) -> List[Dict[str, Any]]:
         """Gibt den Status aller aktiven Bots zurück"""
-        statuses = []
-        with self._lock:
-            for user_id in self.bot_metrics:
-                statuses.append(self.get_bot_status(user_id))
-        return statuses
+        return list(self.snapshot().values())
 
     async def shutdown_all_bots(self):
         """Stoppt alle aktiven Bots (für Graceful Shutdown)"""
@@ -2,7 +2,7 @@ import asyncio
 import logging
 import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from selenium import webdriver
 from selenium.common.exceptions import (
@@ -17,6 +17,13 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select, WebDriverWait
 
+from services.listing_feed import (
+    ListingEvent,
+    ListingEventType,
+    ListingSnapshotDiffer,
+)
+from services.seen_listings import seen_listings
+
 
 class ImmobilienCrawler:
     """
@@ -34,8 +41,14 @@ class ImmobilienCrawler:
         # WBM-URL
         self.url = "https://www.wbm.de/wohnungen-berlin/angebote/"
 
-        # Bekannte Angebote (sollten später in DB gespeichert werden)
-        self.known_listings = set()
+        # Bekannte Angebote (kompakt in der gemeinsamen Registry gespeichert)
+        self.known_listings = seen_listings.for_user(user_id)
+
+        # Letzter Snapshot für das inkrementelle Diffing
+        self.snapshot_differ = ListingSnapshotDiffer()
+
+        # Nach einer Filteränderung einmal alle noch online stehenden Angebote prüfen
+        self.reevaluate_all = False
 
     def setup_browser(self):
         """Initialisiert den Browser für das Crawling"""
@@ -100,10 +113,15 @@ class ImmobilienCrawler:
         except Exception as e:
             self.logger.warning(f"Fehler beim Akzeptieren der Cookies: {e}")
 
-    async def check_for_new_listings(self) -> List[Dict[str, Any]]:
-        """Überprüft die WBM-Website auf neue Angebote"""
+    async def fetch_snapshot(self) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+        """
+        Lädt die aktuelle Angebotsliste der WBM-Website.
+
+        Gibt die Angebote und ``True`` zurück, wenn jedes gefundene Angebot
+        ausgelesen werden konnte. None, wenn die Seite nicht geladen wurde.
+        """
         self.logger.info(
-            f"Überprüfe auf neue Angebote für User {self.user_id}: {self.url}"
+            f"Lade Angebots-Snapshot für User {self.user_id}: {self.url}"
         )
 
         try:
@@ -128,41 +146,98 @@ class ImmobilienCrawler:
                 self.logger.warning(
                     "Keine Angebote gefunden. Möglicherweise hat sich die Webseitenstruktur geändert."
                 )
-                return []
+                return None
 
             self.logger.info(f"Gefunden: {len(listings)} Angebote")
 
-            new_listings = []
+            snapshot = []
             for listing in listings:
                 try:
                     # Informationen zum Angebot extrahieren
                     listing_data = await self.extract_listing_data(listing)
-
-                    if listing_data and self.filter_listing(listing_data):
-                        if listing_data["id"] not in self.known_listings:
-                            new_listings.append(listing_data)
-                            self.known_listings.add(listing_data["id"])
-                            self.logger.info(
-                                f"Neues gefiltertes Angebot gefunden: {listing_data['titel']} "
-                                f"({listing_data['id']})"
-                            )
-
+                    if listing_data:
+                        snapshot.append(listing_data)
                 except Exception as e:
                     self.logger.error(f"Fehler beim Verarbeiten eines Angebots: {e}")
 
-            self.logger.info(f"Neue gefilterte Angebote gefunden: {len(new_listings)}")
-            return new_listings
+            # Noch vorhandene Angebote vor dem Altern schützen
+            seen_listings.touch(listing["id"] for listing in snapshot)
+
+            complete = len(snapshot) == len(listings)
+            if not complete:
+                self.logger.warning(
+                    f"Nur {len(snapshot)} von {len(listings)} Angeboten ausgelesen, "
+                    "verschwundene Angebote werden in diesem Durchlauf nicht gemeldet"
+                )
+            return snapshot, complete
 
         except TimeoutException:
             self.logger.error(
                 "Timeout beim Laden der Seite. Möglicherweise ist die "
                 "Internetverbindung langsam oder die Seite nicht verfügbar."
             )
-            return []
+            return None
         except Exception as e:
-            self.logger.error(f"Fehler beim Überprüfen auf neue Angebote: {e}")
+            self.logger.error(f"Fehler beim Laden des Angebots-Snapshots: {e}")
+            return None
+
+    async def check_for_listing_events(self) -> List[ListingEvent]:
+        """Vergleicht den aktuellen Snapshot mit dem vorherigen und liefert die Änderungen"""
+        result = await self.fetch_snapshot()
+        if result is None:
+            # Fehlgeschlagene Ladevorgänge dürfen keine REMOVED-Events erzeugen
             return []
 
+        snapshot, complete = result
+        events = self.snapshot_differ.diff(snapshot, complete=complete)
+        self.logger.info(
+            f"Snapshot-Diff für User {self.user_id}: {len(events)} Änderungen"
+        )
+        return events
+
+    def update_filter_settings(self, filter_settings: Dict):
+        """Übernimmt geänderte Filter, auch für unveränderte Angebote"""
+        if filter_settings == self.filter_settings:
+            return
+        self.filter_settings = filter_settings
+        self.reevaluate_all = True
+        self.logger.info(f"Filter für User {self.user_id} geändert")
+
+    def select_new_matches(self, events: List[ListingEvent]) -> List[Dict[str, Any]]:
+        """
+        Gibt neu passende, noch nicht bekannte Angebote aus den Events zurück.
+        Nach einer Filteränderung werden einmal alle Angebote geprüft.
+        """
+        if self.reevaluate_all:
+            self.reevaluate_all = False
+            candidates = self.snapshot_differ.listings()
+        else:
+            candidates = [
+                event.listing
+                for event in events
+                if event.type != ListingEventType.REMOVED
+            ]
+
+        new_listings = []
+        for listing_data in candidates:
+            if (
+                self.filter_listing(listing_data)
+                and listing_data["id"] not in self.known_listings
+            ):
+                new_listings.append(listing_data)
+                self.known_listings.add(listing_data["id"])
+                self.logger.info(
+                    f"Neues gefiltertes Angebot gefunden: {listing_data['titel']} "
+                    f"({listing_data['id']})"
+                )
+
+        self.logger.info(f"Neue gefilterte Angebote gefunden: {len(new_listings)}")
+        return new_listings
+
+    async def check_for_new_listings(self) -> List[Dict[str, Any]]:
+        """Überprüft die WBM-Website auf neue Angebote"""
+        return self.select_new_matches(await self.check_for_listing_events())
+
     async def extract_listing_data(self, listing) -> Optional[Dict[str, Any]]:
         """Extrahiert Daten aus einem Angebots-Element"""
         try:
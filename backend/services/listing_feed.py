@@ -0,0 +1,94 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+# Felder, deren Änderung ein CHANGED-Event auslöst
+TRACKED_FIELDS = ("titel", "adresse", "area", "warmmiete", "zimmer", "has_wbs", "url")
+
+# Schrumpft die Liste stärker, gilt der Snapshot als unvollständig geladen
+SNAPSHOT_MIN_RATIO = 0.5
+
+
+class ListingEventType(Enum):
+    ADDED = "added"
+    REMOVED = "removed"
+    CHANGED = "changed"
+
+
+@dataclass
+class ListingEvent:
+    type: ListingEventType
+    listing_id: str
+    listing: Dict[str, Any]
+    previous: Optional[Dict[str, Any]] = None
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+
+
+class ListingSnapshotDiffer:
+    """
+    Vergleicht den aktuellen Angebots-Snapshot mit dem vorherigen
+    und erzeugt daraus Lifecycle-Events (added, removed, changed)
+
+    REMOVED-Events gibt es nur für vollständige Snapshots. Bei Teil-Snapshots
+    (Extraktionsfehler, stark geschrumpfte Liste) bleiben fehlende Angebote
+    im Vergleichsstand, bis sie in einem vollständigen Snapshot fehlen.
+    """
+
+    def __init__(self):
+        self.previous: Optional[Dict[str, Dict[str, Any]]] = None
+        self.latest: Dict[str, Dict[str, Any]] = {}
+
+    def diff(
+        self, snapshot: List[Dict[str, Any]], complete: bool = True
+    ) -> List[ListingEvent]:
+        """Gibt die Events seit dem letzten Snapshot zurück und merkt sich den neuen"""
+        current = {listing["id"]: listing for listing in snapshot}
+        previous = self.previous or {}
+        events = []
+        self.latest = current
+
+        if len(current) < len(previous) * SNAPSHOT_MIN_RATIO:
+            complete = False
+
+        for listing_id, listing in current.items():
+            old = previous.get(listing_id)
+            if old is None:
+                events.append(
+                    ListingEvent(ListingEventType.ADDED, listing_id, listing)
+                )
+                continue
+
+            changes = {
+                key: (old.get(key), listing.get(key))
+                for key in TRACKED_FIELDS
+                if old.get(key) != listing.get(key)
+            }
+            if changes:
+                events.append(
+                    ListingEvent(
+                        ListingEventType.CHANGED,
+                        listing_id,
+                        listing,
+                        previous=old,
+                        changes=changes,
+                    )
+                )
+
+        if not complete:
+            self.previous = {**previous, **current}
+            return events
+
+        for listing_id, old in previous.items():
+            if listing_id not in current:
+                events.append(
+                    ListingEvent(
+                        ListingEventType.REMOVED, listing_id, old, previous=old
+                    )
+                )
+
+        self.previous = current
+        return events
+
+    def listings(self) -> List[Dict[str, Any]]:
+        """Die Angebote des zuletzt geladenen Snapshots"""
+        return list(self.latest.values())
@@ -0,0 +1,268 @@
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from core.pagination import (
+    cursor_datetime,
+    cursor_key,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+)
+from database.database import db_now
+from models.archive import ArchivePartition
+from models.bot_status import BotLog
+from services.archive_store import ArchiveStore, archive_store
+
+# Tage, die Bot-Logs in der Tabelle bot_logs bleiben, bevor sie ins Archiv wandern
+BOT_LOG_HOT_DAYS = int(os.getenv("BOT_LOG_HOT_DAYS", "7"))
+
+ARCHIVE_KIND = "bot_logs"
+
+# SQLite erlaubt nur begrenzt viele Parameter pro Statement
+DELETE_CHUNK_SIZE = 500
+
+
+def _parse_day(value) -> date:
+    # SQLite liefert date() als String, PostgreSQL als date
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+class BotLogArchive:
+    """
+    Zeitpartitionierte Ablage der Bot-Logs
+
+    Aktuelle Logs liegen in ``bot_logs`` (heißes Fenster). Ältere Tage werden
+    je User und Tag als komprimierte Partition ausgelagert und in
+    ``archive_partitions`` indiziert. Leser fragen zuerst die Tabelle ab und
+    ergänzen bei Bedarf aus den neuesten Partitionen.
+    """
+
+    def __init__(self, store: ArchiveStore = archive_store, hot_days: int = BOT_LOG_HOT_DAYS):
+        self.store = store
+        self.hot_days = hot_days
+
+    def hot_cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Beginn des heißen Fensters (Mitternacht, damit nur ganze Tage wandern)"""
+        today = (now or db_now()).date()
+        return datetime.combine(today - timedelta(days=self.hot_days), time.min)
+
+    def pending_days(self, db: Session, now: Optional[datetime] = None) -> List[date]:
+        """Tage mit Logs außerhalb des heißen Fensters, älteste zuerst"""
+        day = func.date(BotLog.timestamp)
+        rows = db.execute(
+            select(day)
+            .where(BotLog.timestamp < self.hot_cutoff(now))
+            .distinct()
+            .order_by(day)
+        ).scalars()
+        return [_parse_day(value) for value in rows]
+
+    def archive_day(self, db: Session, day: date) -> int:
+        """Lagert alle Logs eines Tages aus, eine Transaktion pro User"""
+        start = datetime.combine(day, time.min)
+        end = start + timedelta(days=1)
+        in_day = (BotLog.timestamp >= start) & (BotLog.timestamp < end)
+
+        user_ids = db.scalars(select(BotLog.user_id).where(in_day).distinct()).all()
+
+        archived = 0
+        for user_id in user_ids:
+            archived += self._archive_user_day(db, user_id, day, in_day)
+        return archived
+
+    def _archive_user_day(self, db: Session, user_id: int, day: date, in_day) -> int:
+        rows = [
+            dict(row)
+            for row in db.execute(
+                select(BotLog.__table__)
+                .where(in_day, BotLog.user_id == user_id)
+                .order_by(BotLog.id)
+            ).mappings()
+        ]
+        if not rows:
+            return 0
+
+        partition = db.scalar(
+            select(ArchivePartition).where(
+                ArchivePartition.kind == ARCHIVE_KIND,
+                ArchivePartition.user_id == user_id,
+                ArchivePartition.day == day,
+            )
+        )
+
+        if partition is None:
+            partition = ArchivePartition(
+                kind=ARCHIVE_KIND,
+                user_id=user_id,
+                day=day,
+                path=self.store.partition_path(ARCHIVE_KIND, user_id, day),
+            )
+            db.add(partition)
+            merged = rows
+        else:
+            # Nachzügler oder abgebrochener Lauf: nach ID zusammenführen
+            by_id = {entry["id"]: entry for entry in self.store.read(partition.path)}
+            by_id.update({row["id"]: row for row in rows})
+            merged = [by_id[key] for key in sorted(by_id)]
+
+        partition.row_count = self.store.write(partition.path, merged)
+        partition.levels = ",".join(sorted({entry["level"] for entry in merged}))
+
+        ids = [row["id"] for row in rows]
+        for i in range(0, len(ids), DELETE_CHUNK_SIZE):
+            db.execute(delete(BotLog).where(BotLog.id.in_(ids[i : i + DELETE_CHUNK_SIZE])))
+        db.commit()
+
+        return len(rows)
+
+    def apply_retention(
+        self,
+        db: Session,
+        default_days: int,
+        days_by_level: Dict[str, int],
+        now: Optional[datetime] = None,
+    ) -> int:
+        """Wendet die Aufbewahrungsfristen auf das Archiv an, gibt gelöschte Zeilen zurück"""
+        today = (now or db_now()).date()
+
+        def cutoff(level: str) -> date:
+            return today - timedelta(days=days_by_level.get(level, default_days))
+
+        oldest_cutoff = today - timedelta(
+            days=min([default_days, *days_by_level.values()])
+        )
+        partitions = db.scalars(
+            select(ArchivePartition).where(
+                ArchivePartition.kind == ARCHIVE_KIND,
+                ArchivePartition.day < oldest_cutoff,
+            )
+        ).all()
+
+        removed = 0
+        for partition in partitions:
+            levels = (partition.levels or "").split(",")
+            expired = {level for level in levels if partition.day < cutoff(level)}
+            if not expired:
+                continue
+
+            if expired == set(levels):
+                removed += partition.row_count
+                self.store.delete(partition.path)
+                db.delete(partition)
+            else:
+                kept = [
+                    entry
+                    for entry in self.store.read(partition.path)
+                    if entry["level"] not in expired
+                ]
+                removed += partition.row_count - len(kept)
+                partition.row_count = self.store.write(partition.path, kept)
+                partition.levels = ",".join(sorted({e["level"] for e in kept}))
+            db.commit()
+
+        return removed
+
+    def delete_user(self, db: Session, user_id: int) -> int:
+        """Entfernt alle archivierten Logs eines Users (ohne Commit)"""
+        partitions = db.scalars(
+            select(ArchivePartition).where(
+                ArchivePartition.kind == ARCHIVE_KIND,
+                ArchivePartition.user_id == user_id,
+            )
+        ).all()
+
+        removed = 0
+        for partition in partitions:
+            removed += partition.row_count
+            self.store.delete(partition.path)
+            db.delete(partition)
+        return removed
+
+    def read_user_logs(
+        self,
+        db: Session,
+        user_id: int,
+        level: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Neueste Logs zuerst, über Tabelle und Archiv hinweg.
+
+        Gibt die Logs der Seite und den Cursor der nächsten Seite zurück.
+        """
+        query = select(BotLog.__table__).where(BotLog.user_id == user_id)
+        if level:
+            query = query.where(BotLog.level == level)
+        if cursor:
+            query = query.where(keyset_filter(BotLog.timestamp, BotLog.id, cursor))
+
+        rows = db.execute(
+            query.add_columns(cursor_key(BotLog.timestamp))
+            .order_by(BotLog.timestamp.desc(), BotLog.id.desc())
+            .offset(skip)
+            .limit(limit + 1)
+        ).mappings().all()
+
+        logs = [{key: row[key] for key in row.keys() if key != "cursor_key"} for row in rows]
+        if len(rows) > limit:
+            return logs[:limit], encode_cursor(rows[limit - 1]["cursor_key"], logs[limit - 1]["id"])
+
+        # Offset im Archiv fortsetzen
+        if logs or skip == 0:
+            remaining_skip = 0
+        else:
+            hot_count = db.scalar(
+                select(func.count()).select_from(query.subquery())
+            )
+            remaining_skip = max(0, skip - hot_count)
+
+        before = None
+        if cursor:
+            sort_value, last_id = decode_cursor(cursor)
+            before = (cursor_datetime(sort_value), last_id)
+
+        partitions = select(ArchivePartition).where(
+            ArchivePartition.kind == ARCHIVE_KIND,
+            ArchivePartition.user_id == user_id,
+        )
+        if before:
+            partitions = partitions.where(ArchivePartition.day <= before[0].date())
+
+        for partition in db.scalars(partitions.order_by(ArchivePartition.day.desc())):
+            if level and level not in (partition.levels or "").split(","):
+                continue
+            if not level and not before and remaining_skip >= partition.row_count:
+                # Ganze Partition überspringen, ohne sie zu lesen
+                remaining_skip -= partition.row_count
+                continue
+
+            entries = self.store.read(partition.path)
+            for entry in entries:
+                entry["timestamp"] = datetime.fromisoformat(entry["timestamp"])
+            entries.sort(key=lambda e: (e["timestamp"], e["id"]), reverse=True)
+
+            for entry in entries:
+                if level and entry["level"] != level:
+                    continue
+                if before and (entry["timestamp"], entry["id"]) >= before:
+                    continue
+                if remaining_skip:
+                    remaining_skip -= 1
+                    continue
+
+                if len(logs) == limit:
+                    last = logs[-1]
+                    return logs, encode_cursor(last["timestamp"], last["id"])
+                logs.append(entry)
+
+        return logs, None
+
+
+# Globale Archiv-Instanz für Bot-Logs
+bot_log_archive = BotLogArchive()
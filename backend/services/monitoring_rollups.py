@@ -0,0 +1,232 @@
+"""
+Stündliche Rollups für das Monitoring
+
+Statt bei jeder Anfrage ``bewerbungen`` und ``bot_logs`` über den gesamten
+Zeitraum zu zählen, hält der Wartungsservice zwei kleine Tabellen aktuell:
+Bewerbungen pro Stunde/User/Status und Bot-Logs pro Stunde/User/Level.
+
+Eine Aktualisierung berechnet nur die betroffenen Stunden neu: alle Stunden
+ab der letzten Rollup-Stunde (abzüglich ``ROLLUP_LOOKBACK_HOURS`` für
+Nachzügler) sowie die Stunden von Bewerbungen, deren Status sich seitdem
+geändert hat. Rollups älterer Stunden bleiben bestehen, auch wenn die
+Rohdaten archiviert oder gelöscht wurden.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from database.database import db_now
+from models.bewerbung import Bewerbung, BewerbungsStatus
+from models.bot_status import BotLog
+from models.rollup import BewerbungRollup, BotLogRollup
+
+# Stunden vor der letzten Rollup-Stunde, die erneut berechnet werden
+ROLLUP_LOOKBACK_HOURS = int(os.getenv("ROLLUP_LOOKBACK_HOURS", "2"))
+
+# Zeitraum, der beim ersten Lauf nachträglich aggregiert wird
+ROLLUP_BACKFILL_DAYS = int(os.getenv("ROLLUP_BACKFILL_DAYS", "30"))
+
+# Stunden pro Neuberechnung (begrenzt die Größe der IN-Liste)
+REFRESH_CHUNK_HOURS = 100
+
+SQLITE_HOUR_FORMAT = "%Y-%m-%d %H:00:00"
+
+# Im Monitoring gilt jede versendete Bewerbung als erfolgreich, auch wenn
+# bereits eine Antwort kam (anders als die Erfolgsquote der User-Statistik)
+SUCCESSFUL_STATUSES = (BewerbungsStatus.SENT, BewerbungsStatus.RESPONDED)
+
+
+def successful_applications(status_counts: Dict[str, int]) -> int:
+    """Erfolgreiche Bewerbungen aus ``application_counts_by_status``"""
+    return sum(status_counts[status.value] for status in SUCCESSFUL_STATUSES)
+
+
+def floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def hour_bucket(bind, column):
+    """SQL-Ausdruck für den Beginn der Stunde eines Zeitstempels"""
+    if bind.dialect.name == "postgresql":
+        return func.date_trunc("hour", column)
+    return func.strftime(SQLITE_HOUR_FORMAT, column)
+
+
+def _to_datetime(value) -> datetime:
+    # SQLite liefert strftime() als String, PostgreSQL als datetime
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value))
+    return value.replace(tzinfo=None)
+
+
+def _to_bucket_value(bind, hour: datetime):
+    # Vergleichswert im Format von hour_bucket()
+    if bind.dialect.name == "postgresql":
+        return hour
+    return hour.strftime(SQLITE_HOUR_FORMAT)
+
+
+class MonitoringRollups:
+    """Pflegt und liest die stündlichen Rollups"""
+
+    def __init__(
+        self,
+        lookback_hours: int = ROLLUP_LOOKBACK_HOURS,
+        backfill_days: int = ROLLUP_BACKFILL_DAYS,
+    ):
+        self.lookback_hours = lookback_hours
+        self.backfill_days = backfill_days
+
+    def refresh(self, db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Berechnet die betroffenen Stunden neu, gibt deren Anzahl je Tabelle zurück"""
+        now = now or db_now()
+        return {
+            "bewerbungen": self._refresh_table(
+                db,
+                BewerbungRollup,
+                Bewerbung.bewerbungsdatum,
+                [Bewerbung.user_id, Bewerbung.status],
+                Bewerbung.id,
+                now,
+                changed_column=Bewerbung.updated_at,
+            ),
+            "bot_logs": self._refresh_table(
+                db,
+                BotLogRollup,
+                BotLog.timestamp,
+                [BotLog.user_id, BotLog.level],
+                BotLog.id,
+                now,
+            ),
+        }
+
+    def _since(self, db: Session, rollup, now: datetime) -> datetime:
+        last_hour = db.scalar(select(func.max(rollup.hour)))
+        if last_hour is None:
+            return floor_hour(now - timedelta(days=self.backfill_days))
+        return _to_datetime(last_hour) - timedelta(hours=self.lookback_hours)
+
+    def _refresh_table(
+        self,
+        db: Session,
+        rollup,
+        time_column,
+        key_columns,
+        id_column,
+        now: datetime,
+        changed_column=None,
+    ) -> int:
+        bind = db.get_bind()
+        bucket = hour_bucket(bind, time_column)
+        since = self._since(db, rollup, now)
+
+        touched = time_column >= since
+        if changed_column is not None:
+            touched = touched | (changed_column >= since)
+
+        hours = {
+            _to_datetime(value)
+            for value in db.scalars(select(bucket).where(touched).distinct())
+            if value is not None
+        }
+        # Stunden, deren Quellzeilen inzwischen gelöscht wurden, ebenfalls neu zählen
+        hours.update(
+            _to_datetime(value)
+            for value in db.scalars(select(rollup.hour).where(rollup.hour >= since))
+        )
+
+        ordered = sorted(hours)
+        key_names = [column.key for column in key_columns]
+        for i in range(0, len(ordered), REFRESH_CHUNK_HOURS):
+            chunk = ordered[i : i + REFRESH_CHUNK_HOURS]
+            rows = db.execute(
+                select(bucket, *key_columns, func.count(id_column))
+                .where(
+                    time_column >= chunk[0] - timedelta(hours=1),
+                    time_column < chunk[-1] + timedelta(hours=2),
+                    bucket.in_([_to_bucket_value(bind, hour) for hour in chunk]),
+                )
+                .group_by(bucket, *key_columns)
+            ).all()
+
+            db.execute(delete(rollup).where(rollup.hour.in_(chunk)))
+            if rows:
+                db.execute(
+                    insert(rollup),
+                    [
+                        {
+                            "hour": _to_datetime(row[0]),
+                            **dict(zip(key_names, row[1:-1])),
+                            "count": row[-1],
+                        }
+                        for row in rows
+                    ],
+                )
+            db.commit()
+
+        return len(ordered)
+
+    # Lesen
+
+    def application_counts_by_status(
+        self, db: Session, since: datetime
+    ) -> Dict[str, int]:
+        """Bewerbungen seit ``since`` je Status (alle Status, auch ohne Treffer)"""
+        counts = {status.value: 0 for status in BewerbungsStatus}
+        rows = db.execute(
+            select(BewerbungRollup.status, func.sum(BewerbungRollup.count))
+            .where(BewerbungRollup.hour >= floor_hour(since))
+            .group_by(BewerbungRollup.status)
+        ).all()
+        for status, count in rows:
+            counts[status.value] = count
+        return counts
+
+    def applications_per_day(
+        self, db: Session, since: datetime
+    ) -> List[Dict[str, Any]]:
+        day = func.date(BewerbungRollup.hour)
+        rows = db.execute(
+            select(day, func.sum(BewerbungRollup.count))
+            .where(BewerbungRollup.hour >= floor_hour(since))
+            .group_by(day)
+            .order_by(day)
+        ).all()
+        return [{"date": str(value), "count": count} for value, count in rows]
+
+    def top_users(
+        self, db: Session, since: datetime, limit: int = 10
+    ) -> List[Dict[str, int]]:
+        total = func.sum(BewerbungRollup.count)
+        rows = db.execute(
+            select(BewerbungRollup.user_id, total)
+            .where(BewerbungRollup.hour >= floor_hour(since))
+            .group_by(BewerbungRollup.user_id)
+            .order_by(total.desc())
+            .limit(limit)
+        ).all()
+        return [{"user_id": user_id, "applications": count} for user_id, count in rows]
+
+    def active_user_ids(self, since: datetime):
+        """Unterabfrage: User mit Bewerbungen seit ``since``"""
+        return (
+            select(BewerbungRollup.user_id)
+            .where(BewerbungRollup.hour >= floor_hour(since))
+            .distinct()
+        )
+
+    def log_counts_by_level(self, db: Session, since: datetime) -> Dict[str, int]:
+        rows = db.execute(
+            select(BotLogRollup.level, func.sum(BotLogRollup.count))
+            .where(BotLogRollup.hour >= floor_hour(since))
+            .group_by(BotLogRollup.level)
+        ).all()
+        return {level: count for level, count in rows}
+
+
+# Globale Rollup-Instanz
+monitoring_rollups = MonitoringRollups()
@@ -0,0 +1,160 @@
+import heapq
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+class SeenListingRegistry:
+    """
+    Kompakte Verwaltung bereits gesehener Angebote für alle User-Bots
+
+    Angebots-IDs werden einmalig in einer gemeinsamen Tabelle auf einen
+    Slot (Integer) abgebildet. Pro User wird nur eine Bitmap über diese
+    Slots gehalten. Angebote, die länger als ``max_age_seconds`` nicht mehr
+    auf der Website gesehen wurden, werden entfernt und ihre Slots
+    wiederverwendet, sodass der Speicherbedarf nicht mit der Laufzeit wächst.
+    """
+
+    def __init__(self, max_age_seconds: float = 7 * 24 * 3600):
+        self.max_age_seconds = max_age_seconds
+        self._slots: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._last_seen: List[float] = []
+        self._free_slots: List[int] = []
+        self._user_bitmaps: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _intern(self, listing_id: str, now: float) -> int:
+        """Gibt den Slot einer Angebots-ID zurück und legt ihn bei Bedarf an"""
+        slot = self._slots.get(listing_id)
+        if slot is None:
+            if self._free_slots:
+                # Kleinsten freien Slot wiederverwenden, damit Bitmaps klein bleiben
+                slot = heapq.heappop(self._free_slots)
+                self._ids[slot] = listing_id
+                self._last_seen[slot] = now
+            else:
+                slot = len(self._ids)
+                self._ids.append(listing_id)
+                self._last_seen.append(now)
+            self._slots[listing_id] = slot
+        return slot
+
+    def touch(self, listing_ids: Iterable[str], now: Optional[float] = None):
+        """Markiert Angebote als aktuell auf der Website vorhanden"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            for listing_id in listing_ids:
+                slot = self._slots.get(listing_id)
+                if slot is not None:
+                    self._last_seen[slot] = now
+
+    def is_seen(self, user_id: int, listing_id: str) -> bool:
+        """Prüft, ob ein User ein Angebot bereits gesehen hat"""
+        with self._lock:
+            slot = self._slots.get(listing_id)
+            if slot is None:
+                return False
+            return bool((self._user_bitmaps.get(user_id, 0) >> slot) & 1)
+
+    def mark_seen(self, user_id: int, listing_id: str, now: Optional[float] = None):
+        """Markiert ein Angebot für einen User als gesehen"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            slot = self._intern(listing_id, now)
+            self._last_seen[slot] = now
+            self._user_bitmaps[user_id] = self._user_bitmaps.get(user_id, 0) | (
+                1 << slot
+            )
+
+    def count_for_user(self, user_id: int) -> int:
+        """Anzahl der von einem User gesehenen Angebote"""
+        with self._lock:
+            return bin(self._user_bitmaps.get(user_id, 0)).count("1")
+
+    def for_user(self, user_id: int) -> "UserSeenListings":
+        """Gibt eine set-artige Sicht auf die gesehenen Angebote eines Users zurück"""
+        return UserSeenListings(self, user_id)
+
+    def forget_user(self, user_id: int):
+        """Entfernt die Bitmap eines Users (z.B. nach dem Löschen)"""
+        with self._lock:
+            self._user_bitmaps.pop(user_id, None)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        Entfernt Angebote, die seit ``max_age_seconds`` nicht mehr auf der
+        Website waren, und gibt ihre Slots frei. Gibt die Anzahl zurück.
+        """
+        now = now if now is not None else time.time()
+        cutoff = now - self.max_age_seconds
+
+        with self._lock:
+            mask = 0
+            expired = 0
+            for slot, listing_id in enumerate(self._ids):
+                if listing_id is None or self._last_seen[slot] >= cutoff:
+                    continue
+                del self._slots[listing_id]
+                self._ids[slot] = None
+                heapq.heappush(self._free_slots, slot)
+                mask |= 1 << slot
+                expired += 1
+
+            if mask:
+                keep = ~mask
+                for user_id in list(self._user_bitmaps):
+                    bitmap = self._user_bitmaps[user_id] & keep
+                    if bitmap:
+                        self._user_bitmaps[user_id] = bitmap
+                    else:
+                        del self._user_bitmaps[user_id]
+
+            # Freie Slots am Ende abschneiden
+            size = len(self._ids)
+            while self._ids and self._ids[-1] is None:
+                self._ids.pop()
+                self._last_seen.pop()
+            if len(self._ids) < size:
+                self._free_slots = [s for s in self._free_slots if s < len(self._ids)]
+                heapq.heapify(self._free_slots)
+
+            return expired
+
+    def get_stats(self) -> Dict[str, int]:
+        """Gibt Kennzahlen zur Speichernutzung zurück"""
+        with self._lock:
+            return {
+                "interned_listings": len(self._slots),
+                "slots": len(self._ids),
+                "free_slots": len(self._free_slots),
+                "tracked_users": len(self._user_bitmaps),
+                "bitmap_bytes": sum(
+                    (bitmap.bit_length() + 7) // 8
+                    for bitmap in self._user_bitmaps.values()
+                ),
+            }
+
+
+class UserSeenListings:
+    """Set-artige Sicht eines einzelnen Users auf die gemeinsame Registry"""
+
+    def __init__(self, registry: SeenListingRegistry, user_id: int):
+        self.registry = registry
+        self.user_id = user_id
+
+    def __contains__(self, listing_id: str) -> bool:
+        return self.registry.is_seen(self.user_id, listing_id)
+
+    def __len__(self) -> int:
+        return self.registry.count_for_user(self.user_id)
+
+    def add(self, listing_id: str):
+        self.registry.mark_seen(self.user_id, listing_id)
+
+
+# Globale Registry-Instanz (von allen Crawlern geteilt)
+seen_listings = SeenListingRegistry(
+    max_age_seconds=float(os.getenv("SEEN_LISTING_MAX_AGE_DAYS", "7")) * 24 * 3600
+)
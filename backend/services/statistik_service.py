@@ -0,0 +1,336 @@
+"""
+Inkrementell gepflegte Statistik pro User
+
+Die Zähler in ``statistiken`` werden bei jedem Flush einer Bewerbung über
+ORM-Events angepasst (Anlegen, Statuswechsel, Löschen). Das Lesen der
+Statistik ist damit ein einzelner Zeilenzugriff ohne Schreibvorgang.
+
+Das 30-Tage-Fenster verschiebt sich mit der Zeit und wird deshalb zusätzlich
+vom Wartungsservice mit ``reconcile_statistiken`` neu berechnet; dabei werden
+auch Abweichungen durch Massenänderungen außerhalb des ORM korrigiert.
+Archivierte Bewerbungen (services/bewerbung_archive) fließen über die
+``archivierte_*``-Spalten in die Summen ein.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from core.etag import bump_after_commit, resource_versions
+from database.database import db_now, dialect_insert, upsert
+from models.bewerbung import Bewerbung, BewerbungsStatus
+from models.statistik import Statistik
+
+RECENT_DAYS = 30
+
+# Status, der als erfolgreiche Bewerbung zählt
+SUCCESS_STATUS = BewerbungsStatus.RESPONDED
+
+# Archivierte Bewerbungen, deren Status außer "erfolgreich" nicht mehr
+# aufgeschlüsselt ist (Schlüssel in ``bewerbungen_nach_status``)
+ARCHIVED_STATUS = "archiviert"
+
+# Zeitreihen im Dashboard
+GRANULARITIES = ("day", "week", "month")
+DEFAULT_BUCKETS = {"day": 30, "week": 12, "month": 6}
+MAX_BUCKETS = 366
+
+
+def _is_recent(bewerbungsdatum: Optional[datetime], now: datetime) -> bool:
+    # Ohne Wert (Server-Default noch nicht geladen) ist die Bewerbung neu
+    if bewerbungsdatum is None:
+        return True
+    return bewerbungsdatum.replace(tzinfo=None) >= now - timedelta(days=RECENT_DAYS)
+
+
+def apply_delta(
+    connection, user_id: int, total: int = 0, success: int = 0, recent: int = 0
+):
+    """Addiert Änderungen auf die Zähler eines Users (legt die Zeile bei Bedarf an)"""
+    if not (total or success or recent):
+        return
+
+    table = Statistik.__table__
+    stmt = dialect_insert(connection, Statistik).values(
+        user_id=user_id,
+        anzahl_verschickter_bewerbungen=max(total, 0),
+        erfolgreiche_bewerbungen=max(success, 0),
+        bewerbungen_letzte_30_tage=max(recent, 0),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "anzahl_verschickter_bewerbungen": func.coalesce(
+                table.c.anzahl_verschickter_bewerbungen, 0
+            )
+            + total,
+            "erfolgreiche_bewerbungen": func.coalesce(
+                table.c.erfolgreiche_bewerbungen, 0
+            )
+            + success,
+            "bewerbungen_letzte_30_tage": func.coalesce(
+                table.c.bewerbungen_letzte_30_tage, 0
+            )
+            + recent,
+        },
+    )
+    connection.execute(stmt)
+
+
+@event.listens_for(Bewerbung.status, "set", active_history=True)
+def _load_previous_status(target, value, oldvalue, initiator):
+    # active_history lädt den alten Status, damit after_update ihn kennt
+    pass
+
+
+@event.listens_for(Bewerbung, "after_insert")
+def _on_bewerbung_insert(mapper, connection, target):
+    now = db_now()
+    apply_delta(
+        connection,
+        target.user_id,
+        total=1,
+        success=int(target.__dict__.get("status") == SUCCESS_STATUS),
+        recent=int(_is_recent(target.__dict__.get("bewerbungsdatum"), now)),
+    )
+    bump_after_commit(Session.object_session(target), "statistik", target.user_id)
+
+
+@event.listens_for(Bewerbung, "after_update")
+def _on_bewerbung_update(mapper, connection, target):
+    history = inspect(target).attrs.status.history
+    if not history.has_changes():
+        return
+
+    old_status = history.deleted[0] if history.deleted else None
+    new_status = history.added[0] if history.added else None
+    apply_delta(
+        connection,
+        target.user_id,
+        success=int(new_status == SUCCESS_STATUS) - int(old_status == SUCCESS_STATUS),
+    )
+    bump_after_commit(Session.object_session(target), "statistik", target.user_id)
+
+
+@event.listens_for(Bewerbung, "before_delete")
+def _on_bewerbung_delete(mapper, connection, target):
+    now = db_now()
+    apply_delta(
+        connection,
+        target.user_id,
+        total=-1,
+        success=-int(target.status == SUCCESS_STATUS),
+        recent=-int(_is_recent(target.bewerbungsdatum, now)),
+    )
+    bump_after_commit(Session.object_session(target), "statistik", target.user_id)
+
+
+def reconcile_counts(connection, now: Optional[datetime] = None) -> int:
+    """
+    Berechnet alle Zähler mit einer gruppierten Abfrage neu (ohne Commit).
+
+    Gibt die Anzahl der abgeglichenen User zurück.
+    """
+    now = now or db_now()
+    recent_since = now - timedelta(days=RECENT_DAYS)
+
+    rows = connection.execute(
+        select(
+            Bewerbung.user_id,
+            func.count(Bewerbung.id),
+            func.sum(case((Bewerbung.status == SUCCESS_STATUS, 1), else_=0)),
+            func.sum(case((Bewerbung.bewerbungsdatum >= recent_since, 1), else_=0)),
+        ).group_by(Bewerbung.user_id)
+    ).all()
+
+    table = Statistik.__table__
+    archived = func.coalesce(table.c.archivierte_bewerbungen, 0)
+    archived_success = func.coalesce(table.c.archivierte_erfolgreiche_bewerbungen, 0)
+
+    for user_id, total, success, recent in rows:
+        stmt = dialect_insert(connection, Statistik).values(
+            user_id=user_id,
+            anzahl_verschickter_bewerbungen=total,
+            erfolgreiche_bewerbungen=success or 0,
+            bewerbungen_letzte_30_tage=recent or 0,
+        )
+        connection.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={
+                    "anzahl_verschickter_bewerbungen": archived + total,
+                    "erfolgreiche_bewerbungen": archived_success + (success or 0),
+                    "bewerbungen_letzte_30_tage": recent or 0,
+                },
+            )
+        )
+
+    # User ohne Bewerbungen in der Tabelle behalten nur die archivierten
+    connection.execute(
+        update(Statistik)
+        .where(Statistik.user_id.notin_(select(Bewerbung.user_id).distinct()))
+        .values(
+            anzahl_verschickter_bewerbungen=archived,
+            erfolgreiche_bewerbungen=archived_success,
+            bewerbungen_letzte_30_tage=0,
+        )
+    )
+    return len(rows)
+
+
+def reconcile_statistiken(db: Session, now: Optional[datetime] = None) -> int:
+    """Gleicht die Zähler mit den Bewerbungen ab und committet"""
+    reconciled = reconcile_counts(db.connection(), now)
+    db.commit()
+    resource_versions.bump("statistik")
+    return reconciled
+
+
+def record_login(db: Session, user_id: int) -> datetime:
+    """Speichert den Login-Zeitpunkt in der Statistik des Users"""
+    letzter_login = db_now()
+    upsert(
+        db,
+        Statistik,
+        {"user_id": user_id, "letzter_login": letzter_login},
+        ["user_id"],
+        set_={"letzter_login": letzter_login},
+    )
+    bump_after_commit(db, "statistik", user_id)
+    db.commit()
+    return letzter_login
+
+
+def _as_date(value) -> date:
+    # SQLite liefert date() als String, PostgreSQL als date
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def bucket_start(day: date, granularity: str) -> date:
+    """Erster Tag des Zeitraums (Tag, ISO-Woche ab Montag, Kalendermonat)"""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start: date, granularity: str) -> date:
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def bucket_label(start: date, granularity: str) -> str:
+    if granularity == "week":
+        return start.strftime("%G-W%V")
+    if granularity == "month":
+        return start.strftime("%Y-%m")
+    return start.isoformat()
+
+
+def iter_buckets(start: date, end: date, granularity: str) -> List[date]:
+    """Alle Zeiträume zwischen ``start`` und ``end`` (inklusive), auch leere"""
+    buckets = []
+    current = bucket_start(start, granularity)
+    while current <= end:
+        buckets.append(current)
+        current = next_bucket(current, granularity)
+    return buckets
+
+
+def default_range_start(end: date, granularity: str) -> date:
+    """Beginn des Standardzeitraums (z.B. die letzten 6 Kalendermonate)"""
+    start = bucket_start(end, granularity)
+    for _ in range(DEFAULT_BUCKETS[granularity] - 1):
+        start = bucket_start(start - timedelta(days=1), granularity)
+    return start
+
+
+def dashboard_statistik(
+    db: Session,
+    user_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    granularity: str = "month",
+    today: Optional[date] = None,
+) -> Dict[str, Any]:
+    """
+    Dashboard-Zahlen aus einer Abfrage (gruppiert nach Status und Tag).
+
+    Status-Summen, die letzten 7 Tage und die Zeitreihe im gewünschten Raster
+    werden in Python aus den Tageswerten zusammengesetzt. Die Status-Summen
+    enthalten zusätzlich die archivierten Bewerbungen aus ``statistiken``,
+    damit sie mit ``anzahl_verschickter_bewerbungen`` übereinstimmen.
+    """
+    today = today or db_now().date()
+    end = end or today
+    start = start or default_range_start(end, granularity)
+
+    day = func.date(Bewerbung.bewerbungsdatum)
+    rows = db.execute(
+        select(Bewerbung.status, day, func.count(Bewerbung.id))
+        .where(Bewerbung.user_id == user_id)
+        .group_by(Bewerbung.status, day)
+    ).all()
+
+    buckets = iter_buckets(start, end, granularity)
+    series = {
+        bucket: {status.value: 0 for status in BewerbungsStatus} for bucket in buckets
+    }
+    status_counts = {status.value: 0 for status in BewerbungsStatus}
+    months = {
+        month: 0
+        for month in iter_buckets(default_range_start(today, "month"), today, "month")
+    }
+    week_start = today - timedelta(days=6)
+    recent_week = 0
+
+    for status, value, count in rows:
+        if value is None:
+            continue
+        row_day = _as_date(value)
+        status_counts[status.value] += count
+
+        if row_day >= week_start:
+            recent_week += count
+
+        if start <= row_day <= end:
+            series[bucket_start(row_day, granularity)][status.value] += count
+
+        month = bucket_start(row_day, "month")
+        if month in months:
+            months[month] += count
+
+    archived, archived_success = db.execute(
+        select(
+            func.coalesce(Statistik.archivierte_bewerbungen, 0),
+            func.coalesce(Statistik.archivierte_erfolgreiche_bewerbungen, 0),
+        ).where(Statistik.user_id == user_id)
+    ).first() or (0, 0)
+    status_counts[SUCCESS_STATUS.value] += archived_success
+    status_counts[ARCHIVED_STATUS] = archived - archived_success
+
+    return {
+        "bewerbungen_gesamt": sum(status_counts.values()),
+        "bewerbungen_nach_status": status_counts,
+        "bewerbungen_letzte_7_tage": recent_week,
+        "monatliche_statistik": [
+            {"monat": bucket_label(month, "month"), "anzahl": count}
+            for month, count in months.items()
+        ],
+        "zeitraum": {"start": start, "end": end, "granularity": granularity},
+        "zeitreihe": [
+            {
+                "periode": bucket_label(bucket, granularity),
+                "start": bucket,
+                "anzahl": sum(by_status.values()),
+                "nach_status": by_status,
+            }
+            for bucket, by_status in series.items()
+        ],
+    }
@@ -5,13 +5,15 @@ import random
 from datetime import datetime
 from typing import Any, Dict, List
 
+from sqlalchemy import select
 
-from database.database import SessionLocal
+from database.database import AsyncSessionLocal
 from models.bewerbung import Bewerbung, BewerbungsStatus
-from models.bot_status import BotLog
 from models.user import User
+from services.bot_log_sink import bot_log_sink
 from services.immobilien_bot_manager import BotStatus
 from services.immobilien_crawler import ImmobilienCrawler
+from services.listing_feed import ListingEvent, ListingEventType
 from services.email_service import email_service
 
 
@@ -37,6 +39,9 @@ class UserBot:
 
     def load_user_config(self):
         """Lädt User-spezifische Konfiguration aus der Datenbank"""
+        # Zum Erkennen späterer Änderungen (refresh_filter_settings)
+        self.filter_source = self.user.filter_einstellungen
+
         try:
             # Filter-Einstellungen parsen
             if self.user.filter_einstellungen:
@@ -146,7 +151,12 @@ class UserBot:
                         self.user_id, current_action="Überprüfe auf neue Angebote..."
                     )
 
-                    new_listings = await self.check_for_new_listings()
+                    await self.refresh_filter_settings()
+                    events = await self.check_for_listing_events()
+                    new_listings = self.crawler.select_new_matches(events)
+
+                    # Änderungen und verschwundene Angebote verarbeiten
+                    await self.process_lifecycle_events(events)
 
                     self.bot_manager.update_metrics(
                         self.user_id,
@@ -257,147 +267,219 @@ class UserBot:
         except Exception as e:
             self.logger.error(f"Fehler beim Cleanup für User {self.user_id}: {e}")
 
-    async def check_for_new_listings(self) -> List[Dict[str, Any]]:
-        """Überprüft auf neue Angebote"""
+    async def refresh_filter_settings(self):
+        """Übernimmt im laufenden Betrieb geänderte Filter-Einstellungen des Users"""
+        try:
+            async with AsyncSessionLocal() as db:
+                raw = await db.scalar(
+                    select(User.filter_einstellungen).where(User.id == self.user_id)
+                )
+        except Exception as e:
+            self.logger.error(
+                f"Fehler beim Laden der Filter für User {self.user_id}: {e}"
+            )
+            return
+
+        if not raw or raw == self.filter_source:
+            return
+        self.filter_source = raw
+
+        try:
+            self.filter_settings = json.loads(raw)
+        except json.JSONDecodeError as e:
+            self.logger.error(f"Fehler beim Parsen der Filter-Einstellungen: {e}")
+            return
+
+        if self.crawler:
+            self.crawler.update_filter_settings(self.filter_settings)
+
+    async def check_for_listing_events(self) -> List[ListingEvent]:
+        """Überprüft auf Änderungen der Angebotsliste seit dem letzten Durchlauf"""
         if not self.crawler:
             self.logger.error(f"Kein Crawler für User {self.user_id} initialisiert")
             return []
 
         try:
-            return await self.crawler.check_for_new_listings()
+            return await self.crawler.check_for_listing_events()
         except Exception as e:
             self.logger.error(
                 f"Fehler beim Überprüfen neuer Angebote für User {self.user_id}: {e}"
             )
             # Log in Datenbank speichern
-            self.log_to_database("ERROR", f"Fehler beim Crawling: {str(e)}", "crawl")
+            await self.log_to_database("ERROR", f"Fehler beim Crawling: {str(e)}", "crawl")
             return []
 
+    async def process_lifecycle_events(self, events: List[ListingEvent]):
+        """
+        Verarbeitet CHANGED- und REMOVED-Events für Angebote, die dieser User
+        bereits kennt. Unbekannte Angebote erzeugen keine Datenbank-Schreibzugriffe.
+        """
+        if not self.crawler:
+            return
+
+        removed = []
+        for event in events:
+            if event.listing_id not in self.crawler.known_listings:
+                continue
+
+            if event.type == ListingEventType.CHANGED:
+                changes = ", ".join(
+                    f"{key}: {old} -> {new}" for key, (old, new) in event.changes.items()
+                )
+                await self.log_to_database(
+                    "INFO",
+                    f"Angebot geändert: {event.listing.get('titel')} ({changes})",
+                    "listing_changed",
+                    event.listing_id,
+                )
+            elif event.type == ListingEventType.REMOVED:
+                removed.append(event)
+
+        if removed:
+            await self.log_removed_listings(removed)
+
+    async def log_removed_listings(self, events: List[ListingEvent]):
+        """
+        Protokolliert nicht mehr angebotene Wohnungen
+
+        Bewerbungen bleiben unverändert: Ein verschwundenes Angebot sagt nichts
+        über die Entscheidung des Vermieters, und der Bewerbungsstatus fließt
+        in die Statistik ein.
+        """
+        for event in events:
+            await self.log_to_database(
+                "INFO",
+                f"Angebot nicht mehr verfügbar: {event.listing.get('titel')}",
+                "listing_removed",
+                event.listing_id,
+            )
+
     async def process_listing(self, listing: Dict[str, Any]) -> bool:
         """Verarbeitet ein neues Angebot"""
         try:
-            db = SessionLocal()
+            async with AsyncSessionLocal() as db:
+                # Prüfen, ob bereits eine Bewerbung für diese Wohnung existiert
+                wohnungsname = listing.get("titel", "Unbekannt")
+                adresse = listing.get("adresse", "Unbekannt")
             
-            # Prüfen, ob bereits eine Bewerbung für diese Wohnung existiert
-            wohnungsname = listing.get("titel", "Unbekannt")
-            adresse = listing.get("adresse", "Unbekannt")
+                result = await db.execute(
+                    select(Bewerbung.id)
+                    .where(
+                        Bewerbung.user_id == self.user_id,
+                        Bewerbung.wohnungsname == wohnungsname,
+                        Bewerbung.adresse == adresse,
+                    )
+                    .limit(1)
+                )
+                existing_bewerbung = result.scalar()
             
-            existing_bewerbung = db.query(Bewerbung).filter(
-                Bewerbung.user_id == self.user_id,
-                Bewerbung.wohnungsname == wohnungsname,
-                Bewerbung.adresse == adresse
-            ).first()
+                if existing_bewerbung:
+                    self.logger.info(
+                        f"Bewerbung bereits vorhanden für User {self.user_id}: {wohnungsname} - {adresse}"
+                    )
+                    await self.log_to_database(
+                        "INFO",
+                        f"Doppelte Bewerbung übersprungen: {wohnungsname}",
+                        "skip_duplicate",
+                        listing.get("id"),
+                    )
+                    return False
             
-            if existing_bewerbung:
-                self.logger.info(
-                    f"Bewerbung bereits vorhanden für User {self.user_id}: {wohnungsname} - {adresse}"
+                # Neue Bewerbung in Datenbank als PENDING speichern
+                bewerbung = Bewerbung(
+                    user_id=self.user_id,
+                    wohnungsname=wohnungsname,
+                    adresse=adresse,
+                    preis=listing.get("warmmiete"),
+                    anzahl_zimmer=listing.get("zimmer"),
+                    status=BewerbungsStatus.PENDING,
                 )
-                self.log_to_database(
+
+                db.add(bewerbung)
+                await db.commit()
+                await db.refresh(bewerbung)
+
+                # Log erstellen
+                await self.log_to_database(
                     "INFO",
-                    f"Doppelte Bewerbung übersprungen: {wohnungsname}",
-                    "skip_duplicate",
+                    f"Neue Bewerbung erstellt: {listing.get('titel')}",
+                    "apply",
                     listing.get("id"),
                 )
-                db.close()
-                return False
-            
-            # Neue Bewerbung in Datenbank als PENDING speichern
-            bewerbung = Bewerbung(
-                user_id=self.user_id,
-                wohnungsname=wohnungsname,
-                adresse=adresse,
-                preis=listing.get("warmmiete"),
-                anzahl_zimmer=listing.get("zimmer"),
-                status=BewerbungsStatus.PENDING,
-            )
-
-            db.add(bewerbung)
-            db.commit()
-            db.refresh(bewerbung)
-
-            # Log erstellen
-            self.log_to_database(
-                "INFO",
-                f"Neue Bewerbung erstellt: {listing.get('titel')}",
-                "apply",
-                listing.get("id"),
-            )
-
-            # Kontaktformular ausfüllen
-            if self.crawler:
-                form_success = await self.crawler.fill_contact_form(listing)
 
-                if form_success:
-                    bewerbung.status = BewerbungsStatus.SENT
-                    self.log_to_database(
-                        "INFO",
-                        f"Bewerbung erfolgreich versendet: {listing.get('titel')}",
-                        "apply",
-                        listing.get("id"),
-                    )
-                    
-                    # Bestätigungsmail senden
-                    try:
-                        email_sent = email_service.send_application_confirmation(
-                            user=self.user,
-                            bewerbung=bewerbung,
-                            listing_details=listing
+                # Kontaktformular ausfüllen
+                if self.crawler:
+                    form_success = await self.crawler.fill_contact_form(listing)
+
+                    if form_success:
+                        bewerbung.status = BewerbungsStatus.SENT
+                        await self.log_to_database(
+                            "INFO",
+                            f"Bewerbung erfolgreich versendet: {listing.get('titel')}",
+                            "apply",
+                            listing.get("id"),
                         )
-                        if email_sent:
-                            self.log_to_database(
-                                "INFO",
-                                f"Bestätigungsmail gesendet für: {listing.get('titel')}",
-                                "email_sent",
-                                listing.get("id"),
-                            )
-                        else:
-                            self.log_to_database(
-                                "WARNING",
-                                f"Bestätigungsmail konnte nicht gesendet werden für: {listing.get('titel')}",
-                                "email_failed",
-                                listing.get("id"),
+                    
+                        # Bestätigungsmail senden
+                        try:
+                            email_sent = email_service.send_application_confirmation(
+                                user=self.user,
+                                bewerbung=bewerbung,
+                                listing_details=listing
                             )
-                    except Exception as email_error:
-                        self.logger.warning(f"Fehler beim Senden der Bestätigungsmail: {email_error}")
+                            if email_sent:
+                                await self.log_to_database(
+                                    "INFO",
+                                    f"Bestätigungsmail gesendet für: {listing.get('titel')}",
+                                    "email_sent",
+                                    listing.get("id"),
+                                )
+                            else:
+                                await self.log_to_database(
+                                    "WARNING",
+                                    f"Bestätigungsmail konnte nicht gesendet werden für: {listing.get('titel')}",
+                                    "email_failed",
+                                    listing.get("id"),
+                                )
+                        except Exception as email_error:
+                            self.logger.warning(f"Fehler beim Senden der Bestätigungsmail: {email_error}")
                         
-                else:
-                    bewerbung.status = BewerbungsStatus.REJECTED
-                    self.log_to_database(
-                        "ERROR",
-                        f"Fehler beim Versenden der Bewerbung: {listing.get('titel')}",
-                        "apply",
-                        listing.get("id"),
-                    )
-                    
-                    # Fehler-E-Mail senden
-                    try:
-                        email_service.send_application_error_notification(
-                            user=self.user,
-                            bewerbung=bewerbung,
-                            error_message="Bewerbungsformular konnte nicht ausgefüllt werden"
+                    else:
+                        bewerbung.status = BewerbungsStatus.REJECTED
+                        await self.log_to_database(
+                            "ERROR",
+                            f"Fehler beim Versenden der Bewerbung: {listing.get('titel')}",
+                            "apply",
+                            listing.get("id"),
                         )
-                    except Exception as email_error:
-                        self.logger.warning(f"Fehler beim Senden der Fehler-E-Mail: {email_error}")
+                    
+                        # Fehler-E-Mail senden
+                        try:
+                            email_service.send_application_error_notification(
+                                user=self.user,
+                                bewerbung=bewerbung,
+                                error_message="Bewerbungsformular konnte nicht ausgefüllt werden"
+                            )
+                        except Exception as email_error:
+                            self.logger.warning(f"Fehler beim Senden der Fehler-E-Mail: {email_error}")
 
-                db.commit()
-                db.close()
+                    await db.commit()
 
-                self.logger.info(
-                    f"Bewerbung für User {
-                        self.user_id} verarbeitet: {
-                        listing.get('titel')} - Status: {
-                        bewerbung.status.value}"
-                )
-                return form_success
-            else:
-                db.close()
-                return False
+                    self.logger.info(
+                        f"Bewerbung für User {
+                            self.user_id} verarbeitet: {
+                            listing.get('titel')} - Status: {
+                            bewerbung.status.value}"
+                    )
+                    return form_success
+                else:
+                    return False
 
         except Exception as e:
             self.logger.error(
                 f"Fehler beim Verarbeiten der Bewerbung für User {self.user_id}: {e}"
             )
-            self.log_to_database(
+            await self.log_to_database(
                 "ERROR",
                 f"Fehler beim Verarbeiten der Bewerbung: {str(e)}",
                 "apply",
@@ -405,25 +487,21 @@ class UserBot:
             )
             return False
 
-    def log_to_database(
+    async def log_to_database(
         self, level: str, message: str, action: str, listing_id: str = None
     ):
-        """Speichert einen Log-Eintrag in der Datenbank"""
+        """Übergibt einen Log-Eintrag an den gepufferten BotLog-Sink"""
         try:
-            db = SessionLocal()
-
-            log_entry = BotLog(
-                user_id=self.user_id,
-                level=level,
-                message=message,
-                action=action,
-                listing_id=listing_id,
+            await bot_log_sink.enqueue(
+                {
+                    "user_id": self.user_id,
+                    "level": level,
+                    "message": message,
+                    "action": action,
+                    "listing_id": listing_id,
+                }
             )
 
-            db.add(log_entry)
-            db.commit()
-            db.close()
-
         except Exception as e:
             self.logger.error(
                 f"Fehler beim Speichern des Logs für User {self.user_id}: {e}"
@@ -0,0 +1,121 @@
+"""
+Admin-Übersicht der User: serverseitig gefiltert, sortiert und seitenweise
+
+Die Präfixsuche vergleicht die kleingeschriebenen Suchschlüssel
+(``email_lower`` usw., beim Schreiben gepflegt) per Bereichsabfrage
+(``>= präfix AND < nächstes präfix``) statt mit ``LIKE``. So nutzen SQLite
+und PostgreSQL deren Indizes aus ``models/user.py``, auch für das ``OR``
+über E-Mail, Vor- und Nachname.
+
+Der Bot-Status steht nicht in der Datenbank. Gefiltert wird deshalb über
+die User-IDs aus einem einzigen Snapshot des Bot-Managers; dieser enthält
+nur User, die jemals einen Bot gestartet haben, und bleibt auch bei sehr
+vielen Usern klein.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from core.pagination import cursor_key, encode_cursor, keyset_filter
+from models.user import SEARCH_KEY_COLUMNS, User, search_key
+
+# Textspalten werden wie die Suche ohne Groß-/Kleinschreibung sortiert
+SORT_COLUMNS = {
+    "id": User.id,
+    "email": User.email_lower,
+    "vorname": User.vorname_lower,
+    "nachname": User.nachname_lower,
+    "created_at": cursor_key(User.created_at),
+}
+
+SEARCH_COLUMNS = tuple(getattr(User, key) for key in SEARCH_KEY_COLUMNS.values())
+
+STOPPED = "stopped"
+
+
+@dataclass
+class UserPage:
+    rows: List[Dict[str, Any]]
+    total: int
+    next_cursor: Optional[str]
+
+
+def prefix_condition(column, prefix: str):
+    """Bedingung ``spalte LIKE 'präfix%'``, als indexierbarer Bereich"""
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return and_(column >= prefix, column < upper)
+
+
+def search_condition(q: str):
+    prefix = search_key(q.strip())
+    return or_(*(prefix_condition(column, prefix) for column in SEARCH_COLUMNS))
+
+
+def bot_status_condition(status: str, statuses: Dict[int, Dict[str, Any]]):
+    """Bedingung für einen Bot-Status anhand des Manager-Snapshots"""
+    if status == STOPPED:
+        # Auch alle User ohne Eintrag im Snapshot
+        running = [user_id for user_id, s in statuses.items() if s["status"] != STOPPED]
+        return User.id.notin_(running)
+    return User.id.in_(
+        [user_id for user_id, s in statuses.items() if s["status"] == status]
+    )
+
+
+def query_users(
+    db: Session,
+    columns: List[Any],
+    q: Optional[str] = None,
+    bot_status: Optional[str] = None,
+    statuses: Optional[Dict[int, Dict[str, Any]]] = None,
+    is_active: Optional[bool] = None,
+    is_admin: Optional[bool] = None,
+    sort: str = "id",
+    descending: bool = False,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> UserPage:
+    """
+    Eine Seite der User-Liste mit den angegebenen Spalten
+
+    ``total`` zählt alle Treffer der Filter, unabhängig von Seite und Cursor.
+    """
+    conditions = []
+    if q and q.strip():
+        conditions.append(search_condition(q))
+    if bot_status is not None:
+        conditions.append(bot_status_condition(bot_status, statuses or {}))
+    if is_active is not None:
+        conditions.append(User.is_active == is_active)
+    if is_admin is not None:
+        conditions.append(User.is_admin == is_admin)
+
+    total = db.execute(
+        select(func.count()).select_from(User).where(*conditions)
+    ).scalar_one()
+
+    sort_column = SORT_COLUMNS[sort]
+    query = select(*columns, sort_column.label("sort_key")).where(*conditions)
+    if cursor:
+        query = query.where(keyset_filter(sort_column, User.id, cursor, descending))
+    if descending:
+        query = query.order_by(sort_column.desc(), User.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), User.id.asc())
+
+    # Eine Zeile mehr laden, um zu erkennen, ob es eine weitere Seite gibt
+    rows = db.execute(query.offset(skip).limit(limit + 1)).mappings().all()
+    page = [
+        {key: row[key] for key in row.keys() if key != "sort_key"}
+        for row in rows[:limit]
+    ]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last["sort_key"], last["id"])
+    return UserPage(rows=page, total=total, next_cursor=next_cursor)
@@ -0,0 +1,74 @@
+from typing import Iterable, List
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from core.logging_config import bot_metrics, get_logger
+from core.user_cache import user_cache
+from models.archive import ArchivePartition
+from models.user import User
+from services.archive_store import archive_store
+from services.chat_unread import discount_users
+from services.immobilien_bot_manager import bot_manager
+from services.seen_listings import seen_listings
+
+logger = get_logger("user_purge")
+
+
+def _delete_users(db: Session, user_ids: List[int]) -> int:
+    # Archivdateien merken, die Index-Zeilen löscht die Datenbank per CASCADE
+    archive_paths = db.scalars(
+        select(ArchivePartition.path).where(ArchivePartition.user_id.in_(user_ids))
+    ).all()
+
+    try:
+        # Der Admin-Badge zählt auch Konversationen der gelöschten User
+        discount_users(db, user_ids)
+        result = db.execute(delete(User).where(User.id.in_(user_ids)))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    # Core-Delete umgeht die ORM-Events des Auth-Caches
+    for user_id in user_ids:
+        user_cache.invalidate(user_id)
+
+    # Dateien erst nach erfolgreichem Commit entfernen
+    for path in archive_paths:
+        archive_store.delete(path)
+
+    return result.rowcount
+
+
+async def purge_users(db: Session, user_ids: Iterable[int]) -> int:
+    """
+    Löscht User samt aller abhängigen Daten in einer Transaktion
+
+    Laufende Bots werden vorher gestoppt, damit sie keine Daten mehr für die
+    gelöschten User schreiben, und neu gestartet, falls das Löschen
+    fehlschlägt. Alle abhängigen Tabellen werden von der Datenbank per
+    ON DELETE CASCADE mitgelöscht.
+    """
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return 0
+
+    running = [user_id for user_id in user_ids if user_id in bot_manager.user_bots]
+    for user_id in user_ids:
+        await bot_manager.remove_user_bot(user_id)
+
+    try:
+        deleted = await run_in_threadpool(_delete_users, db, user_ids)
+    except Exception:
+        for user_id in running:
+            await bot_manager.start_bot(user_id)
+        raise
+
+    for user_id in user_ids:
+        seen_listings.forget_user(user_id)
+
+    bot_metrics.increment_counter("users_purged", amount=deleted)
+    logger.info(f"{deleted} User gelöscht", user_ids=user_ids)
+    return deleted
@@ -0,0 +1,72 @@
+"""Tests für den Batch-Endpunkt."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.user_cache import UserSnapshot
+from migrations.runner import run_migrations
+from models.user import User
+from routers.batch import BatchItem, run_item
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    run_migrations(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(
+        User(
+            id=1,
+            vorname="Test",
+            nachname="User",
+            email="t@example.com",
+            hashed_password="x",
+            profile_completed=True,
+            filter_einstellungen="{}",
+        )
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    return UserSnapshot.from_user(db.get(User, 1))
+
+
+def run(db, user, path):
+    return run_item(db, user, BatchItem(id="x", path=path))
+
+
+class TestBatch:
+    """Tests für run_item."""
+
+    def test_known_paths(self, db, user):
+        assert run(db, user, "/api/filter/")["body"] == {"filter_einstellungen": "{}"}
+        assert run(db, user, "/api/statistik/")["body"]["user_id"] == 1
+        assert run(db, user, "/api/bot/status")["body"]["status"] == "stopped"
+        assert run(db, user, "/api/chat/notifications/count")["body"] == {"count": 0}
+
+        result = run(db, user, "/api/statistik/dashboard?granularity=week")
+        assert result["status"] == 200
+        assert len(result["body"]["zeitreihe"]) == 12
+
+    def test_errors_are_reported_per_item(self, db, user):
+        assert run(db, user, "/api/users/")["status"] == 404
+        assert (
+            run(db, user, "/api/statistik/dashboard?granularity=year")["status"] == 422
+        )
+        assert (
+            run(db, user, "/api/statistik/dashboard?start=2026-02-01&end=2026-01-01")[
+                "status"
+            ]
+            == 400
+        )
+
+    def test_profile_required(self, db, user):
+        incomplete = UserSnapshot(**{**user.__dict__, "profile_completed": False})
+
+        assert run(db, incomplete, "/api/statistik/")["status"] == 400
+        assert run(db, incomplete, "/api/filter/")["status"] == 200
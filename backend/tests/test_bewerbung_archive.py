@@ -0,0 +1,117 @@
+"""Tests für das Archiv alter Bewerbungen."""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from migrations.runner import run_migrations
+from models.bewerbung import Bewerbung, BewerbungsStatus
+from models.nachricht import Nachricht
+from models.statistik import Statistik
+from models.user import User
+from services.archive_store import ArchiveStore
+from services.bewerbung_archive import BewerbungArchive
+from services.statistik_service import reconcile_statistiken
+
+NOW = datetime(2026, 3, 20, 12, 0)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    run_migrations(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(
+        User(
+            id=1,
+            vorname="Test",
+            nachname="User",
+            email="t@example.com",
+            hashed_password="x",
+        )
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return BewerbungArchive(ArchiveStore(str(tmp_path / "archive")), max_age_days=365)
+
+
+def add_bewerbung(db, at, status=BewerbungsStatus.SENT, nachricht=None):
+    bewerbung = Bewerbung(
+        user_id=1,
+        wohnungsname="Wohnung",
+        adresse="Straße 1",
+        status=status,
+        bewerbungsdatum=at,
+    )
+    db.add(bewerbung)
+    db.flush()
+    if nachricht:
+        db.add(
+            Nachricht(
+                user_id=1,
+                bewerbung_id=bewerbung.id,
+                absender="Vermieter",
+                text=nachricht,
+            )
+        )
+    db.commit()
+    return bewerbung
+
+
+def statistik(db):
+    row = db.scalar(select(Statistik).where(Statistik.user_id == 1))
+    db.refresh(row)
+    return row.anzahl_verschickter_bewerbungen, row.erfolgreiche_bewerbungen
+
+
+class TestBewerbungArchive:
+    """Tests für BewerbungArchive."""
+
+    def test_only_whole_old_months_are_pending(self, db, archive):
+        add_bewerbung(db, datetime(2025, 1, 10))
+        add_bewerbung(db, datetime(2025, 3, 25))  # Monat ragt ins Fenster
+        add_bewerbung(db, datetime(2026, 3, 1))
+
+        assert archive.cutoff(NOW) == datetime(2025, 3, 1)
+        assert archive.pending(db, NOW) == [(1, date(2025, 1, 1))]
+
+    def test_archive_moves_rows_and_keeps_totals(self, db, archive):
+        add_bewerbung(db, datetime(2025, 1, 10), nachricht="Einladung")
+        add_bewerbung(db, datetime(2025, 1, 20), status=BewerbungsStatus.RESPONDED)
+        add_bewerbung(db, datetime(2026, 3, 1))
+        before = statistik(db)
+
+        for user_id, month in archive.pending(db, NOW):
+            assert archive.archive_month(db, user_id, month) == 2
+
+        assert db.scalar(select(func.count(Bewerbung.id))) == 1
+        assert db.scalar(select(func.count(Nachricht.id))) == 0
+        assert statistik(db) == before == (3, 1)
+
+        reconcile_statistiken(db, now=NOW)
+        assert statistik(db) == (3, 1)
+
+    def test_history_reads_back_newest_first(self, db, archive):
+        add_bewerbung(db, datetime(2025, 1, 10), nachricht="Einladung")
+        add_bewerbung(db, datetime(2025, 2, 5))
+        add_bewerbung(db, datetime(2025, 2, 15))
+        for user_id, month in archive.pending(db, NOW):
+            archive.archive_month(db, user_id, month)
+
+        history = archive.read_user_history(db, 1)
+        assert [entry["bewerbungsdatum"][:10] for entry in history] == [
+            "2025-02-15",
+            "2025-02-05",
+            "2025-01-10",
+        ]
+        assert history[2]["nachrichten"][0]["text"] == "Einladung"
+
+        page = archive.read_user_history(db, 1, skip=2, limit=5)
+        assert [entry["bewerbungsdatum"][:10] for entry in page] == ["2025-01-10"]
@@ -0,0 +1,80 @@
+"""Tests für den gepufferten BotLog-Sink."""
+
+import asyncio
+
+from services.bot_log_sink import BotLogSink, OverflowPolicy
+
+
+class RecordingSink(BotLogSink):
+    """Sink, der Batches sammelt statt in die Datenbank zu schreiben."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+
+    async def _write(self, rows):
+        self.batches.append(rows)
+
+
+def make_entry(i):
+    return {"user_id": 1, "level": "INFO", "message": f"log {i}", "action": "test"}
+
+
+class TestBotLogSink:
+    """Tests für BotLogSink."""
+
+    def test_flushes_in_batches_and_drains_on_stop(self):
+        sink = RecordingSink(batch_size=10, flush_interval_ms=50)
+
+        async def scenario():
+            await sink.start()
+            for i in range(25):
+                await sink.enqueue(make_entry(i))
+            await sink.stop()
+
+        asyncio.run(scenario())
+
+        assert [len(batch) for batch in sink.batches] == [10, 10, 5]
+        assert all("timestamp" in row for batch in sink.batches for row in batch)
+
+    def test_drop_oldest_keeps_newest_entries(self):
+        sink = RecordingSink(
+            max_queue_size=3, overflow_policy=OverflowPolicy.DROP_OLDEST
+        )
+
+        async def scenario():
+            await sink.start()
+            # Ohne await dazwischen kommt der Flush-Task nicht zum Zug
+            for i in range(5):
+                await sink.enqueue(make_entry(i))
+            await sink.stop()
+
+        asyncio.run(scenario())
+
+        messages = [row["message"] for batch in sink.batches for row in batch]
+        assert messages == ["log 2", "log 3", "log 4"]
+        assert sink.stats["dropped"] == 2
+
+    def test_drop_newest_keeps_oldest_entries(self):
+        sink = RecordingSink(
+            max_queue_size=3, overflow_policy=OverflowPolicy.DROP_NEWEST
+        )
+
+        async def scenario():
+            await sink.start()
+            for i in range(5):
+                await sink.enqueue(make_entry(i))
+            await sink.stop()
+
+        asyncio.run(scenario())
+
+        messages = [row["message"] for batch in sink.batches for row in batch]
+        assert messages == ["log 0", "log 1", "log 2"]
+        assert sink.stats["dropped"] == 2
+
+    def test_writes_directly_when_not_started(self):
+        sink = RecordingSink()
+
+        asyncio.run(sink.enqueue(make_entry(0)))
+
+        assert len(sink.batches) == 1
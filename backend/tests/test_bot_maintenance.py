@@ -0,0 +1,176 @@
+"""Tests für die Wartungsaufgaben."""
+
+import asyncio
+import threading
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.database import db_now
+from migrations.runner import run_migrations
+from models.bot_status import BotLog
+from models.user import User
+from services import bot_maintenance
+from services.bot_maintenance import maintenance_service
+
+
+@pytest.fixture
+def session_threads(tmp_path, monkeypatch):
+    """Threads, in denen die Wartung Sessions öffnet"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    run_migrations(engine)
+    SessionFactory = sessionmaker(bind=engine)
+    threads = []
+
+    def session():
+        threads.append(threading.get_ident())
+        return SessionFactory()
+
+    monkeypatch.setattr(bot_maintenance, "SessionLocal", session)
+    return threads
+
+
+@pytest.fixture
+def log_db(tmp_path, monkeypatch):
+    """Datenbank für den Log-Cleanup, die Wartung nutzt dieselbe Engine"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    run_migrations(engine)
+    SessionFactory = sessionmaker(bind=engine)
+    monkeypatch.setattr(bot_maintenance, "SessionLocal", SessionFactory)
+    monkeypatch.setattr(bot_maintenance, "LOG_RETENTION_DAYS_BY_LEVEL", {"ERROR": 90})
+    session = SessionFactory()
+    session.add(
+        User(id=1, vorname="T", nachname="U", email="t@x.de", hashed_password="x")
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def add_logs(db, level, days_old, count):
+    timestamp = db_now() - timedelta(days=days_old)
+    db.add_all(
+        BotLog(user_id=1, level=level, message="x", timestamp=timestamp)
+        for _ in range(count)
+    )
+    db.commit()
+
+
+def remaining(db):
+    return sorted(
+        (level, round((db_now() - timestamp).total_seconds() / 86400))
+        for level, timestamp in db.query(BotLog.level, BotLog.timestamp)
+    )
+
+
+def record_cleanup(monkeypatch):
+    """Zeichnet Blockgrößen und Pausen des Log-Cleanups auf"""
+    chunks, pauses = [], []
+    delete_chunk = bot_maintenance.BotMaintenanceService._delete_log_chunk
+    sleep = asyncio.sleep
+
+    def recording_delete(self, db, condition, chunk_size):
+        deleted = delete_chunk(self, db, condition, chunk_size)
+        chunks.append(deleted)
+        return deleted
+
+    async def recording_sleep(seconds):
+        pauses.append(seconds)
+        await sleep(seconds)
+
+    monkeypatch.setattr(
+        bot_maintenance.BotMaintenanceService, "_delete_log_chunk", recording_delete
+    )
+    monkeypatch.setattr(bot_maintenance.asyncio, "sleep", recording_sleep)
+    return chunks, pauses
+
+
+def run_on_loop(coro_func):
+    async def main():
+        return threading.get_ident(), await coro_func()
+
+    return asyncio.run(main())
+
+
+class TestMaintenanceOffLoop:
+    """Datenbankarbeit der Wartung läuft nicht im Event-Loop."""
+
+    def test_all_tasks_use_worker_threads(self, session_threads):
+        loop_thread, _ = run_on_loop(maintenance_service.run_maintenance_tasks)
+
+        assert session_threads
+        assert loop_thread not in session_threads
+
+    def test_report_queries_in_worker_thread(self, session_threads):
+        loop_thread, report = run_on_loop(maintenance_service.get_maintenance_report)
+
+        assert "error" not in report
+        assert report["log_statistics"] == {}
+        assert session_threads and loop_thread not in session_threads
+
+    def test_unread_counters_rebuilt_once_per_interval(self, session_threads):
+        service = bot_maintenance.BotMaintenanceService()
+        rebuilds = []
+        service._rebuild_unread_counters = rebuilds.append
+
+        asyncio.run(service.run_maintenance_tasks())
+        asyncio.run(service.run_maintenance_tasks())
+        assert len(rebuilds) == 1
+
+        service.unread_counters_rebuilt_at -= (
+            bot_maintenance.UNREAD_COUNTER_RECONCILE_HOURS * 3600
+        )
+        asyncio.run(service.run_maintenance_tasks())
+        assert len(rebuilds) == 2
+
+
+class TestLogCleanup:
+    """Löschen alter Logs in Blöcken mit Pausen und Zeitbudget."""
+
+    def test_deletes_in_chunks_with_pauses(self, log_db, monkeypatch):
+        chunks, pauses = record_cleanup(monkeypatch)
+        add_logs(log_db, "INFO", 40, 5)
+
+        asyncio.run(
+            maintenance_service.cleanup_old_logs(
+                days_to_keep=30, chunk_size=2, pause_seconds=0.01
+            )
+        )
+
+        # Volle Blöcke, dann ein Rest; pausiert wird nur nach vollen Blöcken
+        assert [c for c in chunks if c] == [2, 2, 1]
+        assert pauses == [0.01, 0.01]
+        assert remaining(log_db) == []
+
+    def test_max_seconds_stops_early(self, log_db, monkeypatch):
+        chunks, pauses = record_cleanup(monkeypatch)
+        add_logs(log_db, "INFO", 40, 5)
+
+        asyncio.run(
+            maintenance_service.cleanup_old_logs(
+                days_to_keep=30, chunk_size=2, pause_seconds=0.1, max_seconds=0.05
+            )
+        )
+
+        # Nach dem ersten Block und seiner Pause ist das Budget aufgebraucht
+        assert [c for c in chunks if c] == [2]
+        assert pauses == [0.1]
+        assert len(remaining(log_db)) == 3
+
+    def test_cutoff_per_level(self, log_db):
+        for level in ("ERROR", "INFO", "DEBUG"):
+            add_logs(log_db, level, 100, 1)
+            add_logs(log_db, level, 40, 1)
+            add_logs(log_db, level, 10, 1)
+
+        asyncio.run(maintenance_service.cleanup_old_logs(days_to_keep=30))
+
+        # ERROR 90 Tage, alle übrigen Level die Standard-Aufbewahrung
+        assert remaining(log_db) == [
+            ("DEBUG", 10),
+            ("ERROR", 10),
+            ("ERROR", 40),
+            ("INFO", 10),
+        ]
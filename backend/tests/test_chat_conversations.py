@@ -0,0 +1,166 @@
+"""Tests für die Konversationslisten aus den denormalisierten Spalten."""
+
+import pytest
+from fastapi import Response
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.orm import sessionmaker
+
+from migrations.runner import MIGRATIONS, run_migrations
+from models.chat import ChatConversation, ChatMessage, MessageType
+from models.user import User
+from routers.chat import (
+    get_all_conversations,
+    get_user_conversations,
+    record_new_message,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    run_migrations(engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    session.add(
+        User(id=1, vorname="Test", nachname="User", email="t@x.de", hashed_password="x")
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def add_conversations(db, numbers):
+    """Gerade Nummern gehören User 1, ungerade je einem eigenen User"""
+    for n in numbers:
+        owner = 1 if n % 2 == 0 else 100 + n
+        if owner != 1:
+            db.add(
+                User(
+                    id=owner,
+                    vorname="Other",
+                    nachname=str(n),
+                    email=f"u{n}@x.de",
+                    hashed_password="x",
+                )
+            )
+        db.add(ChatConversation(id=f"c{n}", user_id=owner))
+        for sender_type in (MessageType.USER, MessageType.USER, MessageType.ADMIN):
+            message = ChatMessage(
+                conversation_id=f"c{n}",
+                user_id=owner,
+                sender_type=sender_type,
+                sender_name="Test",
+                message=f"Nachricht {n}",
+            )
+            db.add(message)
+            record_new_message(db, f"c{n}", message)
+    db.commit()
+    db.expire_all()
+
+
+def count_queries(db, func):
+    statements = []
+
+    def before_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", before_execute)
+    try:
+        result = func()
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", before_execute)
+    return result, len(statements)
+
+
+def admin_list(db):
+    return get_all_conversations(
+        response=Response(),
+        status=None,
+        priority=None,
+        skip=0,
+        limit=50,
+        cursor=None,
+        db=db,
+        current_admin=None,
+    )
+
+
+class TestConversationLists:
+    """Listen lesen Vorschau und Zähler ohne Abfrage pro Konversation."""
+
+    def test_constant_query_count(self, db):
+        user = db.get(User, 1)
+        add_conversations(db, range(2))
+        _, admin_few = count_queries(db, lambda: admin_list(db))
+        _, user_few = count_queries(db, lambda: get_user_conversations(db, user))
+
+        add_conversations(db, range(2, 8))
+        entries, admin_many = count_queries(db, lambda: admin_list(db))
+        _, user_many = count_queries(db, lambda: get_user_conversations(db, user))
+
+        assert len(entries) == 8
+        assert {e.user_name for e in entries} >= {"Test User", "Other 7"}
+        assert (admin_many, user_many) == (admin_few, user_few)
+        assert {(e.last_message, e.unread_count) for e in entries} == {
+            (f"Nachricht {n}", 2) for n in range(8)
+        }
+
+
+class TestSummaryMigration:
+    """Tests für Migration 10 (Vorschau und Zähler aus vorhandenen Nachrichten)."""
+
+    def test_backfills_existing_conversations(self, engine, db):
+        db.add_all(
+            [
+                ChatConversation(id="old", user_id=1),
+                ChatConversation(id="empty", user_id=1),
+                ChatMessage(
+                    conversation_id="old",
+                    user_id=1,
+                    sender_type=MessageType.USER,
+                    sender_name="Test",
+                    message="Erste Frage",
+                    is_read=True,
+                ),
+                ChatMessage(
+                    conversation_id="old",
+                    user_id=1,
+                    sender_type=MessageType.ADMIN,
+                    sender_name="Support",
+                    message="Antwort",
+                    is_read=False,
+                ),
+                ChatMessage(
+                    conversation_id="old",
+                    user_id=1,
+                    sender_type=MessageType.USER,
+                    sender_name="Test",
+                    message="x" * 80,
+                    is_read=False,
+                ),
+            ]
+        )
+        db.commit()
+        # Stand vor Migration 10: nur Nachrichten mit is_read
+        db.execute(
+            update(ChatConversation).values(
+                last_message_preview=None, user_unread_count=0, admin_unread_count=0
+            )
+        )
+        db.commit()
+
+        step = next(m for m in MIGRATIONS if m.version == 10)
+        with engine.begin() as conn:
+            step.upgrade(conn)
+
+        db.expire_all()
+        old = db.get(ChatConversation, "old")
+        assert old.last_message_preview == "x" * 50 + "..."
+        assert (old.user_unread_count, old.admin_unread_count) == (1, 1)
+        empty = db.get(ChatConversation, "empty")
+        assert empty.last_message_preview is None
+        assert (empty.user_unread_count, empty.admin_unread_count) == (0, 0)
@@ -0,0 +1,237 @@
+"""Tests für Lesezeiger und Badge-Zähler des Chats."""
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from migrations.runner import MIGRATIONS, run_migrations
+from models.chat import ChatConversation, ChatMessage, MessageType
+from models.user import User
+from routers.chat import (
+    mark_conversation_read,
+    message_response,
+    record_new_message,
+    unread_badge,
+)
+from services.chat_unread import (
+    ADMIN_SCOPE,
+    get_counts,
+    rebuild_unread_counters,
+    user_scope,
+)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    run_migrations(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(
+        User(
+            id=1,
+            vorname="Test",
+            nachname="User",
+            email="t@example.com",
+            hashed_password="x",
+        )
+    )
+    session.add(ChatConversation(id="c1", user_id=1))
+    session.commit()
+    yield session
+    session.close()
+
+
+def send(db, sender_type, text="Hallo"):
+    message = ChatMessage(
+        conversation_id="c1",
+        user_id=1,
+        sender_type=sender_type,
+        sender_name="Test",
+        message=text,
+    )
+    db.add(message)
+    record_new_message(db, "c1", message)
+    db.commit()
+    return message
+
+
+class TestChatUnread:
+    """Tests für die beim Schreiben gepflegten Zähler."""
+
+    def test_messages_update_conversation_and_badges(self, db):
+        send(db, MessageType.USER)
+        send(db, MessageType.USER, "x" * 80)
+        send(db, MessageType.ADMIN)
+
+        conversation = db.get(ChatConversation, "c1")
+        db.refresh(conversation)
+        assert conversation.admin_unread_count == 2
+        assert conversation.user_unread_count == 1
+        assert conversation.last_message_preview == "Hallo"
+        assert get_counts(db, ADMIN_SCOPE) == (2, 1)
+        assert unread_badge(db, user_scope(1)) == {"count": 1}
+
+    def test_read_cursor_marks_only_older_messages(self, db):
+        first = send(db, MessageType.USER)
+        conversation = db.get(ChatConversation, "c1")
+        db.refresh(conversation)
+
+        mark_conversation_read(db, conversation, MessageType.ADMIN)
+        db.commit()
+        second = send(db, MessageType.USER)
+        db.refresh(conversation)
+
+        assert conversation.is_read(first)
+        assert not conversation.is_read(second)
+        assert conversation.admin_unread_count == 1
+        assert get_counts(db, ADMIN_SCOPE) == (1, 1)
+
+    def test_rebuild_matches_incremental_counts(self, db):
+        send(db, MessageType.USER)
+        send(db, MessageType.ADMIN)
+        incremental = (get_counts(db, ADMIN_SCOPE), get_counts(db, user_scope(1)))
+
+        rebuild_unread_counters(db)
+        db.commit()
+
+        assert (get_counts(db, ADMIN_SCOPE), get_counts(db, user_scope(1))) == (
+            incremental
+        )
+
+    def test_message_between_load_and_mark_read_stays_unread(self, db):
+        send(db, MessageType.USER)
+        send(db, MessageType.USER)
+        conversation = db.get(ChatConversation, "c1")
+        db.refresh(conversation)
+
+        # Eine andere Anfrage speichert zwischen Laden und Lesen eine Nachricht
+        other = sessionmaker(bind=db.get_bind())()
+        third = send(other, MessageType.USER).id
+        other.close()
+
+        mark_conversation_read(db, conversation, MessageType.ADMIN)
+        db.commit()
+        db.refresh(conversation)
+
+        assert conversation.admin_unread_count == 1
+        assert conversation.admin_last_read_message_id < third
+        assert get_counts(db, ADMIN_SCOPE) == (1, 1)
+
+        rebuild_unread_counters(db)
+        db.commit()
+        assert get_counts(db, ADMIN_SCOPE) == (1, 1)
+
+    def test_concurrent_mark_read_subtracts_once(self, db):
+        send(db, MessageType.USER)
+        send(db, MessageType.USER)
+        other = sessionmaker(bind=db.get_bind())()
+        first = db.get(ChatConversation, "c1")
+        second = other.get(ChatConversation, "c1")
+        db.refresh(first)
+
+        mark_conversation_read(db, first, MessageType.ADMIN)
+        db.commit()
+        mark_conversation_read(other, second, MessageType.ADMIN)
+        other.commit()
+        other.close()
+
+        db.refresh(first)
+        assert first.admin_unread_count == 0
+        assert get_counts(db, ADMIN_SCOPE) == (0, 0)
+
+    def test_cursor_advances_to_newest_message(self, db):
+        send(db, MessageType.ADMIN)
+        last = send(db, MessageType.ADMIN)
+        conversation = db.get(ChatConversation, "c1")
+        db.refresh(conversation)
+        assert conversation.user_unread_count == 2
+
+        mark_conversation_read(db, conversation, MessageType.USER)
+        db.commit()
+        db.refresh(conversation)
+
+        assert conversation.user_last_read_message_id == last.id
+        assert conversation.user_unread_count == 0
+        assert message_response(last, conversation).is_read
+        assert unread_badge(db, user_scope(1)) == {"count": 0}
+
+    def test_stale_request_does_not_move_cursor_back(self, db):
+        send(db, MessageType.USER)
+        stale = db.get(ChatConversation, "c1")
+        db.refresh(stale)
+
+        # Eine andere Anfrage liest die neuere Nachricht zuerst
+        other = sessionmaker(bind=db.get_bind())()
+        newer = send(other, MessageType.USER).id
+        fresh = other.get(ChatConversation, "c1")
+        mark_conversation_read(other, fresh, MessageType.ADMIN)
+        other.commit()
+        other.close()
+
+        mark_conversation_read(db, stale, MessageType.ADMIN)
+        db.commit()
+        db.refresh(stale)
+
+        assert stale.admin_last_read_message_id == newer
+        assert stale.admin_unread_count == 0
+        assert get_counts(db, ADMIN_SCOPE) == (0, 0)
+
+
+class TestReadCursorMigration:
+    """Tests für Migration 11 (Lesezeiger aus is_read)."""
+
+    def test_cursor_and_counts_from_is_read(self, db):
+        messages = [
+            (MessageType.USER, True),
+            (MessageType.ADMIN, True),
+            (MessageType.USER, False),
+            (MessageType.ADMIN, False),
+            (MessageType.USER, False),
+        ]
+        rows = [
+            ChatMessage(
+                conversation_id="c1",
+                user_id=1,
+                sender_type=sender_type,
+                sender_name="Test",
+                message="Hallo",
+                is_read=is_read,
+            )
+            for sender_type, is_read in messages
+        ]
+        db.add_all(rows)
+        db.commit()
+        # Stand vor Migration 11: weder Zeiger noch Zähler
+        db.execute(
+            update(ChatConversation).values(
+                last_message_id=None,
+                user_last_read_message_id=None,
+                admin_last_read_message_id=None,
+                user_unread_count=0,
+                admin_unread_count=0,
+            )
+        )
+        db.commit()
+
+        step = next(m for m in MIGRATIONS if m.version == 11)
+        with db.get_bind().begin() as conn:
+            step.upgrade(conn)
+
+        conversation = db.get(ChatConversation, "c1")
+        db.refresh(conversation)
+        ids = [row.id for row in rows]
+        assert conversation.last_message_id == ids[-1]
+        # Zeiger direkt vor der ältesten ungelesenen Nachricht der Gegenseite
+        assert conversation.admin_last_read_message_id == ids[2] - 1
+        assert conversation.user_last_read_message_id == ids[3] - 1
+        assert (conversation.admin_unread_count, conversation.user_unread_count) == (
+            2,
+            1,
+        )
+        assert [conversation.is_read(row) for row in rows] == [
+            True,
+            True,
+            False,
+            False,
+            False,
+        ]
@@ -0,0 +1,136 @@
+"""Tests für Engine-Erzeugung, Migrationen und Upserts je Dialekt.
+
+Der PostgreSQL-Lauf wird nur ausgeführt, wenn TEST_DATABASE_URL gesetzt ist,
+z.B. ``TEST_DATABASE_URL=postgresql+psycopg2://postgres@localhost/wohnblitzer_test``.
+Er lief bisher nicht in CI; PostgreSQL gilt deshalb als experimentell
+(siehe database/database.py).
+"""
+
+import os
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from database.database import create_db_engine, db_now, upsert
+from migrations.runner import MIGRATIONS, run_migrations
+from models.statistik import Statistik
+
+POSTGRES_URL = os.getenv("TEST_DATABASE_URL")
+
+
+@pytest.fixture(
+    params=[
+        "sqlite",
+        pytest.param(
+            "postgresql",
+            marks=[
+                pytest.mark.integration,
+                pytest.mark.skipif(
+                    not POSTGRES_URL, reason="TEST_DATABASE_URL nicht gesetzt"
+                ),
+            ],
+        ),
+    ]
+)
+def engine(request, tmp_path):
+    if request.param == "sqlite":
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    else:
+        engine = create_db_engine(POSTGRES_URL)
+        with engine.begin() as conn:
+            conn.execute(text("DROP SCHEMA public CASCADE"))
+            conn.execute(text("CREATE SCHEMA public"))
+    yield engine
+    engine.dispose()
+
+
+class TestDatabaseBackends:
+    """Tests, die gegen jede konfigurierte Datenbank laufen."""
+
+    def test_migrations(self, engine):
+        assert run_migrations(engine) == max(m.version for m in MIGRATIONS)
+
+    def test_upsert_inserts_and_updates(self, engine):
+        run_migrations(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO users (id, vorname, nachname, email, hashed_password) "
+                    "VALUES (1, 'Max', 'Muster', 'max@example.org', 'x')"
+                )
+            )
+
+        db = sessionmaker(bind=engine)()
+        for value in (1, 5):
+            upsert(
+                db,
+                Statistik,
+                {"user_id": 1, "erfolgreiche_bewerbungen": value},
+                ["user_id"],
+                set_={"erfolgreiche_bewerbungen": value},
+            )
+        db.commit()
+
+        rows = db.query(Statistik).filter(Statistik.user_id == 1).all()
+        assert [row.erfolgreiche_bewerbungen for row in rows] == [5]
+        db.close()
+
+    def test_db_now_matches_column_defaults(self, engine, monkeypatch):
+        # Lokale Zeit weit weg von UTC, damit gemischte Uhren auffallen
+        monkeypatch.setenv("TZ", "Asia/Tokyo")
+        time.tzset()
+        try:
+            run_migrations(engine)
+            with engine.begin() as conn:
+                conn.execute(
+                    text(
+                        "INSERT INTO users (id, vorname, nachname, email, hashed_password) "
+                        "VALUES (1, 'Max', 'Muster', 'max@example.org', 'x')"
+                    )
+                )
+                conn.execute(
+                    text(
+                        "INSERT INTO bot_logs (user_id, level, message) "
+                        "VALUES (1, 'INFO', 'log')"
+                    )
+                )
+
+            with engine.connect() as conn:
+                recent = conn.execute(
+                    text("SELECT COUNT(*) FROM bot_logs WHERE timestamp >= :cutoff"),
+                    {"cutoff": db_now() - timedelta(minutes=1)},
+                ).scalar_one()
+            assert recent == 1
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+
+    def test_deleting_user_cascades(self, engine):
+        run_migrations(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO users (id, vorname, nachname, email, hashed_password) "
+                    "VALUES (1, 'Max', 'Muster', 'max@example.org', 'x')"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO bot_logs (user_id, level, message) "
+                    "VALUES (1, 'INFO', 'log')"
+                )
+            )
+            conn.execute(
+                text("INSERT INTO chat_conversations (id, user_id) VALUES ('c1', 1)")
+            )
+
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM users WHERE id = 1"))
+
+        with engine.connect() as conn:
+            for table in ("bot_logs", "chat_conversations"):
+                count = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+                assert count == 0, table
@@ -0,0 +1,112 @@
+"""Tests für ETags aus Versionszählern."""
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import core.etag
+from core.etag import ResourceVersions, bump_after_commit, check_etag, resource_versions
+from migrations.runner import run_migrations
+from services.immobilien_bot_manager import BotMetrics, BotStatus, ImmobilienBotManager
+
+app = FastAPI()
+calls = []
+
+
+@app.get("/status")
+def status(request: Request, response: Response):
+    not_modified = check_etag(request, response, "test", 1)
+    if not_modified is not None:
+        return not_modified
+    calls.append(1)
+    return {"ok": True}
+
+
+@app.get("/cached/{value}")
+def cached(value: str, request: Request, response: Response):
+    # Wie routers/filter: Daten aus dem Cache des Workers
+    not_modified = check_etag(request, response, "test", 3, served={"v": value})
+    if not_modified is not None:
+        return not_modified
+    return {"v": value}
+
+
+class TestEtag:
+    """Tests für check_etag und die Versionszähler."""
+
+    def test_not_modified_until_bump(self):
+        client = TestClient(app)
+        calls.clear()
+
+        first = client.get("/status")
+        etag = first.headers["ETag"]
+        second = client.get("/status", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+        assert len(calls) == 1
+
+        resource_versions.bump("test", 1)
+        third = client.get("/status", headers={"If-None-Match": f"W/{etag}"})
+        assert third.status_code == 200
+        assert third.headers["ETag"] != etag
+
+    def test_resource_bump_and_epoch(self):
+        versions = ResourceVersions()
+        before = versions.etag("statistik", 1)
+        versions.bump("statistik")
+
+        assert versions.etag("statistik", 1) != before
+        assert ResourceVersions().etag("statistik", 1) != versions.etag("statistik", 1)
+
+    def test_bump_waits_for_commit(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+        run_migrations(engine)
+        session = sessionmaker(bind=engine)()
+        before = resource_versions.etag("test", 2)
+
+        bump_after_commit(session, "test", 2)
+        assert resource_versions.etag("test", 2) == before
+
+        session.commit()
+        assert resource_versions.etag("test", 2) != before
+        session.close()
+
+    def test_multiple_workers_without_redis_send_no_etag(self, monkeypatch):
+        monkeypatch.setattr(core.etag, "WEB_CONCURRENCY", 4)
+        monkeypatch.setattr(
+            core.etag, "resource_versions", core.etag.create_resource_versions()
+        )
+        assert isinstance(core.etag.resource_versions, core.etag.DisabledVersions)
+
+        client = TestClient(app)
+        calls.clear()
+        first = client.get("/status")
+        second = client.get("/status", headers={"If-None-Match": "*"})
+
+        assert "ETag" not in first.headers
+        assert second.status_code == 200
+        assert len(calls) == 2
+
+    def test_served_data_is_part_of_etag(self):
+        client = TestClient(app)
+        fresh = client.get("/cached/neu").headers["ETag"]
+
+        # Gleiche Version, aber ein Worker mit älterem Cache-Stand
+        stale = client.get("/cached/alt", headers={"If-None-Match": fresh})
+        assert stale.status_code == 200
+        assert stale.headers["ETag"] != fresh
+
+        again = client.get("/cached/neu", headers={"If-None-Match": fresh})
+        assert again.status_code == 304
+
+    def test_bot_progress_keeps_etag(self):
+        manager = ImmobilienBotManager()
+        manager.bot_metrics[5] = BotMetrics(user_id=5, status=BotStatus.RUNNING)
+        before = resource_versions.etag("bot_status", 5)
+
+        manager.update_metrics(5, current_action="Suche läuft...")
+        assert resource_versions.etag("bot_status", 5) == before
+
+        manager.update_metrics(5, current_action="Bewerbung", applications_sent=1)
+        assert resource_versions.etag("bot_status", 5) != before
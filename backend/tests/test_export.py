@@ -0,0 +1,179 @@
+"""Tests für die Streaming-Exporte."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.auth import get_current_admin_user
+from database.database import db_now
+from migrations.runner import run_migrations
+from models.bewerbung import Bewerbung, BewerbungsStatus
+from models.bot_status import BotLog
+from models.user import User
+from routers import export
+from routers.export import ExportFormat, encode_rows
+from services.archive_store import ArchiveStore
+from services.bewerbung_archive import BewerbungArchive
+from services.log_archive import BotLogArchive
+
+ROWS = [
+    {"id": 1, "status": BewerbungsStatus.SENT, "datum": datetime(2026, 3, 1, 12)},
+    {"id": 2, "status": BewerbungsStatus.PENDING, "datum": None},
+]
+COLUMNS = ["id", "status", "datum"]
+
+
+class TestEncodeRows:
+    """Tests für encode_rows."""
+
+    def test_ndjson(self):
+        lines = "".join(encode_rows(ROWS, COLUMNS, ExportFormat.NDJSON)).splitlines()
+
+        assert [json.loads(line) for line in lines] == [
+            {"id": 1, "status": "sent", "datum": "2026-03-01T12:00:00"},
+            {"id": 2, "status": "pending", "datum": None},
+        ]
+
+    def test_csv_with_header(self):
+        text = "".join(encode_rows(ROWS, COLUMNS, ExportFormat.CSV))
+
+        assert text.splitlines() == [
+            "id,status,datum",
+            "1,sent,2026-03-01T12:00:00",
+            "2,pending,",
+        ]
+
+    def test_yields_bounded_chunks(self, monkeypatch):
+        monkeypatch.setattr(export, "EXPORT_CHUNK_BYTES", 100)
+        rows = ({"id": i, "status": "x", "datum": None} for i in range(1000))
+
+        chunks = list(encode_rows(rows, COLUMNS, ExportFormat.NDJSON))
+
+        assert len(chunks) > 100
+        assert max(len(chunk) for chunk in chunks) < 200
+
+
+class Admin:
+    id = 1
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    run_migrations(engine)
+    SessionFactory = sessionmaker(bind=engine)
+    store = ArchiveStore(str(tmp_path / "archive"))
+    log_archive = BotLogArchive(store=store, hot_days=7)
+    bewerbung_archive = BewerbungArchive(store, max_age_days=365)
+    now = db_now()
+
+    with SessionFactory() as db:
+        db.add(
+            User(
+                id=1,
+                vorname="Test",
+                nachname="User",
+                email="t@example.com",
+                hashed_password="x",
+            )
+        )
+        for days_ago, level in ((1, "INFO"), (3, "ERROR"), (10, "INFO"), (20, "ERROR")):
+            db.add(
+                BotLog(
+                    user_id=1,
+                    level=level,
+                    message=f"tag {days_ago}",
+                    action="test",
+                    timestamp=now - timedelta(days=days_ago),
+                )
+            )
+        for days_ago in (10, 500):
+            db.add(
+                Bewerbung(
+                    user_id=1,
+                    wohnungsname=f"Wohnung {days_ago}",
+                    adresse="Straße 1",
+                    status=BewerbungsStatus.SENT,
+                    bewerbungsdatum=now - timedelta(days=days_ago),
+                )
+            )
+        db.commit()
+
+        for day in log_archive.pending_days(db):
+            log_archive.archive_day(db, day)
+        for user_id, month in bewerbung_archive.pending(db):
+            bewerbung_archive.archive_month(db, user_id, month)
+
+    monkeypatch.setattr(export, "SessionLocal", SessionFactory)
+    monkeypatch.setattr(export, "bot_log_archive", log_archive)
+    monkeypatch.setattr(export, "bewerbung_archive", bewerbung_archive)
+
+    app = FastAPI()
+    app.include_router(export.router)
+    app.dependency_overrides[get_current_admin_user] = lambda: Admin()
+    return TestClient(app)
+
+
+def ndjson(response):
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+class TestExportEndpoints:
+    """Tests für /api/export/logs und /api/export/bewerbungen."""
+
+    def test_logs_merge_archive_and_table_oldest_first(self, client):
+        rows = ndjson(client.get("/api/export/logs"))
+
+        assert [row["message"] for row in rows] == [
+            "tag 20",
+            "tag 10",
+            "tag 3",
+            "tag 1",
+        ]
+
+    def test_logs_filter_by_level_and_range(self, client):
+        start = (db_now() - timedelta(days=15)).isoformat()
+        rows = ndjson(client.get("/api/export/logs", params={"start": start}))
+        assert [row["message"] for row in rows] == ["tag 10", "tag 3", "tag 1"]
+
+        rows = ndjson(client.get("/api/export/logs", params={"level": "ERROR"}))
+        assert [row["message"] for row in rows] == ["tag 20", "tag 3"]
+        rows = ndjson(client.get("/api/export/logs", params={"level": "error"}))
+        assert [row["message"] for row in rows] == ["tag 20", "tag 3"]
+
+        rows = ndjson(client.get("/api/export/logs", params={"include_archive": False}))
+        assert [row["message"] for row in rows] == ["tag 3", "tag 1"]
+
+    def test_bewerbungen_merge_archive_and_table(self, client):
+        rows = ndjson(client.get("/api/export/bewerbungen"))
+
+        assert [row["wohnungsname"] for row in rows] == ["Wohnung 500", "Wohnung 10"]
+
+    @pytest.mark.parametrize("path", ["/api/export/logs", "/api/export/bewerbungen"])
+    def test_start_with_offset_is_converted(self, client, path):
+        start = datetime(2000, 1, 1, tzinfo=timezone.utc).isoformat()
+        end = (
+            datetime.now(timezone(timedelta(hours=2))) + timedelta(days=1)
+        ).isoformat()
+
+        everything = ndjson(client.get(path))
+        assert (
+            ndjson(client.get(path, params={"start": start, "end": end})) == everything
+        )
+
+    def test_start_after_end_is_rejected(self, client):
+        response = client.get(
+            "/api/export/logs",
+            params={
+                "start": "2026-02-01T00:00:00Z",
+                "end": "2026-01-01T00:00:00+02:00",
+            },
+        )
+
+        assert response.status_code == 400
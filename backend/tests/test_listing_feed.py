@@ -0,0 +1,79 @@
+"""Tests für das Snapshot-Diffing der Angebotsliste."""
+
+from services.immobilien_crawler import ImmobilienCrawler
+from services.listing_feed import ListingEventType, ListingSnapshotDiffer
+
+
+def make_listing(listing_id, warmmiete=800.0, has_wbs=False):
+    return {
+        "id": listing_id,
+        "url": f"https://example.org/{listing_id}",
+        "titel": f"Wohnung {listing_id}",
+        "adresse": "Teststraße 1",
+        "area": "Mitte",
+        "warmmiete": warmmiete,
+        "zimmer": 2,
+        "has_wbs": has_wbs,
+    }
+
+
+class TestListingSnapshotDiffer:
+    """Tests für ListingSnapshotDiffer."""
+
+    def test_first_snapshot_is_all_added(self):
+        differ = ListingSnapshotDiffer()
+        events = differ.diff([make_listing("a"), make_listing("b")])
+
+        assert [e.type for e in events] == [ListingEventType.ADDED] * 2
+
+    def test_unchanged_snapshot_has_no_events(self):
+        differ = ListingSnapshotDiffer()
+        differ.diff([make_listing("a")])
+
+        assert differ.diff([make_listing("a")]) == []
+
+    def test_changed_and_removed(self):
+        differ = ListingSnapshotDiffer()
+        differ.diff([make_listing("a"), make_listing("b")])
+        events = differ.diff([make_listing("a", warmmiete=900.0, has_wbs=True)])
+
+        by_type = {e.type: e for e in events}
+        changed = by_type[ListingEventType.CHANGED]
+        assert changed.changes == {
+            "warmmiete": (800.0, 900.0),
+            "has_wbs": (False, True),
+        }
+        assert by_type[ListingEventType.REMOVED].listing_id == "b"
+
+    def test_partial_snapshot_reports_no_removals(self):
+        differ = ListingSnapshotDiffer()
+        differ.diff([make_listing("a"), make_listing("b")])
+
+        assert differ.diff([make_listing("a")], complete=False) == []
+        # Erst ein vollständiger Snapshot ohne "b" meldet das Angebot als entfernt
+        events = differ.diff([make_listing("a")])
+        assert [(e.type, e.listing_id) for e in events] == [
+            (ListingEventType.REMOVED, "b")
+        ]
+
+    def test_sharp_drop_counts_as_partial(self):
+        differ = ListingSnapshotDiffer()
+        differ.diff([make_listing(str(i)) for i in range(10)])
+
+        assert differ.diff([make_listing("0"), make_listing("1")]) == []
+        assert differ.listings() == [make_listing("0"), make_listing("1")]
+
+
+class TestFilterChange:
+    """Tests für Filteränderungen im laufenden Crawler."""
+
+    def test_unchanged_listings_are_rechecked_once(self):
+        crawler = ImmobilienCrawler(9001, {"max_warmmiete": 700}, {})
+        snapshot = [make_listing("a", warmmiete=800.0)]
+
+        assert crawler.select_new_matches(crawler.snapshot_differ.diff(snapshot)) == []
+        assert crawler.snapshot_differ.diff(snapshot) == []
+
+        crawler.update_filter_settings({"max_warmmiete": 900})
+        assert [listing["id"] for listing in crawler.select_new_matches([])] == ["a"]
+        assert crawler.select_new_matches([]) == []
@@ -0,0 +1,109 @@
+"""Tests für die Auslagerung der Bot-Logs in komprimierte Partitionen."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from migrations.runner import run_migrations
+from models.archive import ArchivePartition
+from models.bot_status import BotLog
+from services.archive_store import ArchiveStore
+from services.log_archive import BotLogArchive
+
+NOW = datetime(2026, 3, 20, 12, 0)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    run_migrations(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return BotLogArchive(store=ArchiveStore(str(tmp_path / "archive")), hot_days=7)
+
+
+def add_log(db, days_ago, level="INFO", user_id=1, message="log"):
+    db.add(
+        BotLog(
+            user_id=user_id,
+            level=level,
+            message=message,
+            action="test",
+            timestamp=NOW - timedelta(days=days_ago),
+        )
+    )
+
+
+def archive_all(db, archive):
+    return sum(archive.archive_day(db, day) for day in archive.pending_days(db, NOW))
+
+
+class TestBotLogArchive:
+    """Tests für BotLogArchive."""
+
+    def test_moves_only_days_outside_hot_window(self, db, archive):
+        for days_ago in (1, 3, 10, 10, 20):
+            add_log(db, days_ago)
+        db.commit()
+
+        assert archive_all(db, archive) == 3
+        assert db.scalar(select(func.count(BotLog.id))) == 2
+        assert db.scalar(select(func.count(ArchivePartition.id))) == 2
+
+    def test_reads_across_table_and_archive_newest_first(self, db, archive):
+        for days_ago in range(12):
+            add_log(db, days_ago, message=f"tag {days_ago}")
+        db.commit()
+        archive_all(db, archive)
+
+        logs, next_cursor = archive.read_user_logs(db, 1, skip=0, limit=20)
+        assert [log["message"] for log in logs] == [f"tag {i}" for i in range(12)]
+        assert next_cursor is None
+
+        page, _ = archive.read_user_logs(db, 1, skip=9, limit=2)
+        assert [log["message"] for log in page] == ["tag 9", "tag 10"]
+        assert isinstance(page[0]["timestamp"], datetime)
+
+    def test_cursor_pages_across_table_and_archive(self, db, archive):
+        for days_ago in range(12):
+            add_log(db, days_ago, message=f"tag {days_ago}")
+        db.commit()
+        archive_all(db, archive)
+
+        messages, cursor = [], None
+        while True:
+            page, cursor = archive.read_user_logs(db, 1, limit=5, cursor=cursor)
+            messages += [log["message"] for log in page]
+            if cursor is None:
+                break
+
+        assert messages == [f"tag {i}" for i in range(12)]
+
+    def test_level_filter_applies_to_archive(self, db, archive):
+        add_log(db, 15, level="INFO")
+        add_log(db, 15, level="ERROR", message="fehler")
+        db.commit()
+        archive_all(db, archive)
+
+        logs, _ = archive.read_user_logs(db, 1, level="ERROR")
+        assert [log["message"] for log in logs] == ["fehler"]
+
+    def test_retention_per_level(self, db, archive):
+        add_log(db, 45, level="INFO")
+        add_log(db, 45, level="ERROR")
+        add_log(db, 120, level="ERROR")
+        db.commit()
+        archive_all(db, archive)
+
+        removed = archive.apply_retention(db, 30, {"ERROR": 90}, now=NOW)
+
+        assert removed == 2
+        remaining, _ = archive.read_user_logs(db, 1, limit=10)
+        assert [log["level"] for log in remaining] == ["ERROR"]
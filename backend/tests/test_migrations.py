@@ -0,0 +1,30 @@
+"""Tests für den versionierten Migrations-Runner."""
+
+from sqlalchemy import create_engine, inspect
+
+from migrations.runner import MIGRATIONS, run_migrations
+
+
+class TestMigrationRunner:
+    """Tests für run_migrations auf einer leeren SQLite-Datenbank."""
+
+    def test_migrates_to_latest_version(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+
+        assert run_migrations(engine) == max(m.version for m in MIGRATIONS)
+
+    def test_is_idempotent(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+        first = run_migrations(engine)
+
+        assert run_migrations(engine) == first
+
+    def test_creates_hot_path_indexes(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+        run_migrations(engine)
+
+        index_names = {
+            index["name"] for index in inspect(engine).get_indexes("bot_logs")
+        }
+        assert "ix_bot_logs_user_id_timestamp" in index_names
+        assert "ix_bot_logs_timestamp_level" in index_names
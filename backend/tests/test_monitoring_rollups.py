@@ -0,0 +1,121 @@
+"""Tests für die stündlichen Monitoring-Rollups."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from migrations.runner import run_migrations
+from models.bewerbung import Bewerbung, BewerbungsStatus
+from models.bot_status import BotLog
+from models.user import User
+from services.monitoring_rollups import MonitoringRollups, successful_applications
+
+NOW = datetime(2026, 3, 20, 12, 30)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    run_migrations(engine)
+    session = sessionmaker(bind=engine)()
+    for user_id in (1, 2):
+        session.add(
+            User(
+                id=user_id,
+                vorname="Test",
+                nachname="User",
+                email=f"user{user_id}@example.com",
+                hashed_password="x",
+            )
+        )
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def rollups():
+    return MonitoringRollups(lookback_hours=2, backfill_days=30)
+
+
+def add_bewerbung(db, at, user_id=1, status=BewerbungsStatus.SENT):
+    bewerbung = Bewerbung(
+        user_id=user_id,
+        wohnungsname="Wohnung",
+        adresse="Straße 1",
+        status=status,
+        bewerbungsdatum=at,
+    )
+    db.add(bewerbung)
+    db.commit()
+    return bewerbung
+
+
+class TestMonitoringRollups:
+    """Tests für MonitoringRollups."""
+
+    def test_counts_match_raw_data(self, db, rollups):
+        add_bewerbung(db, NOW - timedelta(hours=1))
+        add_bewerbung(db, NOW - timedelta(hours=1), user_id=2)
+        add_bewerbung(db, NOW - timedelta(days=3), status=BewerbungsStatus.PENDING)
+        add_bewerbung(db, datetime(2026, 3, 20, 12, 0, 0))
+        db.add(BotLog(user_id=1, level="ERROR", message="x", timestamp=NOW))
+        db.add(BotLog(user_id=2, level="INFO", message="x", timestamp=NOW))
+        db.commit()
+
+        rollups.refresh(db, now=NOW)
+        since = NOW - timedelta(days=1)
+
+        counts = rollups.application_counts_by_status(db, since)
+        assert counts["sent"] == 3
+        assert counts["pending"] == 0
+        assert rollups.top_users(db, since) == [
+            {"user_id": 1, "applications": 2},
+            {"user_id": 2, "applications": 1},
+        ]
+        assert rollups.log_counts_by_level(db, since) == {"ERROR": 1, "INFO": 1}
+
+    def test_refresh_is_idempotent_and_incremental(self, db, rollups):
+        add_bewerbung(db, NOW - timedelta(hours=1))
+        rollups.refresh(db, now=NOW)
+        rollups.refresh(db, now=NOW)
+
+        add_bewerbung(db, NOW)
+        rollups.refresh(db, now=NOW)
+
+        counts = rollups.application_counts_by_status(db, NOW - timedelta(days=1))
+        assert counts["sent"] == 2
+
+    def test_status_change_of_old_application(self, db, rollups):
+        old = add_bewerbung(db, NOW - timedelta(days=5))
+        add_bewerbung(db, NOW)
+        rollups.refresh(db, now=NOW)
+
+        old.status = BewerbungsStatus.RESPONDED
+        db.commit()
+        rollups.refresh(db, now=NOW)
+
+        counts = rollups.application_counts_by_status(db, NOW - timedelta(days=7))
+        assert counts == {"pending": 0, "sent": 1, "responded": 1, "rejected": 0}
+
+    def test_deleted_rows_within_window_are_removed(self, db, rollups):
+        bewerbung = add_bewerbung(db, NOW)
+        rollups.refresh(db, now=NOW)
+
+        db.delete(bewerbung)
+        db.commit()
+        rollups.refresh(db, now=NOW)
+
+        assert sum(rollups.application_counts_by_status(db, NOW).values()) == 0
+
+    def test_successful_applications_include_responded(self, db, rollups):
+        add_bewerbung(db, NOW - timedelta(hours=1))
+        add_bewerbung(db, NOW - timedelta(hours=1), status=BewerbungsStatus.RESPONDED)
+        add_bewerbung(db, NOW - timedelta(hours=1), status=BewerbungsStatus.REJECTED)
+
+        rollups.refresh(db, now=NOW)
+        counts = rollups.application_counts_by_status(db, NOW - timedelta(days=1))
+
+        assert successful_applications(counts) == 2
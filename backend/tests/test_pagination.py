@@ -0,0 +1,96 @@
+"""Tests für die Keyset-Pagination."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from core.pagination import decode_cursor, encode_cursor, paginate
+from migrations.runner import run_migrations
+from models.bewerbung import Bewerbung
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    run_migrations(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def collect_pages(db, limit, descending=True):
+    ids, cursor = [], None
+    while True:
+        query = db.query(Bewerbung).filter(Bewerbung.user_id == 1)
+        page, cursor = paginate(
+            query,
+            Bewerbung.bewerbungsdatum,
+            Bewerbung.id,
+            cursor=cursor,
+            limit=limit,
+            descending=descending,
+        )
+        ids += [b.id for b in page]
+        if cursor is None:
+            return ids
+
+
+class TestPaginate:
+    """Tests für paginate auf einer SQLite-Datenbank."""
+
+    def test_pages_are_complete_and_stable(self, db):
+        start = datetime(2026, 1, 1, 12, 0)
+        for i in range(10):
+            # Gleiche Zeitstempel paarweise, um den id-Tiebreaker zu prüfen
+            db.add(
+                Bewerbung(
+                    user_id=1,
+                    wohnungsname=f"W{i}",
+                    adresse="Teststraße 1",
+                    bewerbungsdatum=start + timedelta(minutes=i // 2),
+                )
+            )
+        db.commit()
+
+        expected = [
+            b.id
+            for b in db.query(Bewerbung).order_by(
+                Bewerbung.bewerbungsdatum.desc(), Bewerbung.id.desc()
+            )
+        ]
+        assert collect_pages(db, limit=3) == expected
+        assert collect_pages(db, limit=3, descending=False) == expected[::-1]
+
+    def test_server_default_timestamps_do_not_repeat_rows(self, db):
+        # server_default speichert Zeitstempel ohne Mikrosekunden
+        for i in range(5):
+            db.execute(
+                text(
+                    "INSERT INTO bewerbungen (user_id, wohnungsname, adresse) "
+                    "VALUES (1, :name, 'Teststraße 1')"
+                ),
+                {"name": f"W{i}"},
+            )
+        db.commit()
+
+        ids = collect_pages(db, limit=2)
+        assert sorted(ids) == sorted(set(ids))
+        assert len(ids) == 5
+
+
+class TestCursor:
+    """Tests für das Cursor-Format."""
+
+    def test_round_trip(self):
+        value = datetime(2026, 1, 1, 12, 0, 0, 123456)
+
+        assert decode_cursor(encode_cursor(value, 7)) == (value, 7)
+
+    def test_invalid_cursor_is_rejected(self):
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor("kein-cursor")
+
+        assert exc_info.value.status_code == 400
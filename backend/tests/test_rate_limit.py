@@ -0,0 +1,170 @@
+"""Tests für das Rate-Limiting je User und IP."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.rate_limit import (
+    MemoryBackend,
+    RateLimiter,
+    RateLimitMiddleware,
+    Rule,
+    gcra,
+)
+from core.auth import get_current_active_user
+from core.security import create_access_token
+from core.user_cache import UserSnapshot
+from database.database import get_db
+from routers import batch
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def hit(backend, key="k", limit=3, period=60):
+    return asyncio.run(backend.hit(key, limit, period))
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def client(clock):
+    app = FastAPI()
+
+    @app.get("/api/statistik/")
+    def statistik():
+        return {"ok": True}
+
+    @app.get("/api/filter/")
+    def filter_settings():
+        return {"ok": True}
+
+    @app.get("/health")
+    def health():
+        return {"status": "healthy"}
+
+    limiter = RateLimiter(
+        MemoryBackend(clock=clock),
+        rules=(
+            Rule("ip", limit=5, period_seconds=60, per_ip=True),
+            Rule("statistik", limit=2, period_seconds=60, paths=("/api/statistik",)),
+        ),
+    )
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+    return TestClient(app)
+
+
+def auth(email):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+class TestGcra:
+    """Tests für den Token-Bucket."""
+
+    def test_burst_then_refill(self, clock):
+        backend = MemoryBackend(clock=clock)
+
+        assert [hit(backend).remaining for _ in range(3)] == [2, 1, 0]
+        denied = hit(backend)
+        assert not denied.allowed
+        assert denied.retry_after == pytest.approx(20)
+
+        clock.now += 20
+        assert hit(backend).allowed
+        assert not hit(backend).allowed
+
+    def test_denied_request_is_not_counted(self):
+        decision, new_tat = gcra(1060.0, 1000.0, 3, 60)
+
+        assert not decision.allowed
+        assert new_tat is None
+
+    def test_full_buckets_are_dropped(self, clock):
+        backend = MemoryBackend(max_keys=2, clock=clock)
+        for key in ("a", "b", "c"):
+            hit(backend, key)
+        assert list(backend._tats) == ["b", "c"]
+
+        clock.now += 60
+        hit(backend, "d")
+        assert list(backend._tats) == ["d"]
+
+
+class TestRateLimitMiddleware:
+    """Tests für RateLimitMiddleware."""
+
+    def test_route_budget_per_user_with_retry_after(self, client):
+        for _ in range(2):
+            assert (
+                client.get("/api/statistik/", headers=auth("a@x.org")).status_code
+                == 200
+            )
+
+        response = client.get("/api/statistik/", headers=auth("a@x.org"))
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "30"
+        assert response.headers["X-RateLimit-Limit"] == "2"
+
+        # Andere User und andere Routen haben eigene Budgets
+        assert client.get("/api/statistik/", headers=auth("b@x.org")).status_code == 200
+        assert client.get("/api/filter/", headers=auth("a@x.org")).status_code == 200
+
+    def test_ip_ceiling_applies_across_users(self, client):
+        statuses = [
+            client.get("/api/filter/", headers=auth(f"u{i}@x.org")).status_code
+            for i in range(6)
+        ]
+
+        assert statuses == [200] * 5 + [429]
+
+    def test_health_and_preflight_are_exempt(self, client):
+        for _ in range(10):
+            assert client.get("/health").status_code == 200
+            assert client.options("/api/filter/").status_code != 429
+
+    def test_batch_items_use_route_budgets(self, clock):
+        app = FastAPI()
+        app.include_router(batch.router)
+        app.dependency_overrides[get_db] = lambda: None
+        app.dependency_overrides[get_current_active_user] = lambda: UserSnapshot(
+            id=1,
+            vorname="A",
+            nachname="B",
+            email="a@x.org",
+            is_admin=False,
+            is_active=True,
+            profile_completed=True,
+            filter_einstellungen="{}",
+            bewerbungsprofil=None,
+            created_at=None,
+        )
+        limiter = RateLimiter(
+            MemoryBackend(clock=clock),
+            rules=(Rule("filter", limit=2, period_seconds=60, paths=("/api/filter",)),),
+        )
+        app.add_middleware(RateLimitMiddleware, limiter=limiter)
+        client = TestClient(app)
+
+        response = client.post(
+            "/api/batch",
+            headers=auth("a@x.org"),
+            json={
+                "requests": [{"id": str(i), "path": "/api/filter/"} for i in range(3)]
+            },
+        )
+
+        results = response.json()
+        assert [item["status"] for item in results] == [200, 200, 429]
+        assert results[2]["retry_after"] == 30
+        # Dasselbe Budget wie direkte Aufrufe der Route
+        assert client.get("/api/filter/", headers=auth("a@x.org")).status_code == 429
@@ -0,0 +1,35 @@
+"""Tests für die schlanke JSON-Antwort."""
+
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+
+from core.responses import FastJSONResponse, dumps
+from models.bewerbung import BewerbungsStatus
+
+ROW = {
+    "id": 1,
+    "status": BewerbungsStatus.SENT,
+    "timestamp": datetime(2026, 3, 1, 12, 0, 0, 123456),
+    "details": None,
+    "text": "Größe",
+}
+
+
+class TestFastJSONResponse:
+    """Tests für FastJSONResponse."""
+
+    def test_matches_default_encoding(self):
+        assert json.loads(dumps([ROW])) == jsonable_encoder([ROW])
+
+    def test_decimal_as_string_like_pydantic(self):
+        assert dumps({"preis": Decimal("900.50")}) == b'{"preis":"900.50"}'
+
+    def test_response_body(self):
+        response = FastJSONResponse([ROW], headers={"X-Next-Cursor": "abc"})
+
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["x-next-cursor"] == "abc"
+        assert json.loads(response.body)[0]["text"] == "Größe"
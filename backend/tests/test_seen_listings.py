@@ -0,0 +1,54 @@
+"""Tests für die kompakte Registry gesehener Angebote."""
+
+from services.seen_listings import SeenListingRegistry
+
+
+class TestSeenListingRegistry:
+    """Tests für SeenListingRegistry."""
+
+    def test_mark_and_check_per_user(self):
+        registry = SeenListingRegistry()
+        registry.mark_seen(1, "a")
+
+        assert registry.is_seen(1, "a")
+        assert not registry.is_seen(2, "a")
+        assert not registry.is_seen(1, "b")
+
+    def test_user_view_behaves_like_set(self):
+        registry = SeenListingRegistry()
+        known = registry.for_user(7)
+        known.add("x")
+        known.add("y")
+
+        assert "x" in known
+        assert "z" not in known
+        assert len(known) == 2
+
+    def test_ids_are_shared_between_users(self):
+        registry = SeenListingRegistry()
+        registry.mark_seen(1, "a")
+        registry.mark_seen(2, "a")
+
+        assert registry.get_stats()["interned_listings"] == 1
+
+    def test_expire_removes_vanished_listings(self):
+        registry = SeenListingRegistry(max_age_seconds=100)
+        registry.mark_seen(1, "old", now=0)
+        registry.mark_seen(1, "current", now=0)
+        registry.touch(["current"], now=150)
+
+        assert registry.expire(now=150) == 1
+        assert not registry.is_seen(1, "old")
+        assert registry.is_seen(1, "current")
+
+    def test_expired_slots_are_reused(self):
+        registry = SeenListingRegistry(max_age_seconds=10)
+        for i in range(100):
+            registry.mark_seen(1, f"listing-{i}", now=0)
+        registry.expire(now=20)
+        registry.mark_seen(2, "fresh", now=20)
+
+        stats = registry.get_stats()
+        assert stats["slots"] == 1
+        assert stats["tracked_users"] == 1
+        assert not registry.is_seen(2, "listing-0")
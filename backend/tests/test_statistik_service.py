@@ -0,0 +1,156 @@
+"""Tests für die inkrementell gepflegten Statistik-Zähler."""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+
+from database.database import db_now
+from migrations.runner import run_migrations
+from models.bewerbung import Bewerbung, BewerbungsStatus
+from models.statistik import Statistik
+from models.user import User
+from services.statistik_service import dashboard_statistik, reconcile_statistiken
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    run_migrations(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(
+        User(
+            id=1,
+            vorname="Test",
+            nachname="User",
+            email="t@example.com",
+            hashed_password="x",
+        )
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def add_bewerbung(db, days_ago=0, status=BewerbungsStatus.PENDING, at=None):
+    bewerbung = Bewerbung(
+        user_id=1,
+        wohnungsname="Wohnung",
+        adresse="Straße 1",
+        status=status,
+        bewerbungsdatum=at or db_now() - timedelta(days=days_ago),
+    )
+    db.add(bewerbung)
+    db.commit()
+    return bewerbung
+
+
+def counters(db):
+    statistik = db.scalar(select(Statistik).where(Statistik.user_id == 1))
+    db.refresh(statistik)
+    return (
+        statistik.anzahl_verschickter_bewerbungen,
+        statistik.erfolgreiche_bewerbungen,
+        statistik.bewerbungen_letzte_30_tage,
+    )
+
+
+class TestStatistikCounters:
+    """Tests für die ORM-Events und den Abgleich."""
+
+    def test_insert_updates_counters(self, db):
+        add_bewerbung(db)
+        add_bewerbung(db, days_ago=40, status=BewerbungsStatus.RESPONDED)
+
+        assert counters(db) == (2, 1, 1)
+
+    def test_status_change_after_commit(self, db):
+        bewerbung = add_bewerbung(db)
+
+        # Nach dem Commit ist der Status abgelaufen und muss nachgeladen werden
+        bewerbung.status = BewerbungsStatus.RESPONDED
+        db.commit()
+        assert counters(db) == (1, 1, 1)
+
+        bewerbung.status = BewerbungsStatus.REJECTED
+        db.commit()
+        assert counters(db) == (1, 0, 1)
+
+    def test_delete_decrements(self, db):
+        bewerbung = add_bewerbung(db, status=BewerbungsStatus.RESPONDED)
+        add_bewerbung(db)
+
+        db.delete(bewerbung)
+        db.commit()
+
+        assert counters(db) == (1, 0, 1)
+
+    def test_reconcile_fixes_drift_and_window(self, db):
+        add_bewerbung(db, days_ago=29, status=BewerbungsStatus.RESPONDED)
+        add_bewerbung(db)
+        db.execute(
+            update(Statistik).values(
+                anzahl_verschickter_bewerbungen=99, erfolgreiche_bewerbungen=0
+            )
+        )
+        db.commit()
+
+        # Zwei Tage später liegt die ältere Bewerbung außerhalb des Fensters
+        assert reconcile_statistiken(db, now=db_now() + timedelta(days=2)) == 1
+        assert counters(db) == (2, 1, 1)
+
+
+class TestDashboardStatistik:
+    """Tests für die Dashboard-Aggregation."""
+
+    def test_calendar_months_and_status(self, db):
+        add_bewerbung(db, at=datetime(2026, 3, 31, 12), status=BewerbungsStatus.SENT)
+        add_bewerbung(db, at=datetime(2026, 4, 1, 12))
+        add_bewerbung(db, at=datetime(2026, 4, 20, 12))
+        add_bewerbung(db, at=datetime(2025, 1, 5, 12))
+
+        result = dashboard_statistik(db, 1, today=date(2026, 4, 20))
+
+        assert result["bewerbungen_nach_status"]["pending"] == 3
+        assert result["bewerbungen_nach_status"]["sent"] == 1
+        assert result["bewerbungen_letzte_7_tage"] == 1
+        assert [m["monat"] for m in result["monatliche_statistik"]] == [
+            "2025-11",
+            "2025-12",
+            "2026-01",
+            "2026-02",
+            "2026-03",
+            "2026-04",
+        ]
+        assert [m["anzahl"] for m in result["monatliche_statistik"]][-2:] == [1, 2]
+
+    def test_weekly_range_includes_empty_buckets(self, db):
+        add_bewerbung(db, at=datetime(2026, 4, 6, 9))
+        add_bewerbung(db, at=datetime(2026, 4, 12, 9))
+
+        result = dashboard_statistik(
+            db, 1, start=date(2026, 3, 30), end=date(2026, 4, 19), granularity="week"
+        )
+
+        assert [(w["periode"], w["anzahl"]) for w in result["zeitreihe"]] == [
+            ("2026-W14", 0),
+            ("2026-W15", 2),
+            ("2026-W16", 0),
+        ]
+
+    def test_status_totals_include_archive(self, db):
+        add_bewerbung(db, status=BewerbungsStatus.SENT)
+        add_bewerbung(db, status=BewerbungsStatus.RESPONDED)
+        db.execute(
+            update(Statistik)
+            .where(Statistik.user_id == 1)
+            .values(archivierte_bewerbungen=5, archivierte_erfolgreiche_bewerbungen=2)
+        )
+        reconcile_statistiken(db)
+
+        result = dashboard_statistik(db, 1)
+
+        assert result["bewerbungen_nach_status"]["responded"] == 3
+        assert result["bewerbungen_nach_status"]["archiviert"] == 3
+        assert result["bewerbungen_gesamt"] == counters(db)[0] == 7
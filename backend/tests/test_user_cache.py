@@ -0,0 +1,97 @@
+"""Tests für den Auth-Cache der aufgelösten User."""
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.auth import get_current_user
+from core.security import create_access_token
+from core.user_cache import UserCache, UserSnapshot, user_cache
+from migrations.runner import run_migrations
+from models.user import User
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    run_migrations(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(
+        User(
+            id=1,
+            vorname="Test",
+            nachname="User",
+            email="t@example.com",
+            hashed_password="x",
+        )
+    )
+    session.commit()
+    user_cache.clear()
+    yield session
+    session.close()
+    user_cache.clear()
+
+
+def snapshot(user_id=1, email="t@example.com"):
+    return UserSnapshot(
+        id=user_id,
+        vorname="Test",
+        nachname="User",
+        email=email,
+        is_admin=False,
+        is_active=True,
+        profile_completed=False,
+        filter_einstellungen=None,
+        bewerbungsprofil=None,
+        created_at=None,
+    )
+
+
+def resolve(db, email="t@example.com"):
+    token = create_access_token({"sub": email})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return get_current_user(credentials, db)
+
+
+class TestUserCache:
+    """Tests für UserCache."""
+
+    def test_lru_eviction_and_ttl(self, monkeypatch):
+        cache = UserCache(max_size=2, ttl_seconds=10)
+        for user_id in (1, 2, 3):
+            cache.put(snapshot(user_id, f"u{user_id}@example.com"), cache.generation)
+
+        assert cache.get("u1@example.com") is None
+        assert cache.get("u3@example.com").id == 3
+
+        clock = iter([1000.0, 2000.0])
+        monkeypatch.setattr("core.user_cache.time.monotonic", lambda: next(clock))
+        cache.put(snapshot(4, "u4@example.com"), cache.generation)
+        assert cache.get("u4@example.com") is None
+
+    def test_stale_load_is_not_stored(self):
+        cache = UserCache()
+        generation = cache.generation
+        cache.invalidate(1)
+        cache.put(snapshot(), generation)
+
+        assert cache.get("t@example.com") is None
+
+    def test_second_request_skips_database(self, db):
+        first = resolve(db)
+
+        # Ohne Session würde ein weiterer Datenbankzugriff fehlschlagen
+        assert resolve(None) is first
+
+    def test_update_invalidates_after_commit(self, db):
+        assert resolve(db).is_admin is False
+
+        user = db.get(User, 1)
+        user.is_admin = True
+        db.flush()
+        assert user_cache.get("t@example.com") is not None
+
+        db.commit()
+        assert user_cache.get("t@example.com") is None
+        assert resolve(db).is_admin is True
@@ -0,0 +1,221 @@
+"""Tests für die Admin-Übersicht der User."""
+
+import sqlite3
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from core.auth import get_current_admin_user
+from database.database import get_db
+from migrations.runner import run_migrations
+from models.user import User
+from routers import admin, bot
+from services.immobilien_bot_manager import BotMetrics, BotStatus, bot_manager
+from services.user_index import query_users
+
+COLUMNS = [User.id, User.email]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    run_migrations(engine)
+    SessionFactory = sessionmaker(bind=engine)
+    with SessionFactory() as db:
+        for i, (vorname, nachname) in enumerate(
+            [
+                ("Anna", "Schmidt"),
+                ("anton", "Meyer"),
+                ("Bernd", "Anders"),
+                ("Clara", "Schulz"),
+                ("Dora", "Becker"),
+            ],
+            start=1,
+        ):
+            db.add(
+                User(
+                    id=i,
+                    vorname=vorname,
+                    nachname=nachname,
+                    email=f"{vorname.lower()}@example.org",
+                    hashed_password="x",
+                    is_active=i != 4,
+                )
+            )
+        db.commit()
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(engine):
+    SessionFactory = sessionmaker(bind=engine)
+
+    def session():
+        db = SessionFactory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(admin.router)
+    app.include_router(bot.router)
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+
+    bot_manager.bot_metrics[1] = BotMetrics(user_id=1, status=BotStatus.RUNNING)
+    bot_manager.bot_metrics[3] = BotMetrics(user_id=3, status=BotStatus.STOPPED)
+    yield TestClient(app)
+    bot_manager.bot_metrics.clear()
+
+
+class TestQueryUsers:
+    """Tests für query_users."""
+
+    def test_prefix_search_is_case_insensitive(self, db):
+        page = query_users(db, COLUMNS, q="AN")
+
+        # Anna, anton (Vorname) und Bernd Anders (Nachname)
+        assert [row["id"] for row in page.rows] == [1, 2, 3]
+        assert page.total == 3
+
+    def test_search_uses_indexes(self, db):
+        plan = db.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT id FROM users "
+                "WHERE email_lower >= 'an' AND email_lower < 'ao'"
+            )
+        ).all()
+
+        assert "ix_users_email_lower" in " ".join(str(row[-1]) for row in plan)
+
+    def test_cursor_pages_cover_all_rows_once(self, db):
+        seen = []
+        cursor = None
+        while True:
+            page = query_users(
+                db, COLUMNS, sort="email", descending=True, limit=2, cursor=cursor
+            )
+            seen.extend(row["email"] for row in page.rows)
+            assert page.total == 5
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == sorted(seen, reverse=True)
+        assert len(seen) == 5
+
+    def test_bot_status_filter_uses_snapshot(self, db):
+        statuses = {
+            1: {"status": "running"},
+            3: {"status": "stopped"},
+        }
+
+        running = query_users(db, COLUMNS, bot_status="running", statuses=statuses)
+        stopped = query_users(db, COLUMNS, bot_status="stopped", statuses=statuses)
+
+        assert [row["id"] for row in running.rows] == [1]
+        # Auch User, die nie einen Bot gestartet haben
+        assert [row["id"] for row in stopped.rows] == [2, 3, 4, 5]
+
+    def test_search_folds_umlauts(self, db):
+        db.add(
+            User(
+                id=6,
+                vorname="Özlem",
+                nachname="Öztürk",
+                email="oezlem@example.org",
+                hashed_password="x",
+            )
+        )
+        db.commit()
+
+        for q in ("Öz", "öz", "ÖZTÜ"):
+            assert [row["id"] for row in query_users(db, COLUMNS, q=q).rows] == [6]
+
+    def test_search_keys_follow_updates(self, db):
+        user = db.get(User, 1)
+        user.nachname = "Ärger"
+        db.commit()
+
+        assert [row["id"] for row in query_users(db, COLUMNS, q="är").rows] == [1]
+        assert query_users(db, COLUMNS, q="schmidt").rows == []
+
+    def test_plain_sqlite3_writes(self, engine, db):
+        # Wie create_test_admin.py: ohne SQLAlchemy und deren SQL-Funktionen
+        conn = sqlite3.connect(engine.url.database)
+        conn.execute(
+            "INSERT INTO users (email, vorname, nachname, hashed_password, is_admin) "
+            "VALUES ('Admin@Test.com', 'Test', 'Admin', 'x', 1)"
+        )
+        conn.execute("UPDATE users SET vorname = 'Eva', is_admin = 1 WHERE id = 5")
+        conn.execute("REINDEX users")
+        conn.commit()
+        conn.close()
+
+        assert [row["email"] for row in query_users(db, COLUMNS, q="admin@").rows] == [
+            "Admin@Test.com"
+        ]
+
+
+class TestSearchKeyMigration:
+    """Tests für Migration 16 (Suchschlüssel-Spalten)."""
+
+    def test_existing_users_are_backfilled(self, engine, db):
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "UPDATE users SET email_lower = NULL, vorname_lower = NULL, "
+                    "nachname_lower = NULL, vorname = 'Ömer' WHERE id = 1"
+                )
+            )
+            conn.execute(text("DELETE FROM schema_version WHERE version = 16"))
+
+        assert run_migrations(engine) == 16
+        assert [row["id"] for row in query_users(db, COLUMNS, q="öm").rows] == [1]
+
+
+class TestAdminUserEndpoints:
+    """Tests für /api/bot/admin/users und /api/users/."""
+
+    def test_bot_users_merge_status_and_count(self, client):
+        response = client.get(
+            "/api/bot/admin/users", params={"bot_status": "stopped", "limit": 2}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == "4"
+        assert "X-Next-Cursor" in response.headers
+        assert [(u["id"], u["bot_status"]) for u in response.json()] == [
+            (2, "stopped"),
+            (3, "stopped"),
+        ]
+
+        running = client.get("/api/bot/admin/users", params={"q": "ann"}).json()
+        assert running[0]["bot_status"] == "running"
+
+    def test_admin_users_filter_and_sort(self, client):
+        response = client.get(
+            "/api/users/", params={"is_active": True, "sort": "nachname"}
+        )
+
+        assert response.headers["X-Total-Count"] == "4"
+        assert [u["nachname"] for u in response.json()] == [
+            "Anders",
+            "Becker",
+            "Meyer",
+            "Schmidt",
+        ]
+
+    def test_snapshot_does_not_deadlock(self, client):
+        assert {s["user_id"] for s in bot_manager.get_all_bot_statuses()} == {1, 3}
@@ -0,0 +1,76 @@
+"""Tests für das Löschen von Usern."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.database import configure_sqlite_engine
+from migrations.runner import run_migrations
+from models.chat import ChatConversation, ChatMessage, MessageType
+from models.user import User
+from routers.chat import record_new_message
+from services.chat_unread import (
+    ADMIN_SCOPE,
+    get_counts,
+    rebuild_unread_counters,
+    user_scope,
+)
+from services.user_purge import purge_users
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    # Die Konversationen verschwinden per ON DELETE CASCADE
+    configure_sqlite_engine(engine)
+    run_migrations(engine)
+    session = sessionmaker(bind=engine)()
+    for user_id in (1, 2):
+        session.add(
+            User(
+                id=user_id,
+                vorname="Test",
+                nachname="User",
+                email=f"u{user_id}@example.com",
+                hashed_password="x",
+            )
+        )
+        session.add(ChatConversation(id=f"c{user_id}", user_id=user_id))
+    session.commit()
+    yield session
+    session.close()
+
+
+def send(db, user_id, count):
+    for _ in range(count):
+        message = ChatMessage(
+            conversation_id=f"c{user_id}",
+            user_id=user_id,
+            sender_type=MessageType.USER,
+            sender_name="Test",
+            message="Hallo",
+        )
+        db.add(message)
+        record_new_message(db, f"c{user_id}", message)
+    db.commit()
+
+
+class TestUserPurge:
+    """Tests für purge_users."""
+
+    def test_admin_badge_drops_deleted_conversations(self, db):
+        send(db, 1, 2)
+        send(db, 2, 3)
+        assert get_counts(db, ADMIN_SCOPE) == (5, 2)
+
+        assert asyncio.run(purge_users(db, [2])) == 1
+
+        db.expire_all()
+        assert get_counts(db, ADMIN_SCOPE) == (2, 1)
+        assert get_counts(db, user_scope(2)) == (0, 0)
+
+        rebuild_unread_counters(db)
+        db.commit()
+        assert get_counts(db, ADMIN_SCOPE) == (2, 1)
@@ -29,6 +29,11 @@ import { LinearGradient } from 'expo-linear-gradient';
 import UniversalHeader from '@/shared/UniversalHeader';
 import AsyncStorage from '@react-native-async-storage/async-storage';
 import { API_BASE_URL } from '@/constants/api';
+import {
+  fetchUserCount,
+  HttpError,
+  usePagedUsers,
+} from '@/shared/hooks/usePagedUsers';
 
 interface User {
   id: number;
@@ -55,14 +60,11 @@ function BotManagementContent({
 }) {
   const insets = useSafeAreaInsets();
   const theme = useTheme();
-  const [users, setUsers] = useState<User[]>([]);
   const [refreshing, setRefreshing] = useState(false);
   const [loadingBots, setLoadingBots] = useState<{ [key: number]: boolean }>(
     {}
   );
-  const [searchQuery, setSearchQuery] = useState('');
-  const [filteredUsers, setFilteredUsers] = useState<User[]>([]);
-  const [loading, setLoading] = useState(false);
+  const [botCounts, setBotCounts] = useState({ running: 0, stopped: 0 });
 
   const getAuthHeaders = async () => {
     const token = await AsyncStorage.getItem('access_token');
@@ -75,43 +77,6 @@ function BotManagementContent({
     };
   };
 
-  const fetchUsers = async () => {
-    try {
-      setLoading(true);
-      const headers = await getAuthHeaders();
-      const response = await fetch(`${API_BASE_URL}/api/bot/admin/users`, { 
-        headers 
-      });
-
-      if (!response.ok) {
-        if (response.status === 403) {
-          Alert.alert(
-            'Zugriff verweigert',
-            'Sie haben keine Administratorrechte.'
-          );
-          return;
-        }
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-
-      const data = await response.json();
-      
-      // Daten für die Anzeige formatieren
-      const formattedUsers = data.map((user: any) => ({
-        ...user,
-        last_activity: formatLastActivity(user.last_activity),
-      }));
-      
-      setUsers(formattedUsers);
-      setFilteredUsers(formattedUsers);
-    } catch (error) {
-      console.error('Error fetching users:', error);
-      Alert.alert('Fehler', 'Fehler beim Laden der Benutzer');
-    } finally {
-      setLoading(false);
-    }
-  };
-
   const formatLastActivity = (lastActivity: string | null) => {
     if (!lastActivity) return 'Noch nie aktiv';
     
@@ -134,28 +99,51 @@ function BotManagementContent({
     }
   };
 
-  useEffect(() => {
-    // Load users on component mount
-    fetchUsers();
-  }, []);
+  const handleFetchError = (error: unknown) => {
+    if (error instanceof HttpError && error.status === 403) {
+      Alert.alert('Zugriff verweigert', 'Sie haben keine Administratorrechte.');
+      return;
+    }
+    console.error('Error fetching users:', error);
+    Alert.alert('Fehler', 'Fehler beim Laden der Benutzer');
+  };
 
-  // Search functionality
-  useEffect(() => {
-    if (searchQuery.trim() === '') {
-      setFilteredUsers(users);
-    } else {
-      const filtered = users.filter(
-        user =>
-          user.email.toLowerCase().includes(searchQuery.toLowerCase()) ||
-          `${user.vorname} ${user.nachname}`
-            .toLowerCase()
-            .includes(searchQuery.toLowerCase()) ||
-          user.vorname.toLowerCase().includes(searchQuery.toLowerCase()) ||
-          user.nachname.toLowerCase().includes(searchQuery.toLowerCase())
-      );
-      setFilteredUsers(filtered);
+  // Seitenweise vom Server geladen, die Suche läuft ebenfalls serverseitig
+  const {
+    items: users,
+    total,
+    query: searchQuery,
+    setQuery: setSearchQuery,
+    loading,
+    loadingMore,
+    hasMore,
+    refresh,
+    loadMore,
+  } = usePagedUsers<User>('/api/bot/admin/users', handleFetchError, user => ({
+    ...user,
+    last_activity: formatLastActivity(user.last_activity),
+  }));
+
+  // Zähler über alle Benutzer, nicht nur die geladenen Seiten
+  const fetchBotCounts = async () => {
+    try {
+      const [running, stopped] = await Promise.all([
+        fetchUserCount('/api/bot/admin/users', { bot_status: 'running' }),
+        fetchUserCount('/api/bot/admin/users', { bot_status: 'stopped' }),
+      ]);
+      setBotCounts({ running, stopped });
+    } catch (error) {
+      console.error('Error fetching bot counts:', error);
     }
-  }, [searchQuery, users]);
+  };
+
+  const fetchUsers = async () => {
+    await Promise.all([refresh(), fetchBotCounts()]);
+  };
+
+  useEffect(() => {
+    fetchBotCounts();
+  }, []);
 
   const handleRefresh = async () => {
     setRefreshing(true);
@@ -241,14 +229,14 @@ function BotManagementContent({
   const statsData = [
     {
       title: 'Aktive Bots',
-      value: users.filter(u => u.bot_status === 'running').length.toString(),
+      value: botCounts.running.toString(),
       gradient: ['#34c759', '#32d74b'],
       icon: 'play-circle',
       subtitle: 'Derzeit laufend',
     },
     {
       title: 'Gestoppte Bots',
-      value: users.filter(u => u.bot_status === 'stopped').length.toString(),
+      value: botCounts.stopped.toString(),
       gradient: ['#ff3b30', '#ff6961'],
       icon: 'stop-circle',
       subtitle: 'Nicht aktiv',
@@ -346,7 +334,7 @@ function BotManagementContent({
                 {searchQuery ? 'Suchergebnisse' : 'Alle Benutzer'}
               </Text>
               <Text style={styles.usersCount}>
-                {filteredUsers.length} {searchQuery ? 'gefunden' : 'Benutzer'}
+                {total} {searchQuery ? 'gefunden' : 'Benutzer'}
               </Text>
             </View>
 
@@ -355,7 +343,7 @@ function BotManagementContent({
                 <ActivityIndicator size="large" color="#667eea" />
                 <Text style={styles.loadingText}>Lade Benutzerdaten...</Text>
               </View>
-            ) : filteredUsers.length === 0 && searchQuery ? (
+            ) : users.length === 0 && searchQuery ? (
               <View style={styles.noResultsContainer}>
                 <Ionicons name="search" size={48} color="#C7C7CC" />
                 <Text style={styles.noResultsTitle}>
@@ -366,7 +354,7 @@ function BotManagementContent({
                 </Text>
               </View>
             ) : (
-              filteredUsers.map((user, index) => (
+              users.map((user, index) => (
                 <View key={user.id} style={styles.userCard}>
                   <View style={styles.userContent}>
                     <View style={styles.userLeft}>
@@ -473,6 +461,22 @@ function BotManagementContent({
                 </View>
               ))
             )}
+
+            {!loading && hasMore && (
+              <TouchableOpacity
+                style={styles.loadMoreButton}
+                onPress={loadMore}
+                disabled={loadingMore}
+              >
+                {loadingMore ? (
+                  <ActivityIndicator size="small" color="#667eea" />
+                ) : (
+                  <Text style={styles.loadMoreText}>
+                    Weitere Benutzer laden ({users.length} von {total})
+                  </Text>
+                )}
+              </TouchableOpacity>
+            )}
           </View>
         </ScrollView>
       </View>
@@ -646,6 +650,17 @@ const styles = StyleSheet.create({
     fontWeight: '500',
   },
 
+  // Load More
+  loadMoreButton: {
+    alignItems: 'center',
+    paddingVertical: 16,
+  },
+  loadMoreText: {
+    fontSize: 15,
+    color: '#667eea',
+    fontWeight: '600',
+  },
+
   // No Results
   noResultsContainer: {
     alignItems: 'center',
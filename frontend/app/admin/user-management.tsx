@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState } from 'react';
 import {
   View,
   Text,
@@ -28,9 +28,9 @@ interface User {
 }
 
 import { API_BASE_URL } from '@/constants/api';
+import { HttpError, usePagedUsers } from '@/shared/hooks/usePagedUsers';
 
 export default function UserManagement() {
-  const [users, setUsers] = useState<User[]>([]);
   const [showCreateModal, setShowCreateModal] = useState(false);
   const [email, setEmail] = useState('');
   const [vorname, setVorname] = useState('');
@@ -42,8 +42,6 @@ export default function UserManagement() {
   const [isAdmin, setIsAdmin] = useState(true); // Start with true for admin tabs
   const [checkingAdmin, setCheckingAdmin] = useState(false);
   const [newUserRole, setNewUserRole] = useState<'user' | 'admin'>('user');
-  const [searchQuery, setSearchQuery] = useState('');
-  const [filteredUsers, setFilteredUsers] = useState<User[]>([]);
 
   const getAuthHeaders = async () => {
     const token = await AsyncStorage.getItem('access_token');
@@ -62,62 +60,40 @@ export default function UserManagement() {
     };
   };
 
-  const fetchUsers = async () => {
-    try {
-      setRefreshing(true);
-      const headers = await getAuthHeaders();
-      const response = await fetch(`${API_BASE_URL}/api/users/`, { headers });
-
-      if (!response.ok) {
-        if (response.status === 403) {
-          Alert.alert(
-            'Zugriff verweigert',
-            'Sie haben keine Administratorrechte. Nur Administratoren können Benutzer verwalten.',
-            [
-              {
-                text: 'OK',
-                onPress: () => {
-                  // Could navigate back or to a different screen
-                },
-              },
-            ]
-          );
-          return;
-        }
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-
-      const data = await response.json();
-      setUsers(data);
-      setFilteredUsers(data); // Initialize filtered users
-    } catch (error) {
-      console.error('Error fetching users:', error);
-      Alert.alert('Fehler', 'Fehler beim Laden der Benutzer');
-    } finally {
-      setRefreshing(false);
+  const handleFetchError = (error: unknown) => {
+    if (error instanceof HttpError && error.status === 403) {
+      Alert.alert(
+        'Zugriff verweigert',
+        'Sie haben keine Administratorrechte. Nur Administratoren können Benutzer verwalten.',
+        [
+          {
+            text: 'OK',
+            onPress: () => {
+              // Could navigate back or to a different screen
+            },
+          },
+        ]
+      );
+      return;
     }
+    console.error('Error fetching users:', error);
+    Alert.alert('Fehler', 'Fehler beim Laden der Benutzer');
   };
 
-  useEffect(() => {
-    // Simple: if user is in admin tabs, they must be admin
-    // The routing already handled the admin check
-    fetchUsers();
-  }, []);
+  // Users are paged from the server; the search runs there as well, so it
+  // also finds users that are not loaded yet
+  const {
+    items: users,
+    query: searchQuery,
+    setQuery: handleSearch,
+    refresh: fetchUsers,
+    loadMore,
+  } = usePagedUsers<User>('/api/users/', handleFetchError);
 
-  // Search functionality
-  const handleSearch = (query: string) => {
-    setSearchQuery(query);
-    if (query.trim() === '') {
-      setFilteredUsers(users);
-    } else {
-      const filtered = users.filter(
-        user =>
-          user.email.toLowerCase().includes(query.toLowerCase()) ||
-          user.nachname.toLowerCase().includes(query.toLowerCase()) ||
-          user.vorname.toLowerCase().includes(query.toLowerCase())
-      );
-      setFilteredUsers(filtered);
-    }
+  const handleRefresh = async () => {
+    setRefreshing(true);
+    await fetchUsers();
+    setRefreshing(false);
   };
 
   // Admin actions
@@ -445,12 +421,14 @@ export default function UserManagement() {
         </View>
 
         <FlatList
-          data={filteredUsers}
+          data={users}
           keyExtractor={item => item.id.toString()}
           renderItem={renderUser}
           contentContainerStyle={styles.listContainer}
+          onEndReached={loadMore}
+          onEndReachedThreshold={0.5}
           refreshControl={
-            <RefreshControl refreshing={refreshing} onRefresh={fetchUsers} />
+            <RefreshControl refreshing={refreshing} onRefresh={handleRefresh} />
           }
           showsVerticalScrollIndicator={false}
         />
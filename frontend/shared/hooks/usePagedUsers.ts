@@ -0,0 +1,147 @@
+import { useCallback, useEffect, useRef, useState } from 'react';
+import AsyncStorage from '@react-native-async-storage/async-storage';
+
+import { API_BASE_URL } from '@/constants/api';
+
+const PAGE_SIZE = 50;
+const SEARCH_DEBOUNCE_MS = 300;
+
+type Params = Record<string, string | number | boolean | undefined>;
+
+export class HttpError extends Error {
+  status: number;
+
+  constructor(status: number) {
+    super(`HTTP error! status: ${status}`);
+    this.status = status;
+  }
+}
+
+const buildUrl = (path: string, params: Params) => {
+  const query = Object.entries(params)
+    .filter(([, value]) => value !== undefined && value !== '')
+    .map(
+      ([key, value]) =>
+        `${encodeURIComponent(key)}=${encodeURIComponent(String(value))}`
+    )
+    .join('&');
+  return `${API_BASE_URL}${path}${query ? `?${query}` : ''}`;
+};
+
+const fetchPage = async (path: string, params: Params) => {
+  const token = await AsyncStorage.getItem('access_token');
+  if (!token) {
+    throw new Error('No access token found');
+  }
+
+  const response = await fetch(buildUrl(path, params), {
+    headers: {
+      Authorization: `Bearer ${token}`,
+      'Content-Type': 'application/json',
+    },
+  });
+  if (!response.ok) {
+    throw new HttpError(response.status);
+  }
+
+  return {
+    items: await response.json(),
+    total: Number(response.headers.get('X-Total-Count') ?? 0),
+    nextCursor: response.headers.get('X-Next-Cursor'),
+  };
+};
+
+/**
+ * Number of users matching the given filters, read from X-Total-Count
+ */
+export const fetchUserCount = async (path: string, params: Params = {}) => {
+  const { total } = await fetchPage(path, { ...params, limit: 1 });
+  return total;
+};
+
+/**
+ * Pages through an admin user list with X-Next-Cursor.
+ * The search runs on the server (prefix match on email, first and last name),
+ * so it covers all users and not only the pages loaded so far.
+ */
+export function usePagedUsers<T extends { id: number }>(
+  path: string,
+  onError: (error: unknown) => void,
+  mapItem: (item: any) => T = item => item
+) {
+  const [items, setItems] = useState<T[]>([]);
+  const [total, setTotal] = useState(0);
+  const [query, setQuery] = useState('');
+  const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+
+  // Responses of superseded requests (e.g. older search terms) are dropped
+  const requestId = useRef(0);
+  const onErrorRef = useRef(onError);
+  const mapItemRef = useRef(mapItem);
+  onErrorRef.current = onError;
+  mapItemRef.current = mapItem;
+
+  const load = useCallback(
+    async (search: string) => {
+      const id = ++requestId.current;
+      setLoading(true);
+      try {
+        const page = await fetchPage(path, {
+          q: search.trim(),
+          limit: PAGE_SIZE,
+        });
+        if (id !== requestId.current) return;
+        setItems(page.items.map(mapItemRef.current));
+        setTotal(page.total);
+        setNextCursor(page.nextCursor);
+      } catch (error) {
+        if (id === requestId.current) onErrorRef.current(error);
+      } finally {
+        if (id === requestId.current) setLoading(false);
+      }
+    },
+    [path]
+  );
+
+  useEffect(() => {
+    const timer = setTimeout(() => load(query), SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [load, query]);
+
+  const refresh = useCallback(() => load(query), [load, query]);
+
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loading || loadingMore) return;
+
+    const id = requestId.current;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(path, {
+        q: query.trim(),
+        limit: PAGE_SIZE,
+        cursor: nextCursor,
+      });
+      if (id !== requestId.current) return;
+      setItems(current => [...current, ...page.items.map(mapItemRef.current)]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      if (id === requestId.current) onErrorRef.current(error);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [path, query, nextCursor, loading, loadingMore]);
+
+  return {
+    items,
+    total,
+    query,
+    setQuery,
+    loading,
+    loadingMore,
+    hasMore: nextCursor !== null,
+    refresh,
+    loadMore,
+  };
+}